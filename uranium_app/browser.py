@@ -0,0 +1,434 @@
+# uranium_project\uranium_app\browser.py
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+import chromedriver_autoinstaller
+from django.conf import settings
+from django.core.cache import cache
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .single_flight import update_cached
+
+
+logger = logging.getLogger('uranium_app')
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+@lru_cache(maxsize=1)
+def resolve_driver_path():
+    """
+    Locate the chromedriver binary once per process.
+
+    On the server the distro chromedriver is used as is; locally
+    chromedriver_autoinstaller downloads a matching driver the first time.
+    """
+    if settings.server_config:
+        return os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')
+    return chromedriver_autoinstaller.install()
+
+
+def init_driver():
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f"user-agent={BROWSER_USER_AGENT}")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+
+    if settings.server_config:
+        options.binary_location = os.environ.get('CHROME_BIN', '/usr/bin/chromium')
+    service = Service(executable_path=resolve_driver_path())
+
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(settings.URANIUM_PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(settings.URANIUM_PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+def browser_backend(source):
+    """'selenium' or 'playwright', from URANIUM_BROWSER_BACKENDS or else URANIUM_BROWSER_BACKEND."""
+    return settings.URANIUM_BROWSER_BACKENDS.get(source, settings.URANIUM_BROWSER_BACKEND)
+
+
+# Readiness predicates: each takes the driver and returns a truthy value once
+# the page holds what a scraper reads.
+
+def element_present(by, value):
+    return lambda driver: driver.find_elements(by, value)
+
+
+def element_has_text(by, value):
+    return lambda driver: driver.find_element(by, value).text.strip()
+
+
+def script_true(script):
+    return lambda driver: driver.execute_script(script)
+
+
+# Recent wait times per source, kept for tuning URANIUM_READINESS_TIMEOUTS;
+# every process adds its samples to the one cache entry
+READINESS_CACHE_KEY = 'uranium_readiness_timings'
+READINESS_SAMPLES = 50
+
+
+def wait_until_ready(driver, source, predicate):
+    """
+    Wait until predicate(driver) is truthy, polling every URANIUM_READINESS_POLL_INTERVAL.
+
+    The timeout comes from URANIUM_READINESS_TIMEOUTS[source]. How long the
+    page actually took is recorded under source, see readiness_stats.
+
+    Returns:
+    bool: True once ready, False if the timeout ran out first.
+    """
+    timeout = settings.URANIUM_READINESS_TIMEOUTS.get(source, settings.URANIUM_READINESS_DEFAULT_TIMEOUT)
+    start = time.perf_counter()
+    try:
+        WebDriverWait(
+            driver, timeout,
+            poll_frequency=settings.URANIUM_READINESS_POLL_INTERVAL,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+        ).until(predicate)
+        ready = True
+    except TimeoutException:
+        logger.error(f"Timeout after {timeout}s waiting for {source} to load")
+        ready = False
+
+    record_readiness(source, time.perf_counter() - start, ready)
+    return ready
+
+
+def record_readiness(source, seconds, ready):
+    def update(samples):
+        samples[source] = (samples.get(source, []) + [(seconds, ready)])[-READINESS_SAMPLES:]
+        return samples
+
+    logger.info(f"{source} ready in {seconds:.2f}s" if ready else f"{source} not ready after {seconds:.2f}s")
+    update_cached(READINESS_CACHE_KEY, update, {})
+
+
+def readiness_stats():
+    """
+    Summarise recent readiness waits per source.
+
+    Returns:
+    dict: source to count, timeouts, median, p95 and max seconds of the last
+    READINESS_SAMPLES successful waits, across all processes.
+    """
+    stats = {}
+    for source, samples in (cache.get(READINESS_CACHE_KEY) or {}).items():
+        ready_times = sorted(seconds for seconds, ready in samples if ready)
+        stats[source] = {
+            'count': len(samples),
+            'timeouts': sum(1 for _, ready in samples if not ready),
+            'median': ready_times[len(ready_times) // 2] if ready_times else None,
+            'p95': ready_times[int(len(ready_times) * 0.95)] if ready_times else None,
+            'max': ready_times[-1] if ready_times else None,
+        }
+    return stats
+
+
+# URL patterns per resource type for Network.setBlockedURLs, which matches
+# on URL rather than on the type Chrome assigns a request
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico', '*.ico?*', '*.avif*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*', '*.ogg*'],
+    'stylesheet': ['*.css*'],
+}
+
+# Transferred bytes, load time and request count of the current page, from
+# the Resource Timing API
+PAGE_LOAD_SCRIPT = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    return {
+        bytes: resources.reduce((total, r) => total + (r.transferSize || 0), nav ? nav.transferSize : 0),
+        seconds: nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd) / 1000 : null,
+        requests: resources.length + 1,
+    };
+}"""
+
+# Recent page loads per source, with and without blocking, from every process
+PAGE_LOADS_CACHE_KEY = 'uranium_page_load_samples'
+PAGE_LOAD_SAMPLES = 20
+
+
+def blocked_resources(source):
+    """
+    Resource types and hosts to block while loading a page for source.
+
+    URANIUM_BLOCKING_OVERRIDES[source] may replace 'types' and 'hosts';
+    otherwise URANIUM_BLOCKED_RESOURCE_TYPES and URANIUM_BLOCKED_HOSTS apply.
+
+    Returns:
+    tuple: (types, hosts), both empty when blocking is turned off.
+    """
+    if not settings.URANIUM_BLOCK_RESOURCES:
+        return [], []
+    override = settings.URANIUM_BLOCKING_OVERRIDES.get(source, {})
+    return (
+        override.get('types', settings.URANIUM_BLOCKED_RESOURCE_TYPES),
+        override.get('hosts', settings.URANIUM_BLOCKED_HOSTS),
+    )
+
+
+def blocked_url_patterns(source):
+    """URL patterns for Network.setBlockedURLs covering blocked_resources(source)."""
+    types, hosts = blocked_resources(source)
+    patterns = [pattern for resource_type in types for pattern in RESOURCE_TYPE_PATTERNS.get(resource_type, [])]
+    return patterns + [f'*{host}*' for host in hosts]
+
+
+def load_page(driver, source, url):
+    """
+    Open url with source's blocked resources turned away by the DevTools protocol.
+
+    Pooled drivers move between sources, so the block list is set on every
+    load. Bytes transferred and load time are recorded per source, see
+    page_load_stats.
+    """
+    patterns = blocked_url_patterns(source)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        # Not a Chromium driver; load the page unfiltered
+        logger.warning(f"Could not set blocked URLs for {source}: {str(e)}")
+        patterns = []
+
+    driver.get(url)
+
+    try:
+        loaded = driver.execute_script(f'return ({PAGE_LOAD_SCRIPT})()')
+    except Exception as e:
+        logger.warning(f"Could not read page load timings for {source}: {str(e)}")
+        return
+    record_page_load(source, bool(patterns), loaded)
+
+
+def record_page_load(source, blocked, loaded):
+    mode = 'blocked' if blocked else 'unblocked'
+
+    def update(samples):
+        entry = samples.setdefault(source, {'blocked': [], 'unblocked': []})
+        entry[mode] = (entry[mode] + [loaded])[-PAGE_LOAD_SAMPLES:]
+        return samples
+
+    logger.info(
+        f"Loaded {source}: {loaded['bytes'] / 1024:.0f}KB in {loaded['seconds'] or 0:.2f}s"
+        f"{' with blocking' if blocked else ''}"
+    )
+    update_cached(PAGE_LOADS_CACHE_KEY, update, {})
+
+
+def page_load_stats():
+    """
+    Average bytes and load time per source, with and without blocking.
+
+    Once a source has been loaded both ways (see the bench_blocking command,
+    or URANIUM_BLOCK_RESOURCES=false), bytes_saved and seconds_saved give the
+    per-page difference. Cross-origin responses without Timing-Allow-Origin
+    report no size, so bytes are a lower bound.
+
+    Returns:
+    dict: source to {'blocked': {...}, 'unblocked': {...}, 'bytes_saved', 'seconds_saved'}.
+    """
+    def average(samples):
+        if not samples:
+            return None
+        timed = [s['seconds'] for s in samples if s['seconds'] is not None]
+        return {
+            'pages': len(samples),
+            'bytes': sum(s['bytes'] for s in samples) / len(samples),
+            'seconds': sum(timed) / len(timed) if timed else None,
+            'requests': sum(s['requests'] for s in samples) / len(samples),
+        }
+
+    stats = {}
+    for source, samples in (cache.get(PAGE_LOADS_CACHE_KEY) or {}).items():
+        blocked, unblocked = average(samples['blocked']), average(samples['unblocked'])
+        entry = {'blocked': blocked, 'unblocked': unblocked, 'bytes_saved': None, 'seconds_saved': None}
+        if blocked and unblocked:
+            entry['bytes_saved'] = unblocked['bytes'] - blocked['bytes']
+            if blocked['seconds'] is not None and unblocked['seconds'] is not None:
+                entry['seconds_saved'] = unblocked['seconds'] - blocked['seconds']
+        stats[source] = entry
+    return stats
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of pid and all its descendants, 0 where /proc is unavailable."""
+    children = {}
+    try:
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # The command name may contain spaces, so split after its closing paren
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    except OSError:
+        return 0
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        pending.extend(children.get(current, []))
+    return total
+
+
+class DriverPool:
+    """
+    A bounded pool of warm Selenium drivers.
+
+    Scrapers check a driver out with ``with pool.driver() as driver:`` and it
+    goes back to the pool afterwards. Drivers are health-checked before
+    reuse, and recycled after max_pages checkouts or once Chromium grows past
+    max_rss_mb, so one crashed or bloated browser never affects the others.
+    """
+
+    def __init__(self, size, max_pages=50, max_rss_mb=1024, factory=init_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
+        self._slots.acquire()
+        driver = None
+        failed = False
+        try:
+            driver = self._checkout()
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                self._checkin(driver, failed)
+            self._slots.release()
+
+    def _checkout(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if self._is_healthy(driver):
+                return driver
+            logger.warning("Discarding unresponsive driver")
+            self._discard(driver)
+
+    def _checkin(self, driver, failed):
+        with self._lock:
+            self._pages[driver] = self._pages.get(driver, 0) + 1
+            pages = self._pages[driver]
+
+        if failed and not self._is_healthy(driver):
+            logger.warning("Discarding driver that failed during a scrape")
+            self._discard(driver)
+            return
+
+        if pages >= self.max_pages:
+            logger.info(f"Recycling driver after {pages} pages")
+            self._discard(driver)
+            return
+
+        rss_mb = self._rss_mb(driver)
+        if rss_mb > self.max_rss_mb:
+            logger.info(f"Recycling driver using {rss_mb:.0f}MB")
+            self._discard(driver)
+            return
+
+        try:
+            # Unload the page so an idle driver doesn't keep running its scripts
+            driver.get('about:blank')
+        except Exception:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def _create(self):
+        logger.info("Starting a new browser driver")
+        driver = self.factory()
+        with self._lock:
+            self._pages[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing driver: {str(e)}")
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _rss_mb(self, driver):
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return 0
+        return process_tree_rss(pid) / (1024 * 1024)
+
+    def close(self):
+        """Quit every idle driver."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(driver)
+
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return this process's driver pool, creating it on first use."""
+    global _driver_pool
+
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(
+                settings.URANIUM_BROWSER_WORKERS,
+                max_pages=settings.URANIUM_DRIVER_MAX_PAGES,
+                max_rss_mb=settings.URANIUM_DRIVER_MAX_RSS_MB,
+            )
+            atexit.register(_driver_pool.close)
+        return _driver_pool
@@ -0,0 +1,92 @@
+# uranium_project\uranium_app\circuit_breaker.py
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .single_flight import update_cached
+
+
+logger = logging.getLogger('uranium_app')
+
+
+def _closed_state():
+    return {'failures': 0, 'open_until': 0, 'reset_timeout': 0}
+
+
+class CircuitBreaker:
+    """
+    Stop fetching a source that keeps failing.
+
+    After failure_threshold failures in a row the breaker opens and the
+    source is skipped for reset_timeout seconds, so its last good snapshot
+    keeps being served. Then a single trial fetch is let through: success
+    closes the breaker, failure opens it again for twice as long, up to
+    max_reset_timeout. State lives in the cache so every worker process
+    sees the same breaker.
+    """
+
+    def __init__(self, name, failure_threshold=None, reset_timeout=None, max_reset_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.URANIUM_BREAKER_FAILURES
+        self.reset_timeout = reset_timeout or settings.URANIUM_BREAKER_RESET_TIMEOUT
+        self.max_reset_timeout = max_reset_timeout or settings.URANIUM_BREAKER_MAX_RESET_TIMEOUT
+        self.cache_key = f'uranium_breaker_{name}'
+
+    def _load(self):
+        return cache.get(self.cache_key) or _closed_state()
+
+    @property
+    def state(self):
+        state = self._load()
+        if state['failures'] < self.failure_threshold:
+            return 'closed'
+        return 'open' if time.time() < state['open_until'] else 'half_open'
+
+    def allow(self):
+        """Whether the source should be fetched now; only one caller gets the half-open trial."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'open':
+            logger.info(f"Skipping {self.name}: circuit open after repeated failures")
+            return False
+        return cache.add(f'{self.cache_key}_trial', True, timeout=self.reset_timeout)
+
+    def record(self, ok):
+        """
+        Count a fetch's outcome.
+
+        Workers that fail at the same moment must each add their failure,
+        so the count is updated under the lock update_cached takes.
+        """
+        cache.delete(f'{self.cache_key}_trial')
+        update_cached(self.cache_key, lambda state: self._updated(state, ok))
+
+    def _updated(self, state, ok):
+        state = state or _closed_state()
+        if ok:
+            if state['failures'] >= self.failure_threshold:
+                logger.info(f"Circuit for {self.name} closed again")
+            return _closed_state()
+
+        state['failures'] += 1
+        if state['failures'] >= self.failure_threshold:
+            if state['reset_timeout']:
+                state['reset_timeout'] = min(state['reset_timeout'] * 2, self.max_reset_timeout)
+            else:
+                state['reset_timeout'] = self.reset_timeout
+            state['open_until'] = time.time() + state['reset_timeout']
+            logger.warning(
+                f"Circuit for {self.name} open for {state['reset_timeout']}s "
+                f"after {state['failures']} failures"
+            )
+        return state
+
+
+
+def breaker_states(names):
+    """Current breaker state per source name, for monitoring."""
+    return {name: CircuitBreaker(name).state for name in names}
@@ -0,0 +1,107 @@
+# uranium_project\uranium_app\fetch_tiers.py
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .http_fetch import fetch_page, parse_in_pool, run_coroutine
+from .single_flight import update_cached
+
+
+logger = logging.getLogger('uranium_app')
+
+
+# A browser source may declare cheaper ways to fetch it, tried in order:
+#   'http'    plain HTTP, with the source's 'parse' run on the raw HTML
+#   'json'    the same HTML, read through the source's 'json_parse' from the
+#             structured data embedded in it
+#   'browser' the source's Selenium or Playwright fetcher
+# A cheap tier only counts when its result passes the source's 'complete'
+# check; otherwise the next tier runs.
+CHEAP_TIERS = ('http', 'json')
+# Counts from every process go into this one entry
+TIER_STATS_CACHE_KEY = 'uranium_fetch_tiers'
+
+
+def source_tiers(name, spec):
+    """The tiers to try for a source, from URANIUM_FETCH_TIERS or else its spec."""
+    return tuple(settings.URANIUM_FETCH_TIERS.get(name, spec.get('tiers', ('browser',))))
+
+
+def has_cheap_tiers(name, spec):
+    return any(tier in CHEAP_TIERS for tier in source_tiers(name, spec))
+
+
+def is_complete(spec, result):
+    """Whether a fetched result is usable, as opposed to an empty or partial page."""
+    if result is None or (isinstance(result, dict) and 'error' in result):
+        return False
+    return bool(spec.get('complete', bool)(result))
+
+
+async def fetch_cheap_tiers(name, spec, session):
+    """
+    Try a source's HTTP tiers on one download of its page.
+
+    Returns:
+    The first complete result, or None when the browser is needed.
+    """
+    tiers = [tier for tier in source_tiers(name, spec) if tier in CHEAP_TIERS]
+    if not tiers:
+        return None
+
+    url = spec['url']() if callable(spec['url']) else spec['url']
+    page_content = await fetch_page(session, url)
+
+    for tier in tiers:
+        result = None
+        if page_content is not None:
+            parser = spec['parse'] if tier == 'http' else spec['json_parse']
+            try:
+                result = await parse_in_pool(parser, page_content)
+            except Exception as e:
+                logger.warning(f"{tier} tier failed to parse {name}: {str(e)}")
+        complete = is_complete(spec, result)
+        record_tier(name, tier, complete)
+        if complete:
+            return result
+    return None
+
+
+def fetch_cheap_tiers_sync(name, spec):
+    return run_coroutine(lambda session: fetch_cheap_tiers(name, spec, session))
+
+
+def record_tier(name, tier, complete):
+    """Count one attempt of tier for source name, and whether it came back complete."""
+    def update(all_stats):
+        source_stats = all_stats.setdefault(name, {'tiers': {}, 'last_tier': None})
+        stats = source_stats['tiers'].setdefault(tier, {'attempts': 0, 'complete': 0, 'last_complete': None})
+        stats['attempts'] += 1
+        if complete:
+            stats['complete'] += 1
+            stats['last_complete'] = time.time()
+            source_stats['last_tier'] = tier
+        return all_stats
+
+    if complete:
+        logger.info(f"Fetched {name} with the {tier} tier")
+    else:
+        logger.info(f"{tier} tier came back incomplete for {name}")
+    update_cached(TIER_STATS_CACHE_KEY, update, {})
+
+
+def tier_stats():
+    """
+    Attempts and complete results per source and tier.
+
+    A source whose cheap tier completes every time can have 'browser'
+    dropped from its tiers for good.
+
+    Returns:
+    dict: source name to {'last_tier', 'tiers': {tier: {'attempts', 'complete', 'last_complete'}}},
+    counted across all processes.
+    """
+    return cache.get(TIER_STATS_CACHE_KEY) or {}
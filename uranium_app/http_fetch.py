@@ -0,0 +1,140 @@
+# uranium_project\uranium_app\http_fetch.py
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import aiohttp
+import requests
+from django.conf import settings
+
+
+logger = logging.getLogger('uranium_app')
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0'
+}
+
+
+def client_session():
+    """
+    Create the pooled HTTP client shared by every scraper in a refresh.
+
+    Connections are kept alive and reused, capped at
+    URANIUM_HTTP_MAX_CONNECTIONS overall and URANIUM_HTTP_MAX_PER_HOST per
+    site so concurrent scrapers never hammer one host.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=settings.URANIUM_HTTP_MAX_CONNECTIONS,
+        limit_per_host=settings.URANIUM_HTTP_MAX_PER_HOST,
+        ttl_dns_cache=300,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=DEFAULT_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=settings.URANIUM_HTTP_TIMEOUT),
+    )
+
+
+class TimeoutSession(requests.Session):
+    """A requests session whose calls time out after URANIUM_HTTP_TIMEOUT unless told otherwise."""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', settings.URANIUM_HTTP_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+def requests_session():
+    """Session for synchronous callers such as yfinance, so no request can hang forever."""
+    return TimeoutSession()
+
+
+async def fetch_page(session, url, headers=None):
+    """Return the page body, or None if the request failed or didn't return 200."""
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                logger.error(f"Failed to retrieve {url}. Status code: {response.status}")
+                return None
+            return await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching {url}: {str(e) or type(e).__name__}")
+        return None
+
+
+async def fetch_pages(session, urls, headers=None, concurrency=4):
+    """
+    Fetch many pages concurrently, at most concurrency at a time.
+
+    Returns:
+    list: page bodies in the order of urls, None for failed requests.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            return await fetch_page(session, url, headers=headers)
+
+    return await asyncio.gather(*(fetch(url) for url in urls))
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """
+    Return the worker pool that runs HTML parsing off the event loop.
+
+    Parsing is CPU-bound, so it runs in separate processes; daemonic
+    processes such as Celery's prefork children can't start their own, so
+    those fall back to threads.
+    """
+    global _parse_pool
+
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            workers = settings.URANIUM_PARSE_WORKERS
+            if multiprocessing.current_process().daemon:
+                _parse_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='uranium-parse')
+            else:
+                # spawn rather than fork: the refresh runs alongside other threads
+                _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_parse_pool.shutdown, wait=False)
+        return _parse_pool
+
+
+async def parse_in_pool(func, *args):
+    """Run a parsers.py function in the parse pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_pool(), func, *args)
+
+
+def run_async(*coroutine_functions):
+    """
+    Run coroutine functions concurrently on one shared client session.
+
+    Each function is called with the session. Results come back in order;
+    an exception is returned in place of its function's result.
+    """
+    async def main():
+        async with client_session() as session:
+            return await asyncio.gather(
+                *(func(session) for func in coroutine_functions),
+                return_exceptions=True,
+            )
+
+    return asyncio.run(main())
+
+
+def run_coroutine(func):
+    """Run one coroutine function on its own client session and return its result."""
+    async def main():
+        async with client_session() as session:
+            return await func(session)
+
+    return asyncio.run(main())
@@ -0,0 +1,127 @@
+# uranium_project\uranium_app\isolation.py
+
+import logging
+import os
+import pickle
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+
+from .browser import process_tree_rss
+from .single_flight import update_cached
+
+
+logger = logging.getLogger('uranium_app')
+
+
+ISOLATION_KILLS_CACHE_KEY = 'uranium_isolation_kills'
+# Most recent kills kept in the cache entry, from every process
+ISOLATION_KILLS_KEPT = 50
+POLL_INTERVAL = 0.2
+
+
+class IsolatedSourceError(Exception):
+    """The isolated fetcher failed or its process died."""
+
+
+class SourceKilled(IsolatedSourceError):
+    """The isolated fetcher went over its wall-clock or memory limit and was killed."""
+
+
+def isolation_limits(name):
+    """(timeout seconds, memory cap in MB) for a source, from URANIUM_ISOLATION_LIMITS or the defaults."""
+    limits = settings.URANIUM_ISOLATION_LIMITS.get(name, {})
+    return (
+        limits.get('timeout', settings.URANIUM_ISOLATION_TIMEOUT),
+        limits.get('max_memory_mb', settings.URANIUM_ISOLATION_MAX_MEMORY_MB),
+    )
+
+
+def run_isolated(name, timeout=None, max_memory_mb=None):
+    """
+    Fetch one source in a child process that can be killed outright.
+
+    The child runs the fetch_source management command in its own session,
+    so the browser it starts shares its process group. Memory is measured
+    over that whole process tree. Going over timeout or max_memory_mb kills
+    the group with SIGKILL, which works even when chromedriver or a parser
+    is stuck.
+
+    Returns:
+    The source's result.
+
+    Raises:
+    SourceKilled: the child hit a limit and was killed.
+    IsolatedSourceError: the fetcher raised or the child died.
+    """
+    default_timeout, default_memory = isolation_limits(name)
+    timeout = timeout or default_timeout
+    max_memory_mb = max_memory_mb or default_memory
+
+    fd, output = tempfile.mkstemp(prefix=f'uranium-{name}-', suffix='.pickle')
+    os.close(fd)
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'fetch_source', name, '--output', output],
+        cwd=settings.BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    start = time.monotonic()
+    peak_mb = 0
+
+    try:
+        while True:
+            try:
+                process.wait(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+
+            elapsed = time.monotonic() - start
+            rss_mb = process_tree_rss(process.pid) / (1024 * 1024)
+            peak_mb = max(peak_mb, rss_mb)
+            if elapsed > timeout:
+                reason = f"ran past its {timeout}s limit"
+            elif rss_mb > max_memory_mb:
+                reason = f"used {rss_mb:.0f}MB, over its {max_memory_mb}MB limit"
+            else:
+                continue
+
+            _kill(process)
+            _record_kill(name, reason, elapsed, peak_mb)
+            raise SourceKilled(f"{name} {reason}")
+
+        if process.returncode != 0:
+            raise IsolatedSourceError(f"{name} fetcher exited with code {process.returncode}")
+
+        with open(output, 'rb') as f:
+            status, payload = pickle.load(f)
+        if status == 'error':
+            raise IsolatedSourceError(f"{name} fetcher failed: {payload}")
+        logger.info(f"Isolated fetch of {name} took {time.monotonic() - start:.2f}s, peak {peak_mb:.0f}MB")
+        return payload
+    finally:
+        if process.poll() is None:
+            _kill(process)
+        try:
+            os.unlink(output)
+        except OSError:
+            pass
+
+
+def _kill(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
+
+def _record_kill(name, reason, seconds, peak_mb):
+    logger.error(f"Killed isolated fetch of {name}: {reason}")
+    entry = {'source': name, 'reason': reason, 'seconds': seconds, 'peak_mb': peak_mb, 'at': time.time()}
+    update_cached(ISOLATION_KILLS_CACHE_KEY, lambda kills: (kills + [entry])[-ISOLATION_KILLS_KEPT:], [])
@@ -0,0 +1,46 @@
+# uranium_project\uranium_app\management\commands\bench_blocking.py
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from uranium_app.browser import get_driver_pool, page_load_stats
+from uranium_app.tasks import URANIUM_SOURCES, run_source
+
+
+class Command(BaseCommand):
+    help = 'Load each browser source with and without resource blocking and report bytes and time saved'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2, help='Page loads per source and mode')
+        parser.add_argument('--source', action='append', help='Only these sources (repeatable)')
+
+    def handle(self, *args, **options):
+        names = options['source'] or [name for name, spec in URANIUM_SOURCES.items() if spec['driver']]
+        pool = get_driver_pool()
+
+        for blocking in (False, True):
+            with override_settings(URANIUM_BLOCK_RESOURCES=blocking):
+                for _ in range(options['repeat']):
+                    for name in names:
+                        cache_key = URANIUM_SOURCES[name].get('cache_key')
+                        if cache_key:
+                            cache.delete(cache_key)
+                        with pool.driver() as driver:
+                            run_source(name, driver)
+
+        stats = page_load_stats()
+        for name in names:
+            entry = stats.get(name)
+            if not entry or not entry['blocked'] or not entry['unblocked']:
+                self.stdout.write(f"{name}: no page load timings")
+                continue
+            blocked, unblocked = entry['blocked'], entry['unblocked']
+            line = (
+                f"{name}: {unblocked['bytes'] / 1024:.0f}KB -> {blocked['bytes'] / 1024:.0f}KB "
+                f"({entry['bytes_saved'] / 1024:.0f}KB saved), "
+                f"{unblocked['requests']:.0f} -> {blocked['requests']:.0f} requests"
+            )
+            if entry['seconds_saved'] is not None:
+                line += f", {unblocked['seconds']:.2f}s -> {blocked['seconds']:.2f}s ({entry['seconds_saved']:.2f}s saved)"
+            self.stdout.write(line)
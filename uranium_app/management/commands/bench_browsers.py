@@ -0,0 +1,80 @@
+# uranium_project\uranium_app\management\commands\bench_browsers.py
+
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from uranium_app.browser import DriverPool, process_tree_rss
+from uranium_app.orchestrator import run_sources
+from uranium_app.tasks import URANIUM_SOURCES, run_source
+
+
+class MemorySampler:
+    """Track the peak resident memory of this process and every browser it started."""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        pid = os.getpid()
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss(pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class Command(BaseCommand):
+    help = 'Compare a full refresh of the browser-bound sources on Selenium against Playwright'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=1, help='Refreshes per backend')
+
+    def handle(self, *args, **options):
+        sources = {name: spec for name, spec in URANIUM_SOURCES.items() if spec.get('playwright')}
+        self.stdout.write(f"Refreshing {len(sources)} browser sources: {', '.join(sources)}")
+
+        for backend in ('selenium', 'playwright'):
+            for run in range(options['repeat']):
+                for spec in sources.values():
+                    if spec.get('cache_key'):
+                        cache.delete(spec['cache_key'])
+
+                # A fresh pool each time so Selenium pays for its browser starts like Playwright does
+                pool = DriverPool(
+                    settings.URANIUM_BROWSER_WORKERS,
+                    max_pages=settings.URANIUM_DRIVER_MAX_PAGES,
+                    max_rss_mb=settings.URANIUM_DRIVER_MAX_RSS_MB,
+                )
+                try:
+                    with override_settings(URANIUM_BROWSER_BACKEND=backend, URANIUM_BROWSER_BACKENDS={}), \
+                            MemorySampler() as memory:
+                        start = time.perf_counter()
+                        results, timings = run_sources(
+                            sources, run_source, pool,
+                            browser_workers=settings.URANIUM_BROWSER_WORKERS,
+                        )
+                        elapsed = time.perf_counter() - start
+                finally:
+                    pool.close()
+
+                ok = sum(1 for t in timings['sources'].values() if t['ok'])
+                self.stdout.write(
+                    f"{backend} run {run + 1}: {elapsed:.2f}s wall, "
+                    f"peak memory {memory.peak / (1024 * 1024):.0f}MB, "
+                    f"{ok}/{len(sources)} sources ok"
+                )
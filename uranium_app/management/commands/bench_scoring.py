@@ -0,0 +1,108 @@
+# uranium_project\uranium_app\management\commands\bench_scoring.py
+
+import copy
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from uranium_app.scoring import DEFAULT_WEIGHTS, NORMALIZATIONS, score_stocks
+from uranium_app.stock_store import StockStore
+from uranium_app.views import GetTopPerformingStocksAPIView
+
+
+def loop_top_performing_stocks(stocks_data):
+    """The per-stock loop GetTopPerformingStocksAPIView used before the scoring engine, kept as the baseline."""
+    def is_numeric(value):
+        try:
+            float(value)
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    for field in DEFAULT_WEIGHTS:
+        values = [float(stock.get(field, 0)) for stock in stocks_data.values() if is_numeric(stock.get(field))]
+        if not values:
+            continue
+        min_value, max_value = min(values), max(values)
+        for stock in stocks_data.values():
+            if min_value != max_value and is_numeric(stock.get(field)):
+                stock[f'{field}_normalized'] = (float(stock.get(field, 0)) - min_value) / (max_value - min_value)
+            else:
+                stock[f'{field}_normalized'] = 0
+
+    for stock in stocks_data.values():
+        stock['performance_score'] = sum(stock.get(f'{field}_normalized', 0) * weight for field, weight in DEFAULT_WEIGHTS.items())
+    return sorted(stocks_data.items(), key=lambda x: x[1].get('performance_score', 0), reverse=True)[:3]
+
+
+def synthetic_stocks(count, missing=0.1, seed=0):
+    """count stock records shaped like the stocks source's, with about missing of the values 'N/A'."""
+    rng = random.Random(seed)
+
+    def value(low, high):
+        return 'N/A' if rng.random() < missing else rng.uniform(low, high)
+
+    return {
+        f'SYM{i}': {
+            'name': f'Company {i}',
+            'current_price': value(0.1, 200),
+            'last_price': value(0.1, 200),
+            'change_1m': value(-40, 40),
+            'change_1y': value(-90, 300),
+            'volume': value(0, 5e7),
+            'market_cap': value(1e6, 5e10),
+            'pe_ratio': value(-20, 80),
+            'country_name': rng.choice(['Canada', 'Australia', 'United States', 'Kazakhstan']),
+        }
+        for i in range(count)
+    }
+
+
+class Command(BaseCommand):
+    help = 'Time the vectorized stock scoring against the per-stock loop it replaced'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stocks', type=int, action='append', help='Universe sizes to score (repeatable, default 50, 1000 and 10000)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per size, the best is reported')
+
+    def handle(self, *args, **options):
+        view = GetTopPerformingStocksAPIView()
+        for count in options['stocks'] or [50, 1000, 10000]:
+            stocks = synthetic_stocks(count)
+
+            # The loop writes its normalized fields into the records, so each run gets a fresh copy
+            loop_time, loop_top = self.best_of(options['repeat'], lambda: loop_top_performing_stocks(copy.deepcopy(stocks)))
+            copy_time, _ = self.best_of(options['repeat'], lambda: copy.deepcopy(stocks))
+            loop_time -= copy_time
+            vector_time, vector_top = self.best_of(options['repeat'], lambda: view.get_top_performing_stocks(stocks))
+            self.stdout.write(
+                f"{count} stocks: loop {loop_time * 1000:.1f}ms, vectorized {vector_time * 1000:.1f}ms "
+                f"({loop_time / vector_time:.1f}x faster)"
+            )
+
+            if [symbol for symbol, _ in loop_top] != [symbol for symbol, _ in vector_top] or any(
+                abs(a['performance_score'] - b['performance_score']) > 1e-9 for (_, a), (_, b) in zip(loop_top, vector_top)
+            ):
+                self.stdout.write(f"  Top stocks differ: {[s for s, _ in loop_top]} vs {[s for s, _ in vector_top]}")
+            else:
+                self.stdout.write("  Top stocks match")
+
+            # Most of a request goes to reading the posted dicts; scoring a store already in columns is the rest
+            store = StockStore.from_stocks(stocks, history=False)
+            for method in NORMALIZATIONS:
+                methods = dict.fromkeys(DEFAULT_WEIGHTS, method)
+                method_time, _ = self.best_of(
+                    options['repeat'], lambda: view.get_top_performing_stocks(stocks, DEFAULT_WEIGHTS, methods, 10)
+                )
+                store_time, _ = self.best_of(options['repeat'], lambda: score_stocks(store, DEFAULT_WEIGHTS, methods, 10))
+                self.stdout.write(f"  {method}, top 10: {method_time * 1000:.1f}ms, {store_time * 1000:.2f}ms from a built store")
+
+    def best_of(self, repeat, run):
+        best, result = None, None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
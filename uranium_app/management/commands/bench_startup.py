@@ -0,0 +1,89 @@
+# uranium_project\uranium_app\management\commands\bench_startup.py
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from uranium_app.snapshot import Snapshot, current_snapshot
+from uranium_app.tasks import fetch_uranium_sources, publish_sources
+
+
+# Boots the WSGI application the way a gunicorn worker does and reports how
+# long it took until uranium data was ready to serve, and the worker's RSS
+# with the snapshot mapped and after decoding all of it into one dict, the
+# way every worker used to hold it.
+WORKER_BOOT_SCRIPT = """
+import os, time
+start = time.perf_counter()
+from uranium_project.wsgi import application
+from uranium_app import tasks
+from uranium_app.browser import process_tree_rss
+data = tasks.fetch_uranium_data_sync()
+elapsed = time.perf_counter() - start
+mapped = process_tree_rss(os.getpid())
+decoded = dict(data) if data is not None else None
+print(elapsed, data is not None, mapped, process_tree_rss(os.getpid()))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Measure how long a web worker needs before it can serve uranium data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Number of worker boots to time')
+        parser.add_argument(
+            '--crawl', action='store_true',
+            help='Also time a full crawl, which every worker paid on boot before warm start'
+        )
+
+    def handle(self, *args, **options):
+        crawl_time = None
+        if options['crawl']:
+            start = time.perf_counter()
+            results = fetch_uranium_sources()
+            crawl_time = time.perf_counter() - start
+            publish_sources(results)
+            self.stdout.write(f"Full crawl: {crawl_time:.2f}s")
+
+        snapshot = current_snapshot()
+        if snapshot is None:
+            self.stderr.write("No snapshot to load; run with --crawl first.")
+            return
+
+        load_times = []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            dict(Snapshot(snapshot.path))
+            load_times.append(time.perf_counter() - start)
+        self.stdout.write(f"Snapshot map and full decode: median {statistics.median(load_times) * 1000:.1f}ms")
+
+        env = {**os.environ, 'URANIUM_BACKGROUND_REFRESH': 'false'}
+        boot_times = []
+        mapped_rss = []
+        decoded_rss = []
+        for _ in range(options['repeat']):
+            result = subprocess.run(
+                [sys.executable, '-c', WORKER_BOOT_SCRIPT],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True
+            )
+            elapsed, ready, mapped, decoded = result.stdout.split()[-4:]
+            if ready != 'True':
+                self.stderr.write("Worker booted without data")
+            boot_times.append(float(elapsed))
+            mapped_rss.append(int(mapped))
+            decoded_rss.append(int(decoded))
+
+        boot_time = statistics.median(boot_times)
+        self.stdout.write(f"Worker boot until data ready: median {boot_time * 1000:.1f}ms")
+        self.stdout.write(
+            f"Worker RSS: {statistics.median(mapped_rss) / 2 ** 20:.1f}MB with the snapshot mapped, "
+            f"{statistics.median(decoded_rss) / 2 ** 20:.1f}MB once all of it is decoded"
+        )
+
+        if crawl_time is not None:
+            self.stdout.write(f"Speedup over crawling on boot: {crawl_time / boot_time:.0f}x")
@@ -0,0 +1,53 @@
+# uranium_project\uranium_app\management\commands\bench_stocks.py
+
+import time
+
+import requests
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from uranium_app.tasks import fetch_single_stock, fetch_stocks_batched, get_uranium_stocks
+
+
+class Command(BaseCommand):
+    help = 'Compare fetching stock data one symbol at a time against the batched download'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', type=int, default=None, help='Only use the first N symbols')
+
+    def handle(self, *args, **options):
+        symbols = list(get_uranium_stocks())[:options['symbols']]
+        self.stdout.write(f"Fetching {len(symbols)} symbols")
+
+        with requests.Session() as session:
+            start = time.perf_counter()
+            serial = dict(fetch_single_stock(symbol, session) for symbol in symbols)
+            serial_time = time.perf_counter() - start
+            self.stdout.write(f"Serial:  {serial_time:.2f}s")
+
+            for symbol in symbols:
+                cache.delete(f'stock_meta_{symbol}')
+
+            start = time.perf_counter()
+            batched = fetch_stocks_batched(symbols, session)
+            batched_time = time.perf_counter() - start
+            self.stdout.write(
+                f"Batched, cold metadata: {batched_time:.2f}s ({serial_time / batched_time:.1f}x faster)"
+            )
+
+            start = time.perf_counter()
+            fetch_stocks_batched(symbols, session)
+            warm_time = time.perf_counter() - start
+            self.stdout.write(
+                f"Batched, cached metadata: {warm_time:.2f}s ({serial_time / warm_time:.1f}x faster)"
+            )
+
+        mismatched = [
+            symbol for symbol in symbols
+            if bool(serial.get(symbol)) != bool(batched.get(symbol))
+            or (serial.get(symbol) and abs(serial[symbol]['current_price'] - batched[symbol]['current_price']) > 1e-6)
+        ]
+        if mismatched:
+            self.stdout.write(f"Results differ for: {', '.join(mismatched)}")
+        else:
+            self.stdout.write("Serial and batched results match")
@@ -0,0 +1,34 @@
+# uranium_project\uranium_app\management\commands\fetch_source.py
+
+import os
+import pickle
+
+from django.core.management.base import BaseCommand, CommandError
+
+from uranium_app.browser import get_driver_pool
+from uranium_app.tasks import URANIUM_SOURCES, fetch_source_tiered
+
+
+class Command(BaseCommand):
+    help = 'Fetch one uranium source and pickle the result to a file; the child side of isolation.run_isolated'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help='Source name from URANIUM_SOURCES')
+        parser.add_argument('--output', required=True, help='File to write the pickled (status, result) to')
+
+    def handle(self, *args, **options):
+        name = options['name']
+        if name not in URANIUM_SOURCES:
+            raise CommandError(f"Unknown source: {name}")
+
+        try:
+            payload = ('ok', fetch_source_tiered(name, URANIUM_SOURCES[name]))
+        except Exception as e:
+            payload = ('error', f"{type(e).__name__}: {str(e)}")
+        finally:
+            get_driver_pool().close()
+
+        temp_path = f"{options['output']}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(payload, f)
+        os.replace(temp_path, options['output'])
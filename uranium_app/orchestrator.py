@@ -0,0 +1,239 @@
+# uranium_project\uranium_app\orchestrator.py
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .browser import browser_backend
+from .circuit_breaker import CircuitBreaker
+from .fetch_tiers import fetch_cheap_tiers, fetch_cheap_tiers_sync, has_cheap_tiers, is_complete, record_tier
+from .http_fetch import run_async
+from .isolation import run_isolated
+from .playwright_backend import run_pages
+from .single_flight import SingleFlight
+
+logger = logging.getLogger('uranium_app')
+
+
+def run_sources(sources, run, driver_pool, browser_workers=2, http_workers=4, deadline=None, isolated=()):
+    """
+    Fetch independent sources concurrently.
+
+    Browser-bound sources (spec['driver'] is true) run on their own pool and
+    check drivers out of driver_pool, each used by one source at a time.
+    Those set to the Playwright backend instead run together in one Chromium,
+    a context each, taking up one browser worker. Browser sources with cheap
+    fetch tiers (see fetch_tiers.py) try those first and only use a browser
+    when the result is incomplete.
+    HTTP-bound sources run on a separate pool so they never wait on a browser;
+    those with an 'async' coroutine all run together on one event loop and
+    share a single pooled HTTP client, taking up one HTTP worker.
+
+    Sources named in isolated run in a child process instead (see
+    isolation.run_isolated), still counted against the browser or HTTP
+    workers. A source whose circuit breaker is open is skipped, and so is one
+    another process is already fetching (see single_flight.py). Whatever hasn't
+    finished by the deadline is given up on and returned as None, so one
+    hanging site never holds back the rest.
+
+    Args:
+    sources (dict): Source name to spec, as in tasks.URANIUM_SOURCES.
+    run (callable): run(name, driver=None) fetches one source.
+    driver_pool (browser.DriverPool): Warm drivers shared by browser sources.
+    browser_workers (int): Number of browser sources fetched at once.
+    http_workers (int): Number of HTTP sources fetched at once.
+    deadline (float): Seconds the whole refresh may take, or None to wait for every source.
+    isolated (iterable): Source names to fetch in a killable child process.
+
+    Returns:
+    tuple: (results, timings). results maps source name to its result, or
+    None if it raised, was skipped or missed the deadline; timings holds
+    per-source and per-stage seconds.
+    """
+    timings = {'sources': {}}
+    refresh_start = time.perf_counter()
+    deadline_at = refresh_start + deadline if deadline else None
+    # Results land here as each source finishes, so a deadline keeps
+    # everything that made it even when the rest of its group didn't
+    finished = {}
+
+    def record(name, start, ok, result):
+        elapsed = time.perf_counter() - start
+        timings['sources'][name] = {
+            'started': start - refresh_start,
+            'seconds': elapsed,
+            'ok': ok,
+        }
+        finished[name] = result
+        logger.info(f"Fetched {name} in {elapsed:.2f}s")
+
+    def timed(name, driver=None):
+        start = time.perf_counter()
+        try:
+            result = run(name, driver) if driver is not None else run(name)
+            ok = True
+        except Exception as e:
+            logger.error(f"Error fetching {name}: {str(e)}", exc_info=True)
+            result, ok = None, False
+        record(name, start, ok, result)
+        return result
+
+    def timed_async(name, key='async'):
+        async def fetch(arg):
+            start = time.perf_counter()
+            try:
+                if deadline_at is None:
+                    result = await sources[name][key](arg)
+                else:
+                    result = await asyncio.wait_for(sources[name][key](arg), max(deadline_at - start, 0))
+                ok = True
+            except asyncio.TimeoutError:
+                logger.error(f"{name} missed the refresh deadline")
+                result, ok = None, False
+            except Exception as e:
+                logger.error(f"Error fetching {name}: {str(e)}", exc_info=True)
+                result, ok = None, False
+            record(name, start, ok, result)
+            return result
+        return fetch
+
+    def run_async_group(names):
+        return dict(zip(names, run_async(*(timed_async(name) for name in names))))
+
+    def run_playwright_group(names):
+        start = time.perf_counter()
+        tiered = [name for name in names if has_cheap_tiers(name, sources[name])]
+        resolved = {}
+        if tiered:
+            outcomes = run_async(*(
+                lambda session, name=name: fetch_cheap_tiers(name, sources[name], session) for name in tiered
+            ))
+            for name, result in zip(tiered, outcomes):
+                if isinstance(result, Exception):
+                    logger.error(f"Error fetching {name} over HTTP: {str(result)}")
+                elif result is not None:
+                    resolved[name] = result
+                    record(name, start, True, result)
+
+        remaining = [name for name in names if name not in resolved]
+        if not remaining:
+            return resolved
+        try:
+            results = run_pages({name: timed_async(name, 'playwright') for name in remaining})
+        except Exception as e:
+            logger.error(f"Playwright browser failed: {str(e)}", exc_info=True)
+            for name in remaining:
+                record(name, start, False, None)
+            results = dict.fromkeys(remaining)
+        for name in remaining:
+            record_tier(name, 'browser', is_complete(sources[name], results[name]))
+        return {**resolved, **results}
+
+    def run_isolated_source(name):
+        start = time.perf_counter()
+        try:
+            result = run_isolated(name)
+            ok = True
+        except Exception as e:
+            logger.error(f"Error fetching {name}: {str(e)}")
+            result, ok = None, False
+        record(name, start, ok, result)
+        return result
+
+    def run_browser(name):
+        start = time.perf_counter()
+        if has_cheap_tiers(name, sources[name]):
+            try:
+                result = fetch_cheap_tiers_sync(name, sources[name])
+            except Exception as e:
+                logger.error(f"Error fetching {name} over HTTP: {str(e)}", exc_info=True)
+                result = None
+            if result is not None:
+                record(name, start, True, result)
+                return result
+
+        try:
+            with driver_pool.driver() as driver:
+                result = timed(name, driver)
+        except Exception as e:
+            logger.error(f"No browser available for {name}: {str(e)}", exc_info=True)
+            result = None
+            record(name, start, False, result)
+        record_tier(name, 'browser', is_complete(sources[name], result))
+        return result
+
+    in_flight, flights = [], {}
+    for name in sources:
+        flight = SingleFlight(f'source_{name}')
+        if flight.acquire():
+            flights[name] = flight
+        else:
+            in_flight.append(name)
+    skipped = in_flight + [name for name in flights if not CircuitBreaker(name).allow()]
+    for name in skipped:
+        timings['sources'][name] = {'started': 0, 'seconds': 0, 'ok': False, 'skipped': True}
+    for name in in_flight:
+        timings['sources'][name]['in_flight'] = True
+    active = {name: spec for name, spec in sources.items() if name not in skipped}
+
+    browser_names = [name for name, spec in active.items() if spec['driver']]
+    http_names = [name for name, spec in active.items() if not spec['driver']]
+    isolated_names = [name for name in active if name in isolated]
+    async_names = [name for name in http_names if sources[name].get('async') and name not in isolated_names]
+    playwright_names = [
+        name for name in browser_names
+        if sources[name].get('playwright') and browser_backend(name) == 'playwright' and name not in isolated_names
+    ]
+    thread_names = [name for name in active if name not in isolated_names + async_names + playwright_names]
+
+    try:
+        browser_pool = ThreadPoolExecutor(max_workers=browser_workers, thread_name_prefix='uranium-browser')
+        http_pool = ThreadPoolExecutor(max_workers=http_workers, thread_name_prefix='uranium-http')
+        futures = {
+            name: browser_pool.submit(run_browser, name) if active[name]['driver'] else http_pool.submit(timed, name)
+            for name in thread_names
+        }
+        futures.update({
+            name: (browser_pool if active[name]['driver'] else http_pool).submit(run_isolated_source, name)
+            for name in isolated_names
+        })
+        group_futures = {}
+        if playwright_names:
+            group_futures[browser_pool.submit(run_playwright_group, playwright_names)] = playwright_names
+        if async_names:
+            group_futures[http_pool.submit(run_async_group, async_names)] = async_names
+        remaining = None if deadline_at is None else max(deadline_at - time.perf_counter(), 0)
+        wait(list(futures.values()) + list(group_futures), timeout=remaining)
+
+        # Stragglers keep running in the background, but nothing waits for them.
+        # Their locks go too, so the next refresh can retry them
+        browser_pool.shutdown(wait=False, cancel_futures=True)
+        http_pool.shutdown(wait=False, cancel_futures=True)
+    finally:
+        for flight in flights.values():
+            flight.release()
+
+    done = dict(finished)
+    results = {name: done.get(name) for name in sources}
+    late = [name for name in active if name not in done]
+    for name in late:
+        logger.error(f"{name} missed the refresh deadline")
+        timings['sources'][name] = {'started': 0, 'seconds': deadline, 'ok': False, 'timed_out': True}
+
+    for name, spec in active.items():
+        CircuitBreaker(name).record(is_complete(spec, results[name]))
+
+    source_timings = timings['sources']
+    for stage, names in (('browser', browser_names), ('http', http_names)):
+        if names:
+            timings[stage] = max(source_timings[n]['started'] + source_timings[n]['seconds'] for n in names)
+    timings['total'] = time.perf_counter() - refresh_start
+    timings['sum_of_sources'] = sum(t['seconds'] for t in source_timings.values())
+
+    logger.info(
+        f"Refreshed {len(results)} sources in {timings['total']:.2f}s "
+        f"(sequential would take {timings['sum_of_sources']:.2f}s, "
+        f"slowest source {max((t['seconds'] for t in source_timings.values()), default=0):.2f}s)"
+    )
+    return results, timings
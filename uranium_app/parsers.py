@@ -0,0 +1,537 @@
+# uranium_project\uranium_app\parsers.py
+
+# Pure HTML parsers for the scraped news sites. They take page HTML and
+# return plain data, with no network, cache or Django access, so they can
+# run in a separate worker process without stalling the fetch loop.
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+
+logger = logging.getLogger('uranium_app')
+
+
+def parse_world_nuclear_news(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    news_container = soup.find('div', id='internal_news_list_wrapper')
+    if not news_container:
+        logger.error("Could not find news container")
+        return []
+
+    news_items = news_container.find_all('a', class_='news_box_link')
+    news_data = []
+
+    for item in news_items:
+        link = f"https://world-nuclear-news.org{item['href']}"
+        title = item.find('div', class_='news_list_title').text.strip()
+        content = item.find('div', class_='news_list_intro').text.strip()
+        category = item.find('span', class_='news_list_category').text.strip()
+        published_date = item.find('span', class_='news_list_predate').text.strip()
+        try:
+            # Parse the date using the specific format
+            date_obj = datetime.strptime(published_date, "%A, %d %B %Y")
+            # Convert to the desired format 'YYYY-MM-DD'
+            published_date = date_obj.strftime('%Y-%m-%d')
+        except ValueError:
+            logger.warning(f"Failed to parse date world_nuclear_news: {published_date}")
+            published_date = 'N/A'
+
+        image_element = item.find('img')
+        image_url = f"https://world-nuclear-news.org{image_element['src']}" if image_element else None
+
+        news_item = {
+            'id': hashlib.md5(link.encode()).hexdigest(),
+            'title': title,
+            'link': link,
+            'publisher': 'World Nuclear News',
+            'published_date': published_date,
+            'category': category,
+            'content': content,
+            'image_url': image_url
+        }
+        news_data.append(news_item)
+
+    return news_data
+
+
+def parse_mining_technology_results(page_content):
+    """Parse the mining-technology.com search page into partial items; date, author and body live on each article page."""
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    articles = soup.select('article.cell.feature.grid-x.border-bottom')
+    results = []
+
+    for article in articles:
+        category_element = article.find('div', class_='category')
+        category = category_element.get_text(strip=True) if category_element else 'N/A'
+
+        title_element = article.find('h3')
+        if not title_element or not title_element.find('a'):
+            continue
+        title = title_element.get_text(strip=True)
+        link = title_element.find('a')['href']
+
+        description_element = article.find('p')
+        description = description_element.get_text(strip=True) if description_element else 'N/A'
+
+        image_element = article.select_one('div.cell.large-4.article-image img')
+        image_url = image_element['src'] if image_element else 'N/A'
+
+        results.append({
+            'category': category,
+            'title': title,
+            'link': link,
+            'description': description,
+            'image_url': image_url,
+        })
+
+    return results
+
+
+def parse_mining_technology_article(article_content):
+    """Return (published_date, author, content) from a mining-technology.com article page."""
+    article_soup = BeautifulSoup(article_content, 'html.parser')
+
+    date_element = article_soup.select_one('div.article-meta span.date-published')
+    date_str = date_element.get_text(strip=True) if date_element else 'N/A'
+    try:
+        published_date = datetime.strptime(date_str, "%B %d, %Y").strftime('%Y-%m-%d') if date_str != 'N/A' else 'N/A'
+    except ValueError:
+        logger.warning(f"Failed to parse date mining_tech: {date_str}")
+        published_date = 'N/A'
+
+    author_element = article_soup.select_one('div.article-meta span.author')
+    author = author_element.get_text(strip=True) if author_element else 'N/A'
+
+    content_element = article_soup.select_one('div.main-content')
+    content = "\n\n".join([p.get_text(strip=True) for p in content_element.find_all('p')]) if content_element else 'N/A'
+
+    return published_date, author, content
+
+
+def parse_northern_miner_news(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    # Select all article elements with the class 'content-list clearfix'
+    articles = soup.select('article.content-list.clearfix')
+    news_data = []
+
+    for article in articles:
+        # Extract the title and link
+        title_element = article.find('h3', class_='content-list-title')
+        title = title_element.get_text(strip=True) if title_element else 'N/A'
+        link = title_element.find('a')['href'] if title_element and title_element.find('a') else 'N/A'
+
+        # Extract the image URL
+        image_element = article.find('img')
+        image_url = image_element['src'] if image_element else 'N/A'
+
+        # Extract the summary/content
+        summary_element = article.find('div', class_='content-list-excerpt')
+        summary = summary_element.get_text(strip=True) if summary_element else 'N/A'
+
+        # Extract the published date and category
+        entry_meta = article.find('p', class_='entry-meta')
+        if entry_meta:
+            date_str = entry_meta.find('span', class_='entry-meta-date').get_text(strip=True)
+            try:
+                published_date = datetime.strptime(date_str, "%B %d, %Y").strftime('%d-%m-%Y')
+            except ValueError:
+                logger.warning(f"Failed to parse date: {date_str}")
+                published_date = 'N/A'
+            category = entry_meta.find('span', class_='entry-meta-cats').get_text(strip=True)
+        else:
+            published_date = 'N/A'
+            category = 'N/A'
+
+        # Prepare the news item
+        news_item = {
+            'id': hashlib.md5(link.encode()).hexdigest(),
+            'title': title,
+            'link': link,
+            'publisher': 'Northern Miner',
+            'published_date': published_date,
+            'category': category,
+            'image_url': image_url,
+            'content': summary,
+        }
+        news_data.append(news_item)
+
+    return news_data
+
+
+# Rendered pages from the browser-bound sources. Selenium and Playwright
+# both hand over the page HTML once it is ready, so these serve either backend.
+
+def parse_uranium_price(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    spot_price_element = soup.find(id='spottU3o8')
+    spot_price = spot_price_element.get_text(strip=True) if spot_price_element else ''
+    if not spot_price:
+        spot_price = 'N/A'
+
+    headers = []
+    data = []
+    table = soup.find(id='CVDtradesTable')
+    if table:
+        headers = [th.text.strip() for th in table.find_all('th')]
+        tbody = table.find('tbody')
+        if tbody:
+            data = [[cell.text.strip() for cell in row.find_all('td')] for row in tbody.find_all('tr')]
+
+    return {
+        'spot_price': spot_price,
+        'headers': headers,
+        'data': data
+    }
+
+
+def parse_calendar(page_content):
+    """Return {'calendar_html', 'event_data'} from the uxc.com calendar page, or None without a calendar."""
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    calendar = soup.select_one('td.rcMain.rcCalendars')
+    if not calendar:
+        logger.error("Could not find calendar")
+        return None
+    calendar_html = calendar.decode_contents()
+
+    event_data = []
+    for row in soup.select('table.table-striped tbody tr:not(:first-child)'):
+        try:
+            date_element = row.select_one('td.text-center')
+            date = date_element.get_text(strip=True) if date_element else 'N/A'
+
+            title_element = row.select_one('div.lead a')
+            title = title_element.get_text(strip=True) if title_element else 'N/A'
+            link = title_element.get('href', 'N/A').strip() if title_element else 'N/A'
+
+            details_dict = {}
+            for dt, dd in zip(row.select('dl.dl-horizontal dt'), row.select('dl.dl-horizontal dd')):
+                href = dd.find('a')
+                details_dict[dt.get_text(strip=True).lower()] = {
+                    'text': dd.get_text(' ', strip=True),
+                    'link': href['href'].strip() if href and href.get('href') else 'N/A',
+                }
+
+            missing = {'text': 'N/A', 'link': 'N/A'}
+            location = details_dict.get('location', missing)
+            sponsor = details_dict.get('sponsor', missing)
+            contact = details_dict.get('contact', missing)
+            description = details_dict.get('description', missing)
+
+            event_data.append({
+                'date': date,
+                'title': title,
+                'link': link,
+                'location': location['text'],
+                'location_link': location['link'],
+                'sponsor': sponsor['text'],
+                'sponsor_link': sponsor['link'],
+                'contact': contact['text'],
+                'contact_link': contact['link'],
+                'description': description['text'],
+            })
+        except Exception as e:
+            logger.error(f"Error processing event row: {str(e)}")
+
+    return {
+        'calendar_html': calendar_html,
+        'event_data': event_data
+    }
+
+
+def parse_iaea_news(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    news_container = soup.find('div', id='views-bootstrap-grid-1')
+    if not news_container:
+        logger.error("Could not find IAEA news container")
+        return []
+
+    news_items = news_container.find_all('div', class_='grid')
+    logger.info(f"Found {len(news_items)} news items")
+
+    news_data = []
+    for item in news_items:
+        try:
+            link_element = item.find('h4').find('a')
+            if link_element:
+                link = f"https://www.iaea.org{link_element['href']}"
+                title = link_element.text.strip()
+            else:
+                logger.warning("Skipping item without link")
+                continue
+
+            image_element = item.find('img')
+            image_url = f"https://www.iaea.org{image_element['src']}" if image_element else None
+
+            date_element = item.find('span', class_='dateline-published')
+            published_date = date_element.text.strip() if date_element else 'N/A'
+            try:
+                published_date = datetime.strptime(published_date, "%d %B %Y").strftime('%Y-%m-%d')
+            except ValueError:
+                logger.warning(f"Failed to parse date IAEA: {published_date}")
+                published_date = 'N/A'
+
+            content_type_element = item.find('div', class_='content-type-label-wrapper')
+            content_type = content_type_element.text.strip() if content_type_element else 'N/A'
+
+            news_data.append({
+                'id': hashlib.md5(link.encode()).hexdigest(),
+                'title': title,
+                'link': link,
+                'publisher': 'IAEA',
+                'published_date': published_date,
+                'image_url': image_url,
+                'content': content_type,
+            })
+        except Exception as e:
+            logger.error(f"Error processing news item: {str(e)}", exc_info=True)
+
+    return news_data
+
+
+def parse_html_table(table):
+    """Rows of a BeautifulSoup table as dicts keyed by its thead headers."""
+    headers = [th.get_text(strip=True) for th in table.select('thead th')]
+    data = []
+    for row in table.select('tbody tr'):
+        cells = row.find_all('td')
+        data.append({headers[i]: cell.get_text(strip=True) for i, cell in enumerate(cells) if i < len(headers)})
+    return data
+
+
+NUCLEAR_DATA_TABLES = {
+    'recent_connections': 'table.table1',
+    'top_load_factor': 'table.table2',
+    'top_generation': 'table.table3',
+    'top_lifetime_generation': 'table.table4',
+    'recent_construction_starts': 'table.table5',
+}
+
+
+def parse_nuclear_data(page_content):
+    """Counters and tables from the world-nuclear.org reactor summary; the charts are read from Highcharts separately."""
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    counters = [counter.get_text(strip=True) for counter in soup.find_all(class_='do_counter1')]
+    if len(counters) < 3:
+        logger.error("Could not find nuclear data counters")
+        return {}
+
+    data = {
+        'operable_reactors': counters[0],
+        'global_share': counters[1],
+        'under_construction': counters[2],
+    }
+    for key, selector in NUCLEAR_DATA_TABLES.items():
+        table = soup.select_one(selector)
+        data[key] = parse_html_table(table) if table else []
+    return data
+
+
+def parse_mining_com_news(page_content):
+    soup = BeautifulSoup(page_content, 'html.parser')
+
+    articles = soup.select('article.post.row.my-4.has-thumbnail')
+    news_data = []
+
+    for article in articles:
+        title_element = article.find('h2')
+        if not title_element or not title_element.find('a'):
+            continue
+        title = title_element.get_text(strip=True)
+        link = title_element.find('a')['href']
+
+        image_element = article.find('img')
+        image_url = image_element['src'] if image_element else 'No image available'
+
+        summary_element = article.find('p', class_='post-info')
+        summary = summary_element.get_text(strip=True) if summary_element else 'No summary available'
+
+        post_meta = article.find('div', class_='post-meta.mb-3')
+        if post_meta:
+            post_meta_text = post_meta.get_text(strip=True)
+            date_str = post_meta_text.split("|")[1].strip() if "|" in post_meta_text else 'N/A'
+            try:
+                published_date = datetime.strptime(date_str, "%B %d, %Y") if date_str != 'N/A' else 'N/A'
+            except ValueError:
+                logger.warning(f"Failed to parse date mining_com: {date_str}")
+                published_date = 'N/A'
+            author = post_meta.find('a').get_text(strip=True) if post_meta.find('a') else 'N/A'
+        else:
+            published_date = 'N/A'
+            author = 'N/A'
+
+        news_data.append({
+            'id': hashlib.md5(link.encode()).hexdigest(),
+            'title': title,
+            'link': link,
+            'publisher': 'Mining.com',
+            'published_date': published_date,
+            'author': author,
+            'image_url': image_url,
+            'content': summary,
+        })
+
+    return news_data
+
+
+def parse_nucnet_news(page_content, base_url='https://www.nucnet.org'):
+    soup = BeautifulSoup(page_content, 'html.parser')
+    news_data = []
+
+    for news in soup.select('div.search-news-box.clickable-box'):
+        title_element = news.select_one('h4.news-box-title')
+        link_element = news.select_one('a.clickable-box-link')
+        if not title_element or not link_element or not link_element.get('href'):
+            continue
+        title = title_element.get_text(strip=True)
+        link = urljoin(base_url, link_element['href'])
+
+        date_element = news.select_one('time.news-box-date')
+        date_str = date_element.get_text(strip=True) if date_element else 'N/A'
+
+        # Convert date from "20 September 2024" to "2024-09-20"
+        try:
+            published_date = datetime.strptime(date_str, "%d %B %Y").strftime("%Y-%m-%d")
+        except ValueError:
+            published_date = 'N/A'
+
+        image_element = news.select_one('div.news-box-img img')
+        image_url = urljoin(base_url, image_element['src']) if image_element and image_element.get('src') else 'No image available'
+
+        news_data.append({
+            'id': hashlib.md5(link.encode()).hexdigest(),
+            'title': title,
+            'link': link,
+            'publisher': 'NUCNET',
+            'published_date': published_date,
+            'author': 'N/A',
+            'image_url': image_url,
+            'content': 'N/A',
+        })
+
+    return news_data
+
+
+def parse_inform_kz_news(page_content, base_url='https://en.inform.kz'):
+    soup = BeautifulSoup(page_content, 'html.parser')
+    news_data = []
+
+    for news in soup.select('div.searchCard'):
+        title_element = news.select_one('div.searchCard_title')
+        link_element = news.find('a')
+        if not title_element or not link_element or not link_element.get('href'):
+            continue
+        title = title_element.get_text(strip=True)
+        link = urljoin(base_url, link_element['href'])
+
+        date_element = news.select_one('div.searchCard_time')
+        date_str = date_element.get_text(strip=True) if date_element else 'N/A'
+
+        # Convert date from "16:20, 28 August 2024" to "2024-08-28"
+        try:
+            published_date = datetime.strptime(date_str.split(",")[1].strip(), "%d %B %Y").strftime("%Y-%m-%d")
+        except (ValueError, IndexError):
+            published_date = 'N/A'
+
+        image_element = news.select_one('picture img')
+        image_url = urljoin(base_url, image_element['src']) if image_element and image_element.get('src') else 'No image available'
+
+        news_data.append({
+            'id': hashlib.md5(link.encode()).hexdigest(),
+            'title': title,
+            'link': link,
+            'publisher': 'INFORM.KZ',
+            'published_date': published_date,
+            'author': 'N/A',
+            'image_url': image_url,
+            'content': 'N/A',
+        })
+
+    return news_data
+
+
+# Structured data some news sites embed for search engines, used by the
+# 'json' fetch tier to read articles without rendering the page.
+ARTICLE_TYPES = {'NewsArticle', 'Article', 'BlogPosting', 'ReportageNewsArticle'}
+
+
+def extract_embedded_json(page_content):
+    """Return every JSON document embedded in the page's ld+json, __NEXT_DATA__ and application/json scripts."""
+    soup = BeautifulSoup(page_content, 'html.parser')
+    documents = []
+    for script in soup.find_all('script', type=['application/ld+json', 'application/json']):
+        try:
+            documents.append(json.loads(script.string or ''))
+        except ValueError:
+            continue
+    return documents
+
+
+def _walk_json(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk_json(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk_json(value)
+
+
+def _json_text(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('url')
+    return value.strip() if isinstance(value, str) and value.strip() else 'N/A'
+
+
+def parse_embedded_news(page_content, publisher, base_url):
+    """News items from schema.org articles embedded in the page, in the same shape as the HTML parsers."""
+    news_data = []
+    seen = set()
+
+    for document in extract_embedded_json(page_content):
+        for node in _walk_json(document):
+            types = node.get('@type')
+            types = set(types) if isinstance(types, list) else {types}
+            if not types & ARTICLE_TYPES:
+                continue
+            title = _json_text(node.get('headline') or node.get('name'))
+            link = _json_text(node.get('url') or node.get('mainEntityOfPage'))
+            if title == 'N/A' or link == 'N/A':
+                continue
+            link = urljoin(base_url, link)
+            if link in seen:
+                continue
+            seen.add(link)
+
+            date_str = _json_text(node.get('datePublished'))
+            try:
+                published_date = datetime.fromisoformat(date_str[:10]).strftime('%Y-%m-%d')
+            except ValueError:
+                published_date = 'N/A'
+
+            image_url = _json_text(node.get('image') or node.get('thumbnailUrl'))
+            news_data.append({
+                'id': hashlib.md5(link.encode()).hexdigest(),
+                'title': title,
+                'link': link,
+                'publisher': publisher,
+                'published_date': published_date,
+                'author': _json_text(node.get('author')),
+                'image_url': urljoin(base_url, image_url) if image_url != 'N/A' else 'No image available',
+                'content': _json_text(node.get('description')),
+            })
+
+    return news_data
@@ -0,0 +1,418 @@
+# uranium_project\uranium_app\payloads.py
+
+import copy
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from django.conf import settings
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import brotli
+except ImportError:
+    # Listed in requirements.txt; without it payloads are precompressed with gzip only
+    brotli = None
+
+from .stock_store import StockStore, descending
+
+
+logger = logging.getLogger('uranium_app')
+
+
+# A rendered response body, in content coding encoding. etag and
+# last_modified change only when body does; max_age is how long clients may
+# reuse it before its sources are due to be refreshed.
+Payload = namedtuple('Payload', 'status body etag last_modified max_age encoding', defaults=('identity',))
+
+# Content codings payloads are precompressed in, most preferred first
+ENCODING_PREFERENCE = ('br', 'gzip')
+
+
+class PayloadUnavailable(Exception):
+    """The data a payload is built from is missing; sent as {'message': ...} with status_code."""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def prepare_chart_data(chart_data):
+    for chart_type in ['intraday', 'three_year']:
+        if chart_type in chart_data and 'svg' in chart_data[chart_type]:
+            chart_data[chart_type]['svg'] = chart_data[chart_type]['svg']
+    return json.dumps(chart_data)
+
+
+def build_home(uranium_data, store, history=False):
+    uranium_data = dict(uranium_data)
+    spot_price = uranium_data.get('spot_price', 'N/A')
+
+    if 'chart_data' in uranium_data:
+        uranium_data['chart_data'] = prepare_chart_data(copy.deepcopy(uranium_data['chart_data']))
+
+    # Each stock's one-year 'data' and 'dates' only go out with include=history
+    change_1d = store.change_1d()
+    symbols = store.symbols.tolist()
+    stocks = {}
+    for i, symbol in enumerate(symbols):
+        stocks[symbol] = store.record(i, history=history)
+        stocks[symbol]['change_1d'] = None if np.isnan(change_1d[i]) else float(change_1d[i])
+    uranium_data['stocks'] = stocks
+
+    most_followed_stocks = [(symbols[i], stocks[symbols[i]]) for i in descending(store.column('volume'))[:5]]
+
+    sorted_stocks = [(symbols[i], stocks[symbols[i]]) for i in descending(change_1d)]
+    top_gainers = sorted_stocks[:8]
+    top_losers = sorted_stocks[-8:][::-1]
+
+    stock_datas = []
+    for ticker, info in stocks.items():
+        stock_datas.append({
+            "ticker": "  " + ticker,
+            "current_price": info.get("current_price", None),
+            "change_1m": info.get("change_1m", None),
+        })
+
+    mining_tech_news = uranium_data.get('mining_technology_com_news', [])
+    featured_news = mining_tech_news[:2] if mining_tech_news else None
+    stock_news_data = uranium_data.get("stock_news")[:4]
+
+    return {
+        "uranium_data": uranium_data,
+        'uranium_spot_price': spot_price,
+        'most_followed_stocks': most_followed_stocks,
+        'top_gainers': top_gainers,
+        'top_losers': top_losers,
+        'stocks': stock_datas,
+        "stock_news": stock_news_data[:4],
+        "featured_news": featured_news
+    }
+
+
+def build_news(uranium_data, store):
+    mining_tech_news = uranium_data.get('mining_technology_com_news', [])
+    inform_news = uranium_data.get('inform_kz_news', [])
+    mining_com_news = uranium_data.get('mining_com_news', [])
+    northern_miner_com_news = uranium_data.get('northern_miner_com_news', [])
+    world_nuclear_news_com = uranium_data.get('world_nuclear_news_com', [])
+    stock_news = uranium_data.get('stock_news', [])
+    iaea_news = uranium_data.get('iaea_news', [])
+
+    featured_news = mining_tech_news[0] if mining_tech_news else None
+
+    return {
+        'featured_news': featured_news,
+        'latest_news': (
+            mining_com_news[:3] +
+            world_nuclear_news_com[:3] +
+            mining_tech_news[:3] +
+            iaea_news[:3]
+        ),
+        'global_uranium_news': (
+            northern_miner_com_news[:2] +
+            world_nuclear_news_com[3:6] +
+            inform_news[:4]
+        ),
+        'stock_news': stock_news[:9]
+    }
+
+
+def build_calendar(uranium_data, store):
+    calendar = uranium_data.get('calendar', {}) or {}
+    return {
+        'calendar_html': calendar.get('calendar_html', ''),
+        'event_data': calendar.get('event_data', [])
+    }
+
+
+def build_stocks(uranium_data, store, history=False):
+    stocks = uranium_data.get('stocks', {})
+
+    if not isinstance(stocks, dict):
+        logger.error(f"Unexpected stocks data type: {type(stocks)}")
+        raise PayloadUnavailable('Unexpected data format for stocks.', status.HTTP_500_INTERNAL_SERVER_ERROR)
+    if not stocks:
+        logger.warning("No stocks data found in uranium_data")
+        raise PayloadUnavailable('No stock data available.', status.HTTP_404_NOT_FOUND)
+
+    symbols = store.symbols.tolist()
+    # The 'data' and 'dates' of the gainers, losers and most followed only go out with include=history
+    records = [store.record(i, history=history) for i in range(len(store))]
+    stocks_list = []
+    for symbol, record in zip(symbols, records):
+        stocks_list.append({
+            'ticker_name': symbol,
+            'company_name': record["name"],
+            'change_1m': record["change_1m"],
+            'current_price': record["current_price"],
+            'last_price': record["last_price"],
+            'change_1y': record["change_1y"],
+            'volume': record["volume"],
+            'market_cap': record["market_cap"],
+            'pe_ratio': record["pe_ratio"]
+        })
+
+    prices = store.column('current_price')
+    changes = store.column('change_1m')
+    sorted_stocks = [(symbols[i], records[i]) for i in descending(changes)]
+
+    return {
+        'stocks': stocks_list,
+        'uranium_spot_price': uranium_data.get('spot_price', 'N/A'),
+        'total_stocks': len(store),
+        'average_price': float(np.nanmean(prices)) if (~np.isnan(prices)).any() else 0,
+        'total_market_cap': float(np.nansum(store.column('market_cap'))),
+        'average_1m_change': float(np.nanmean(changes)) if (~np.isnan(changes)).any() else 0,
+        'top_performing_stocks': sorted_stocks[:5],
+        'top_losers': sorted_stocks[-5:],
+        'most_followed_stocks': [(symbols[i], records[i]) for i in descending(store.column('volume'))[:5]],
+    }
+
+
+def build_nuclear_data(uranium_data, store):
+    nuclear_data = uranium_data.get('nuclear_data', {})
+    if not nuclear_data:
+        logger.warning("No nuclear data found in uranium_data")
+        raise PayloadUnavailable('Failed to retrieve nuclear data.', status.HTTP_404_NOT_FOUND)
+    return {'data': nuclear_data}
+
+
+def build_source_news(key):
+    def build(uranium_data, store):
+        return {"data": uranium_data.get(key, [])}
+    return build
+
+
+# News sources served on their own under /news/<source>/
+SOURCE_NEWS = [
+    'mining_com_news', 'nucnet_news', 'world_nuclear_news_com', 'mining_technology_com_news',
+    'inform_kz_news', 'stock_news', 'iaea_news', 'northern_miner_com_news',
+]
+
+# Response bodies derived from the uranium data, built when a snapshot is
+# published instead of on every request, and the sources each one is built
+# from (None for all of them)
+PAYLOAD_BUILDERS = {
+    'home': build_home,
+    'home_history': lambda uranium_data, store: build_home(uranium_data, store, history=True),
+    'news': build_news,
+    'calendar': build_calendar,
+    'stocks': build_stocks,
+    'stocks_history': lambda uranium_data, store: build_stocks(uranium_data, store, history=True),
+    'nuclear_data': build_nuclear_data,
+    **{f'news_{key}': build_source_news(key) for key in SOURCE_NEWS},
+}
+PAYLOAD_SOURCES = {
+    'home': None,
+    'home_history': None,
+    'news': [
+        'mining_technology_com_news', 'inform_kz_news', 'mining_com_news', 'northern_miner_com_news',
+        'world_nuclear_news_com', 'stock_news', 'iaea_news',
+    ],
+    'calendar': ['calendar'],
+    'stocks': ['stocks', 'uranium_price'],
+    'stocks_history': ['stocks', 'uranium_price'],
+    'nuclear_data': ['nuclear_data'],
+    **{f'news_{key}': [key] for key in SOURCE_NEWS},
+}
+
+
+# Heavier versions of a payload that ?include= can ask for, by payload and include name
+PAYLOAD_INCLUDES = {
+    'home': {'history': 'home_history'},
+    'stocks': {'history': 'stocks_history'},
+}
+
+
+def included_payload(name, include):
+    """
+    The stored payload to start from given an include= parameter.
+
+    Unknown include names are ignored, so clients can ask for them before
+    an endpoint supports them.
+    """
+    for option in include:
+        name = PAYLOAD_INCLUDES.get(name, {}).get(option, name)
+    return name
+
+
+def parse_fields(value):
+    """
+    Turn a fields= parameter into a sorted tuple of dotted paths.
+
+    fields=stocks.ticker_name,stocks.current_price,total_stocks keeps the
+    total and two columns of every row in stocks.
+    """
+    return tuple(sorted({path.strip() for path in value.split(',') if path.strip()}))
+
+
+def select_fields(value, paths):
+    """
+    Keep only the parts of value named by paths.
+
+    Each dotted path walks into dict keys; a list passes the rest of the path
+    on to every element, and '*' stands for every key of a dict, so
+    uranium_data.stocks.*.current_price keeps one field per ticker.
+    """
+    tree = {}
+    for path in paths:
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return _select(value, tree)
+
+
+def _select(value, tree):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    selected = {}
+    for key, subtree in tree.items():
+        if key == '*':
+            for name, item in value.items():
+                selected[name] = _select(item, subtree)
+        elif key in value:
+            selected[key] = _select(value[key], subtree)
+    return selected
+
+
+_filtered_bodies = OrderedDict()
+_filtered_lock = threading.Lock()
+# Filtered bodies kept per process; dashboards poll with the same few fields= values
+FILTERED_CACHE_SIZE = 64
+
+
+def filtered_body(etag, body, paths):
+    """
+    Render body with only paths kept, remembering the result for etag.
+
+    Returns:
+    bytes: The filtered JSON.
+    """
+    key = (etag, paths)
+    with _filtered_lock:
+        if key in _filtered_bodies:
+            _filtered_bodies.move_to_end(key)
+            return _filtered_bodies[key]
+
+    filtered = JSONRenderer().render(select_fields(json.loads(body), paths))
+    with _filtered_lock:
+        _filtered_bodies[key] = filtered
+        while len(_filtered_bodies) > FILTERED_CACHE_SIZE:
+            _filtered_bodies.popitem(last=False)
+    return filtered
+
+
+def payload_max_age(name, saved_at, now=None):
+    """
+    Seconds until the first source behind a payload is due to be refreshed.
+
+    Each source is refreshed every URANIUM_REFRESH_INTERVALS seconds after
+    it was last published; a source that is overdue, or not published yet,
+    gives 0 so clients revalidate on every poll until it arrives.
+    """
+    now = now or time.time()
+    intervals = settings.URANIUM_REFRESH_INTERVALS
+    names = PAYLOAD_SOURCES.get(name) or list(intervals)
+    due = [saved_at[source] + intervals[source] if source in saved_at else now for source in names if source in intervals]
+    return max(int(min(due, default=now) - now), 0)
+
+
+def render_payload(name, uranium_data, store=None):
+    """
+    Build one payload and render it the way DRF's Response would.
+
+    Args:
+    name (str): Payload name in PAYLOAD_BUILDERS.
+    uranium_data (Mapping): The uranium data.
+    store (StockStore): uranium_data's stocks as columns; built here when not given.
+
+    Returns:
+    tuple: (status code, JSON bytes).
+    """
+    if store is None:
+        store = StockStore.from_stocks(uranium_data.get('stocks'))
+    try:
+        payload = PAYLOAD_BUILDERS[name](uranium_data, store)
+        code = status.HTTP_200_OK
+    except PayloadUnavailable as e:
+        payload, code = {'message': e.message}, e.status_code
+    return code, JSONRenderer().render(payload)
+
+
+def render_payloads(uranium_data, store):
+    """Every payload in PAYLOAD_BUILDERS as {name: (status code, JSON bytes)}; one that fails to build is left out."""
+    payloads = {}
+    for name in PAYLOAD_BUILDERS:
+        try:
+            payloads[name] = render_payload(name, uranium_data, store)
+        except Exception as e:
+            logger.error(f"Error building {name} payload: {str(e)}", exc_info=True)
+    return payloads
+
+
+def gzip_body(data):
+    if len(data) < settings.URANIUM_PAYLOAD_COMPRESS_MIN_BYTES:
+        return None
+    # mtime=0 keeps the output, and so what clients cache, identical for identical payloads
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_body(data):
+    if len(data) < settings.URANIUM_PAYLOAD_COMPRESS_MIN_BYTES:
+        return None
+    return brotli.compress(data, quality=settings.URANIUM_BROTLI_QUALITY)
+
+
+def payload_encoders():
+    """Compressors for each content coding payloads are stored in; brotli only when it is installed."""
+    encoders = {'gzip': gzip_body}
+    if brotli is not None:
+        encoders['br'] = brotli_body
+    else:
+        logger.warning("brotli is not installed, payloads are stored without a br variant")
+    return encoders
+
+
+def choose_encoding(accept_encoding, available):
+    """
+    Pick the content coding to send from an Accept-Encoding header.
+
+    Args:
+    accept_encoding (str): The request's Accept-Encoding header.
+    available (list): Codings the payload is stored in, besides identity.
+
+    Returns:
+    str: The accepted coding with the highest q-value, ties going by
+    ENCODING_PREFERENCE, or 'identity'.
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding.lower()] = q
+
+    best, best_q = 'identity', 0.0
+    for coding in ENCODING_PREFERENCE:
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if coding in available and q > best_q:
+            best, best_q = coding, q
+    return best
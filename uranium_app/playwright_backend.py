@@ -0,0 +1,127 @@
+# uranium_project\uranium_app\playwright_backend.py
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+
+from .browser import BROWSER_USER_AGENT, PAGE_LOAD_SCRIPT, blocked_resources, record_page_load, record_readiness
+
+
+logger = logging.getLogger('uranium_app')
+
+
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-blink-features=AutomationControlled',
+]
+
+
+@asynccontextmanager
+async def source_page(browser, source):
+    """
+    Open a page for source in a fresh browser context.
+
+    Contexts are isolated like separate browser profiles but share the one
+    Chromium process. Resources from blocked_resources(source) are aborted by
+    Playwright's request routing, which sees each request's resource type.
+    """
+    context = await browser.new_context(user_agent=BROWSER_USER_AGENT)
+    context.set_default_timeout(settings.URANIUM_PAGE_LOAD_TIMEOUT * 1000)
+    types, hosts = blocked_resources(source)
+    if types or hosts:
+        async def block(route):
+            request = route.request
+            if request.resource_type in types or any(host in request.url for host in hosts):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route('**/*', block)
+
+    try:
+        yield await context.new_page()
+    finally:
+        await context.close()
+
+
+async def goto_page(page, source, url):
+    """Open url and record its bytes and load time like browser.load_page does."""
+    await page.goto(url)
+    try:
+        loaded = await page.evaluate(PAGE_LOAD_SCRIPT)
+    except Exception as e:
+        logger.warning(f"Could not read page load timings for {source}: {str(e)}")
+        return
+    types, hosts = blocked_resources(source)
+    record_page_load(source, bool(types or hosts), loaded)
+
+
+async def wait_for_page(page, source, selector=None, function=None):
+    """
+    Wait for selector to be attached, or for the JavaScript function to return truthy.
+
+    Playwright's counterpart to browser.wait_until_ready, using the same
+    per-source timeouts and recording into the same readiness stats.
+
+    Returns:
+    bool: True once ready, False if the timeout ran out first.
+    """
+    timeout = settings.URANIUM_READINESS_TIMEOUTS.get(source, settings.URANIUM_READINESS_DEFAULT_TIMEOUT)
+    start = time.perf_counter()
+    try:
+        if selector:
+            await page.wait_for_selector(selector, state='attached', timeout=timeout * 1000)
+        else:
+            await page.wait_for_function(
+                function,
+                polling=settings.URANIUM_READINESS_POLL_INTERVAL * 1000,
+                timeout=timeout * 1000,
+            )
+        ready = True
+    except PlaywrightTimeoutError:
+        logger.error(f"Timeout after {timeout}s waiting for {source} to load")
+        ready = False
+
+    record_readiness(source, time.perf_counter() - start, ready)
+    return ready
+
+
+def run_pages(scrapers, concurrency=None):
+    """
+    Run page scrapers concurrently in one Chromium, one context each.
+
+    Args:
+    scrapers (dict): Source name to a coroutine function taking a Playwright page.
+    concurrency (int): Contexts open at once, URANIUM_PLAYWRIGHT_CONTEXTS by default.
+
+    Returns:
+    dict: source name to result; an exception is returned in place of its
+    scraper's result.
+    """
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency or settings.URANIUM_PLAYWRIGHT_CONTEXTS)
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+            async def run(name, scraper):
+                async with semaphore:
+                    async with source_page(browser, name) as page:
+                        return await scraper(page)
+
+            try:
+                return await asyncio.gather(
+                    *(run(name, scraper) for name, scraper in scrapers.items()),
+                    return_exceptions=True,
+                )
+            finally:
+                await browser.close()
+
+    return dict(zip(scrapers, asyncio.run(main())))
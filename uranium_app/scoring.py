@@ -0,0 +1,145 @@
+# uranium_project\uranium_app\scoring.py
+
+import numpy as np
+import pandas as pd
+
+from .stock_store import NUMERIC_FIELDS, descending
+
+
+# Weight of each normalized field in the performance score when the caller gives none
+DEFAULT_WEIGHTS = {'change_1m': 0.4, 'change_1y': 0.3, 'pe_ratio': 0.1, 'volume': 0.1, 'market_cap': 0.1}
+DEFAULT_NORMALIZATION = 'minmax'
+DEFAULT_TOP_K = 3
+
+
+class InvalidScoring(ValueError):
+    """The weights, normalization or top_k a caller asked for can't be used; sent back as a 400."""
+
+
+def minmax(values):
+    low, high = values.min(), values.max()
+    if low == high:
+        return np.zeros(len(values))
+    return (values - low) / (high - low)
+
+
+def zscore(values):
+    std = values.std()
+    if std == 0:
+        return np.zeros(len(values))
+    return (values - values.mean()) / std
+
+
+def rank(values):
+    # Ties share their average rank; scaled so the lowest is 0 and the highest 1
+    if len(values) == 1:
+        return np.zeros(1)
+    return (pd.Series(values).rank(method='average').to_numpy() - 1) / (len(values) - 1)
+
+
+NORMALIZATIONS = {'minmax': minmax, 'zscore': zscore, 'rank': rank}
+
+
+def normalize(values, method=DEFAULT_NORMALIZATION):
+    """
+    Normalize one column of values, scoring stocks without a value as 0.
+
+    Args:
+    values (numpy.ndarray): float64 column with NaN for missing values.
+    method (str): One of NORMALIZATIONS.
+
+    Returns:
+    numpy.ndarray: The normalized column, or None if no stock has a value.
+    """
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return None
+    normalized = np.zeros(len(values))
+    normalized[valid] = NORMALIZATIONS[method](values[valid])
+    return normalized
+
+
+def top_indices(scores, k):
+    """
+    Indices of the k highest scores, highest first, ties in their original order.
+
+    Only the scores that can make the cut are sorted, so picking a few out
+    of thousands stays linear.
+    """
+    if k >= len(scores):
+        return descending(scores)
+    threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+    candidates = np.flatnonzero(scores >= threshold)
+    return candidates[descending(scores[candidates])][:k]
+
+
+def scoring_options(data):
+    """
+    Read and check weights, normalization and top_k from a request body.
+
+    weights maps fields to weights, negative to favour low values. normalization
+    is one method for every field or a {field: method} dict, any field left
+    out using the default.
+
+    Returns:
+    tuple: (weights, {field: method}, top_k).
+
+    Raises:
+    InvalidScoring: If any of them is malformed.
+    """
+    weights = data.get('weights') or DEFAULT_WEIGHTS
+    if not isinstance(weights, dict):
+        raise InvalidScoring('weights must map fields to numbers.')
+    unknown = [field for field in weights if field not in NUMERIC_FIELDS]
+    if unknown:
+        raise InvalidScoring(f"Unknown fields in weights: {', '.join(map(str, unknown))}. Use {', '.join(NUMERIC_FIELDS)}.")
+    try:
+        weights = {field: float(weight) for field, weight in weights.items()}
+    except (TypeError, ValueError):
+        raise InvalidScoring('weights must map fields to numbers.')
+    if not all(np.isfinite(weight) for weight in weights.values()):
+        raise InvalidScoring('weights must be finite numbers.')
+
+    normalization = data.get('normalization') or DEFAULT_NORMALIZATION
+    if isinstance(normalization, str):
+        methods = {field: normalization for field in weights}
+    elif isinstance(normalization, dict):
+        methods = {field: normalization.get(field, DEFAULT_NORMALIZATION) for field in weights}
+    else:
+        raise InvalidScoring('normalization must be a method name or a {field: method} dict.')
+    unknown = sorted({str(method) for method in methods.values() if method not in NORMALIZATIONS})
+    if unknown:
+        raise InvalidScoring(f"Unknown normalization {', '.join(unknown)}. Use {', '.join(NORMALIZATIONS)}.")
+
+    top_k = data.get('top_k', DEFAULT_TOP_K)
+    if isinstance(top_k, bool) or not isinstance(top_k, (int, str)) or not str(top_k).isdigit() or int(top_k) < 1:
+        raise InvalidScoring('top_k must be a positive integer.')
+    return weights, methods, int(top_k)
+
+
+def score_stocks(store, weights=None, methods=None, top_k=DEFAULT_TOP_K):
+    """
+    Score every stock in store as the weighted sum of its normalized fields and pick the best.
+
+    Fields no stock has a value for are left out of the score.
+
+    Args:
+    store (StockStore): The stocks to score.
+    weights (dict): {field: weight}, DEFAULT_WEIGHTS if not given.
+    methods (dict): {field: normalization}, DEFAULT_NORMALIZATION for any field missing.
+    top_k (int): How many stocks to return.
+
+    Returns:
+    tuple: (indices of the top_k stocks best first, all scores, {field: normalized column}).
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    methods = methods or {}
+    scores = np.zeros(len(store))
+    normalized = {}
+    for field, weight in weights.items():
+        column = normalize(store.column(field), methods.get(field, DEFAULT_NORMALIZATION))
+        if column is None:
+            continue
+        normalized[field] = column
+        scores += column * weight
+    return top_indices(scores, top_k), scores, normalized
@@ -0,0 +1,177 @@
+# uranium_project\uranium_app\screener.py
+
+import math
+import re
+
+import numpy as np
+from django.conf import settings
+
+from .stock_store import NUMERIC_FIELDS, TEXT_FIELDS
+
+
+# field, comparison and number of one filter expression, as in 'pe_ratio<20'
+FILTER_PATTERN = re.compile(r'^\s*(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(\S+)\s*$')
+# Fields results can be sorted by, besides the numeric ones
+SORT_TEXT_FIELDS = ('ticker',) + TEXT_FIELDS
+# How listings without an exchange suffix are asked for in exchange=
+NO_SUFFIX_EXCHANGE = 'US'
+
+
+class InvalidScreen(ValueError):
+    """A filter, sort or page a caller asked for can't be used; sent back as a 400."""
+
+
+def _split(values):
+    # Repeated parameters and comma-separated lists are read the same way
+    return [part.strip() for value in values for part in value.split(',') if part.strip()]
+
+
+def parse_filter(expression):
+    """
+    Parse a filter expression such as 'pe_ratio<20' or 'change_1m>=5'.
+
+    Returns:
+    tuple: (field, operator, value) with '==' written as '='.
+
+    Raises:
+    InvalidScreen: If the expression, field or value can't be used.
+    """
+    match = FILTER_PATTERN.match(expression)
+    if not match:
+        raise InvalidScreen(f"Can't read filter '{expression}'. Write it as field<value, field>=value, field=value and so on.")
+    field, operator, value = match.groups()
+    if field not in NUMERIC_FIELDS:
+        raise InvalidScreen(f"Can't filter on '{field}'. Use {', '.join(NUMERIC_FIELDS)}.")
+    try:
+        value = float(value)
+    except ValueError:
+        raise InvalidScreen(f"'{value}' in filter '{expression}' is not a number.")
+    if math.isnan(value):
+        raise InvalidScreen(f"'{value}' in filter '{expression}' is not a number.")
+    return field, '=' if operator == '==' else operator, value
+
+
+def parse_sort(keys):
+    """['-change_1m', 'pe_ratio'] -> [('change_1m', True), ('pe_ratio', False)], True meaning descending."""
+    sort = []
+    for key in keys:
+        field = key.lstrip('-+')
+        if field not in NUMERIC_FIELDS + SORT_TEXT_FIELDS:
+            raise InvalidScreen(f"Can't sort by '{field}'. Use {', '.join(NUMERIC_FIELDS + SORT_TEXT_FIELDS)}.")
+        sort.append((field, key.startswith('-')))
+    return sort
+
+
+def _positive_int(value, name, default):
+    if value in (None, ''):
+        return default
+    if not str(value).isdigit() or int(value) < 1:
+        raise InvalidScreen(f'{name} must be a positive integer.')
+    return int(value)
+
+
+def screen_options(params):
+    """
+    Read a screen from query parameters.
+
+    filter, country, exchange and sort can each be repeated or given as
+    comma-separated lists:
+    ?filter=pe_ratio<20,change_1m>5&country=Canada&exchange=TO,V&sort=-change_1m&page=2
+
+    Args:
+    params (QueryDict): The request's query parameters.
+
+    Returns:
+    dict: Keyword arguments for screen().
+
+    Raises:
+    InvalidScreen: If any parameter is malformed.
+    """
+    page_size = _positive_int(params.get('page_size'), 'page_size', settings.URANIUM_SCREENER_PAGE_SIZE)
+    if page_size > settings.URANIUM_SCREENER_MAX_PAGE_SIZE:
+        raise InvalidScreen(f'page_size can be at most {settings.URANIUM_SCREENER_MAX_PAGE_SIZE}.')
+    return {
+        'filters': [parse_filter(expression) for expression in _split(params.getlist('filter'))],
+        'countries': _split(params.getlist('country')),
+        'exchanges': _split(params.getlist('exchange')),
+        'sort': parse_sort(_split(params.getlist('sort'))),
+        'page': _positive_int(params.get('page'), 'page', 1),
+        'page_size': page_size,
+    }
+
+
+def filter_mask(store, filters=(), countries=(), exchanges=()):
+    """
+    Which stocks pass every filter, as a boolean array over store's rows.
+
+    Numeric comparisons binary search the field's sorted index and only touch
+    the rows in range; a stock without a value for the field never passes.
+    Countries and exchanges are matched case-insensitively; '' or 'US' in
+    exchanges matches symbols without a suffix.
+    """
+    mask = np.ones(len(store), dtype=bool)
+    for field, operator, value in filters:
+        passing = np.zeros(len(store), dtype=bool)
+        if operator == '!=':
+            passing[store.sorted_index(field)] = True
+            passing[store.range_rows(field, value, value)] = False
+        else:
+            low, high = {
+                '<': (None, value), '<=': (None, value), '>': (value, None), '>=': (value, None), '=': (value, value),
+            }[operator]
+            passing[store.range_rows(field, low, high, include_low=operator != '>', include_high=operator != '<')] = True
+        mask &= passing
+
+    if countries:
+        mask &= store.rows_matching('country_name', countries)
+    if exchanges:
+        mask &= store.rows_matching('exchange', ['' if exchange.upper() == NO_SUFFIX_EXCHANGE else exchange.lstrip('.') for exchange in exchanges])
+    return mask
+
+
+def sort_rows(store, rows, sort):
+    """
+    Order rows by the (field, descending) keys in sort, the first deciding most.
+
+    Stocks without a value for a key go after those with one, whichever the
+    direction; ties keep the store's order.
+    """
+    if not sort or not len(rows):
+        return rows
+    keys = []
+    for field, descending in reversed(sort):
+        values = store.symbols[rows] if field == 'ticker' else store.column(field)[rows]
+        if values.dtype.kind == 'f':
+            missing = np.isnan(values)
+            values = np.where(missing, 0, values)
+        else:
+            missing = values == ''
+            # Text sorts by its position among the distinct values, which can be negated like a number
+            values = np.unique(values, return_inverse=True)[1]
+        keys.extend((-values if descending else values, missing))
+    return rows[np.lexsort(keys)]
+
+
+def screen(store, filters=(), countries=(), exchanges=(), sort=(), page=1, page_size=None):
+    """
+    Filter, sort and page the stocks in store.
+
+    Returns:
+    dict: 'total' matching stocks, 'page', 'page_size', 'pages' and the page's
+    'results', each a stock record with its 'ticker' and 'exchange'.
+    """
+    page_size = page_size or settings.URANIUM_SCREENER_PAGE_SIZE
+    rows = sort_rows(store, np.flatnonzero(filter_mask(store, filters, countries, exchanges)), sort)
+    start = (page - 1) * page_size
+
+    results = []
+    for i in rows[start:start + page_size].tolist():
+        exchange = str(store.exchanges[i])
+        results.append({'ticker': str(store.symbols[i]), 'exchange': exchange or NO_SUFFIX_EXCHANGE, **store.record(i)})
+    return {
+        'total': len(rows),
+        'page': page,
+        'page_size': page_size,
+        'pages': math.ceil(len(rows) / page_size),
+        'results': results,
+    }
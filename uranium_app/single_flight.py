@@ -0,0 +1,122 @@
+# uranium_project\uranium_app\single_flight.py
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from filelock import FileLock, Timeout
+
+
+logger = logging.getLogger('uranium_app')
+
+
+SINGLE_FLIGHT_CACHE_KEY = 'uranium_single_flight_stats'
+
+
+class SingleFlight:
+    """
+    A lock file that lets one process on the machine do a given piece of work.
+
+    Gunicorn workers, Celery workers and their children all see the same
+    lock, so when several notice the same stale source at once only one
+    scrapes it and the rest keep serving what they have. Hold times and
+    contention are recorded per name, see single_flight_stats.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        os.makedirs(settings.URANIUM_LOCK_DIR, exist_ok=True)
+        self._lock = FileLock(os.path.join(settings.URANIUM_LOCK_DIR, f'{name}.lock'))
+        self._acquired_at = None
+
+    def acquire(self, timeout=0):
+        """
+        Take the lock, waiting at most timeout seconds.
+
+        Returns:
+        bool: True if this caller now holds it, False if someone else does.
+        """
+        start = time.monotonic()
+        try:
+            self._lock.acquire(timeout=timeout)
+        except Timeout:
+            logger.info(f"{self.name} is already in progress elsewhere")
+            _record(self.name, contended=True, waited=time.monotonic() - start)
+            return False
+        self._acquired_at = time.monotonic()
+        _record(self.name, waited=self._acquired_at - start)
+        return True
+
+    def release(self):
+        held = time.monotonic() - self._acquired_at
+        self._lock.release()
+        self._acquired_at = None
+        _record(self.name, held=held)
+
+
+@contextmanager
+def single_flight(name, timeout=0):
+    """with single_flight(name) as acquired: ... runs the body either way; do the work only if acquired."""
+    flight = SingleFlight(name)
+    acquired = flight.acquire(timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            flight.release()
+
+
+def update_cached(key, update, default=None):
+    """
+    Read-modify-write the cache entry key under a lock shared by every process.
+
+    update gets the current value, or default when there is none, and
+    returns the value to store. Stats that many workers add to go through
+    here; a plain get-then-set would let the last writer drop the others'
+    updates.
+
+    Returns:
+    The stored value, or None if the lock couldn't be taken.
+    """
+    try:
+        os.makedirs(settings.URANIUM_LOCK_DIR, exist_ok=True)
+        with FileLock(os.path.join(settings.URANIUM_LOCK_DIR, f'{key}.stats.lock'), timeout=5):
+            value = update(cache.get(key, default))
+            cache.set(key, value, timeout=None)
+            return value
+    except Exception as e:
+        logger.warning(f"Could not update {key}: {str(e)}")
+        return None
+
+
+def _record(name, contended=False, waited=0, held=None):
+    def update(stats):
+        entry = stats.setdefault(name, {
+            'acquired': 0, 'contended': 0, 'wait_seconds': 0.0,
+            'hold_seconds': 0.0, 'max_hold_seconds': 0.0, 'last_contended': None,
+        })
+        entry['wait_seconds'] += waited
+        if held is not None:
+            entry['hold_seconds'] += held
+            entry['max_hold_seconds'] = max(entry['max_hold_seconds'], held)
+        elif contended:
+            entry['contended'] += 1
+            entry['last_contended'] = time.time()
+        else:
+            entry['acquired'] += 1
+        return stats
+
+    update_cached(SINGLE_FLIGHT_CACHE_KEY, update, {})
+
+
+def single_flight_stats():
+    """
+    Per lock name: times acquired and contended, total seconds waited and held, and the longest hold.
+
+    A climbing 'contended' count for a name means workers keep racing to do
+    the same refresh.
+    """
+    return cache.get(SINGLE_FLIGHT_CACHE_KEY) or {}
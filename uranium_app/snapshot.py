@@ -0,0 +1,385 @@
+# uranium_project\uranium_app\snapshot.py
+
+import copy
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Mapping, MutableMapping
+from datetime import date, datetime
+
+import numpy as np
+from django.conf import settings
+from filelock import FileLock
+
+
+logger = logging.getLogger('uranium_app')
+
+
+# Snapshot file layout: MAGIC, header length as a little-endian uint32, the
+# JSON header, then every section's JSON back to back, then the payloads,
+# then the raw arrays, each starting on an ARRAY_ALIGNMENT boundary
+MAGIC = b'URSNAP1\n'
+HEADER_LENGTH = struct.Struct('<I')
+ARRAY_ALIGNMENT = 16
+# Names the current version file; replaced atomically on every publish
+CURRENT_FILE = 'CURRENT'
+# Versions kept on disk after a publish, for workers still reading older ones
+KEEP_VERSIONS = 3
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def _json_default(value):
+    # Scraped data mixes in datetimes and numpy scalars that json can't encode natively
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _version_path(version):
+    return os.path.join(settings.URANIUM_SNAPSHOT_DIR, f'uranium-{version:012d}.snap')
+
+
+def _current_path():
+    return os.path.join(settings.URANIUM_SNAPSHOT_DIR, CURRENT_FILE)
+
+
+class Snapshot(Mapping):
+    """
+    One published version of the uranium data, memory-mapped read-only.
+
+    Each top-level key of the uranium data is stored as its own JSON section,
+    tagged with the source it came from. Every worker maps the same file, so
+    the page cache holds the data once no matter how many workers there are,
+    and a key is decoded only when it is looked up. Files are never modified
+    after they are written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a uranium snapshot")
+        (header_length,) = HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        header = json.loads(self._map[header_start:header_start + header_length])
+        self._data_start = header_start + header_length
+        self.version = header['version']
+        self.created = header['created']
+        # Source name to the time its result was published
+        self.saved_at = header['saved_at']
+        # Key to (source, offset, length), offsets counted from _data_start
+        self._sections = {key: tuple(section) for key, section in header['sections'].items()}
+        # Payload name to {'status', 'etag', 'last_modified', 'bodies': {encoding: (offset, length)}};
+        # versions from before payloads had encodings stored them as lists, which are skipped
+        self._payloads = {
+            name: payload for name, payload in header.get('payloads', {}).items() if isinstance(payload, dict)
+        }
+        # Array name to {'dtype', 'shape', 'offset'}
+        self._arrays = header.get('arrays', {})
+
+    def raw(self, key):
+        """The JSON bytes of one key, without decoding them."""
+        source, offset, length = self._sections[key]
+        start = self._data_start + offset
+        return self._map[start:start + length]
+
+    def payload(self, name, encoding='identity'):
+        """
+        A response body rendered when this version was published.
+
+        Args:
+        name (str): Payload name.
+        encoding (str): 'identity' for the JSON itself, or one of payload_encodings(name).
+
+        Returns:
+        tuple: (status code, body bytes, etag, last modified timestamp), or
+        None if this version has no such payload or encoding.
+        """
+        payload = self._payloads.get(name)
+        if payload is None or encoding not in payload['bodies']:
+            return None
+        offset, length = payload['bodies'][encoding]
+        start = self._data_start + offset
+        return payload['status'], self._map[start:start + length], payload['etag'], payload['last_modified']
+
+    def payload_encodings(self, name):
+        """Content codings stored for a payload besides 'identity'."""
+        payload = self._payloads.get(name)
+        return [encoding for encoding in payload['bodies'] if encoding != 'identity'] if payload else []
+
+    def arrays(self, prefix):
+        """
+        The arrays stored under names starting with prefix, keyed by the rest of the name.
+
+        They are read-only numpy views straight onto the mapped file, so
+        every worker shares one copy.
+        """
+        arrays = {}
+        for name, spec in self._arrays.items():
+            if name.startswith(prefix):
+                dtype = np.dtype(spec['dtype'])
+                count = int(np.prod(spec['shape'], dtype=np.int64))
+                array = np.frombuffer(self._map, dtype=dtype, count=count, offset=self._data_start + spec['offset'])
+                arrays[name[len(prefix):]] = array.reshape(spec['shape'])
+        return arrays
+
+    def source_of(self, key):
+        return self._sections[key][0]
+
+    def __getitem__(self, key):
+        return json.loads(self.raw(key))
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def __contains__(self, key):
+        return key in self._sections
+
+
+class SnapshotView(MutableMapping):
+    """
+    A caller's own view of a Snapshot, with defaults for missing keys.
+
+    Keys are decoded on first access and kept for the life of the view, so
+    callers may modify what they get back, or assign new keys, without
+    touching the shared snapshot or other requests.
+    """
+
+    def __init__(self, snapshot, defaults=None):
+        self.snapshot = snapshot
+        self._defaults = defaults or {}
+        self._local = {}
+        self._deleted = set()
+
+    def __getitem__(self, key):
+        if key in self._local:
+            return self._local[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        if key in self.snapshot:
+            value = self.snapshot[key]
+        elif key in self._defaults:
+            value = copy.deepcopy(self._defaults[key])
+        else:
+            raise KeyError(key)
+        self._local[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._deleted.discard(key)
+        self._local[key] = value
+
+    def __delitem__(self, key):
+        self[key]
+        self._local.pop(key, None)
+        self._deleted.add(key)
+
+    def _keys(self):
+        keys = dict.fromkeys(self._defaults)
+        keys.update(dict.fromkeys(self.snapshot))
+        keys.update(dict.fromkeys(self._local))
+        return [key for key in keys if key not in self._deleted]
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+
+def current_version():
+    """The version number CURRENT points at, or None when nothing has been published."""
+    try:
+        with open(_current_path()) as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error reading current snapshot version: {str(e)}")
+        return None
+
+
+def current_snapshot():
+    """
+    The newest published Snapshot, mapped once per process.
+
+    Reads the one-line CURRENT file on every call, so every worker switches
+    to a new version as soon as it is published. Earlier versions are left
+    to be unmapped when nothing references them any more.
+
+    Returns:
+    Snapshot, or None when nothing has been published or it can't be read.
+    """
+    global _current
+
+    version = current_version()
+    snapshot = _current
+    if version is None or (snapshot is not None and snapshot.version == version):
+        return snapshot
+
+    with _current_lock:
+        if _current is None or _current.version != version:
+            try:
+                _current = Snapshot(_version_path(version))
+                logger.info(f"Mapped uranium data snapshot version {version}")
+            except Exception as e:
+                logger.error(f"Error loading snapshot version {version}: {str(e)}")
+        return _current
+
+
+def publish(sections, derive=None, encoders=None):
+    """
+    Publish a new snapshot version, replacing the sections of the given sources.
+
+    Sections of every other source are copied over byte for byte from the
+    current version. The new file is written in full under a temporary name,
+    renamed into place and only then named in CURRENT, so readers see either
+    the old version or the new one and never a mix. Publishers on the same
+    machine take turns through a lock file so none of their sources are lost.
+
+    Args:
+    sections (dict): Source name to a dict of the top-level keys it provides.
+    derive (callable): derive(data) gets the new version's data decoded and
+        returns (payloads, arrays) to store alongside it: {name: (status
+        code, bytes)} response bodies and {name: numpy array}. Each payload
+        is stored with a hash of its bytes as its etag, and keeps its last
+        modified time for as long as the hash doesn't change.
+    encoders (dict): Content coding to a function compressing a payload
+        body, e.g. {'gzip': gzip.compress}. Each payload is stored in every
+        coding that makes it smaller; an unchanged payload reuses the
+        previous version's compressed bodies.
+
+    Returns:
+    int: The new version number.
+    """
+    directory = settings.URANIUM_SNAPSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    with FileLock(os.path.join(directory, '.publish.lock')):
+        previous = current_snapshot()
+        now = time.time()
+        saved_at = {}
+        encoded = {}
+        if previous is not None:
+            saved_at = {name: t for name, t in previous.saved_at.items() if name not in sections}
+            encoded = {
+                key: (previous.source_of(key), previous.raw(key))
+                for key in previous if previous.source_of(key) not in sections
+            }
+        for name, values in sections.items():
+            saved_at[name] = now
+            for key, value in values.items():
+                encoded[key] = (name, json.dumps(value, default=_json_default).encode())
+
+        payloads = {}
+        arrays = {}
+        if derive is not None:
+            rendered, arrays = derive({key: json.loads(data) for key, (_, data) in encoded.items()})
+            for name, (code, data) in rendered.items():
+                etag = hashlib.blake2b(data, digest_size=16).hexdigest()
+                unchanged = previous is not None and previous._payloads.get(name, {}).get('etag') == etag
+                bodies = {'identity': data}
+                for encoding, encode in (encoders or {}).items():
+                    if unchanged and encoding in previous.payload_encodings(name):
+                        bodies[encoding] = previous.payload(name, encoding)[1]
+                        continue
+                    compressed = encode(data)
+                    if compressed is not None and len(compressed) < len(data):
+                        bodies[encoding] = compressed
+                payloads[name] = {
+                    'status': code, 'etag': etag,
+                    'last_modified': previous._payloads[name]['last_modified'] if unchanged else now,
+                    'bodies': bodies,
+                }
+
+        version = (previous.version if previous is not None else 0) + 1
+        _write(_version_path(version), version, now, saved_at, encoded, payloads, arrays)
+        _write_current(directory, version)
+        _prune(directory, version)
+
+    logger.info(f"Published snapshot version {version} ({', '.join(sections)})")
+    return version
+
+
+def _write(path, version, created, saved_at, encoded, payloads, arrays):
+    offset = 0
+    header_sections = {}
+    for key, (name, data) in encoded.items():
+        header_sections[key] = (name, offset, len(data))
+        offset += len(data)
+    header_payloads = {}
+    for name, payload in payloads.items():
+        bodies = {}
+        for encoding, data in payload['bodies'].items():
+            bodies[encoding] = (offset, len(data))
+            offset += len(data)
+        header_payloads[name] = {**payload, 'bodies': bodies}
+    header_arrays = {}
+    array_padding = []
+    for name, array in arrays.items():
+        padding = -offset % ARRAY_ALIGNMENT
+        offset += padding
+        array_padding.append(padding)
+        header_arrays[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+    header = json.dumps({
+        'version': version, 'created': created, 'saved_at': saved_at,
+        'sections': header_sections, 'payloads': header_payloads, 'arrays': header_arrays,
+    }).encode()
+    # Trailing spaces are valid JSON and make the data start aligned, so the arrays are too
+    header += b' ' * (-(len(MAGIC) + HEADER_LENGTH.size + len(header)) % ARRAY_ALIGNMENT)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.snapshot-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for _, data in encoded.values():
+                f.write(data)
+            for payload in payloads.values():
+                for data in payload['bodies'].values():
+                    f.write(data)
+            for padding, array in zip(array_padding, arrays.values()):
+                f.write(b'\0' * padding)
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _write_current(directory, version):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.current-', suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(str(version))
+    os.replace(tmp_path, _current_path())
+
+
+def _prune(directory, version):
+    for entry in os.scandir(directory):
+        if not (entry.name.startswith('uranium-') and entry.name.endswith('.snap')):
+            continue
+        try:
+            if int(entry.name[len('uranium-'):-len('.snap')]) <= version - KEEP_VERSIONS:
+                # Workers that still map it keep reading it until they move on
+                os.unlink(entry.path)
+        except (ValueError, OSError):
+            continue
@@ -0,0 +1,217 @@
+# uranium_project\uranium_app\sqlite_cache.py
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+# First byte of every stored value says how the rest is encoded
+RAW = b'r'
+COMPRESSED = b'z'
+
+
+class SQLiteCache(BaseCache):
+    """
+    A cache in one SQLite file, shared by every process on the machine.
+
+    Gunicorn workers, Celery workers and their children all read and write
+    the same entries, so one refresh serves them all. Values are pickled and,
+    past COMPRESS_MIN_BYTES, zlib-compressed. Once the stored values exceed
+    MAX_SIZE_BYTES, expired entries go first, then those closest to expiring,
+    then the oldest.
+
+    CACHES = {'default': {
+        'BACKEND': 'uranium_app.sqlite_cache.SQLiteCache',
+        'LOCATION': '/path/to/cache.sqlite3',
+        'OPTIONS': {'MAX_SIZE_BYTES': 256 * 1024 * 1024},
+    }}
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = location
+        self.max_size = int(options.get('MAX_SIZE_BYTES', 256 * 1024 * 1024))
+        self.compress_min = int(options.get('COMPRESS_MIN_BYTES', 1024))
+        # How many writes between size checks
+        self.cull_every = int(options.get('CULL_EVERY', 20))
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def _db(self):
+        # sqlite3 connections can't be shared between threads, so each thread opens its own
+        db = getattr(self._local, 'db', None)
+        if db is None or getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            if not self._schema_ready:
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS cache ('
+                    'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, size INTEGER NOT NULL, stored REAL NOT NULL)'
+                )
+                db.execute('CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)')
+                self._schema_ready = True
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _encode(self, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) >= self.compress_min:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                return COMPRESSED + compressed
+        return RAW + data
+
+    def _decode(self, blob):
+        blob = bytes(blob)
+        data = zlib.decompress(blob[1:]) if blob[:1] == COMPRESSED else blob[1:]
+        return pickle.loads(data)
+
+    def _row(self, key, value, timeout):
+        blob = self._encode(value)
+        return key, blob, self.get_backend_timeout(timeout), len(blob), time.time()
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db.execute(
+            'INSERT INTO cache (key, value, expires, size, stored) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+            'size = excluded.size, stored = excluded.stored '
+            'WHERE cache.expires IS NOT NULL AND cache.expires <= ?',
+            (*self._row(key, value, timeout), time.time()),
+        )
+        added = cursor.rowcount > 0
+        if added:
+            self._wrote()
+        return added
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db.execute(
+            'SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            return default
+        try:
+            return self._decode(row[0])
+        except Exception:
+            # Written by an incompatible version of the code; treat as a miss
+            return default
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._db.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires, size, stored) VALUES (?, ?, ?, ?, ?)',
+            self._row(key, value, timeout),
+        )
+        self._wrote()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db.execute(
+            'UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._db.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._db.execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone() is not None
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        placeholders = ', '.join('?' * len(key_map))
+        rows = self._db.execute(
+            f'SELECT key, value FROM cache WHERE key IN ({placeholders}) AND (expires IS NULL OR expires > ?)',
+            (*key_map, time.time()),
+        ).fetchall()
+        found = {}
+        for key, blob in rows:
+            try:
+                found[key_map[key]] = self._decode(blob)
+            except Exception:
+                continue
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        rows = [self._row(self.make_and_validate_key(key, version=version), value, timeout) for key, value in data.items()]
+        db = self._db
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.executemany('INSERT OR REPLACE INTO cache (key, value, expires, size, stored) VALUES (?, ?, ?, ?, ?)', rows)
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        self._wrote(len(rows))
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if keys:
+            self._db.execute(f"DELETE FROM cache WHERE key IN ({', '.join('?' * len(keys))})", keys)
+
+    def clear(self):
+        self._db.execute('DELETE FROM cache')
+
+    def close(self, **kwargs):
+        # Connections stay open across requests; they're per thread and cheap to keep
+        pass
+
+    def _wrote(self, count=1):
+        with self._writes_lock:
+            self._writes += count
+            if self._writes < self.cull_every:
+                return
+            self._writes = 0
+        self._cull()
+
+    def _cull(self):
+        """Bring the stored size back under 90% of max_size once it has gone over."""
+        db = self._db
+        now = time.time()
+        db.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        target = total - self.max_size * 0.9
+        freed = 0
+        doomed = []
+        # Entries that expire soonest go first, then ones with no expiry, oldest first
+        for key, size in db.execute(
+            'SELECT key, size FROM cache ORDER BY expires IS NULL, expires, stored'
+        ):
+            doomed.append(key)
+            freed += size
+            if freed >= target:
+                break
+        db.executemany('DELETE FROM cache WHERE key = ?', ((key,) for key in doomed))
+
+    def stats(self):
+        """Entry count and stored bytes, for monitoring."""
+        count, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {'entries': count, 'bytes': size, 'max_bytes': self.max_size}
@@ -0,0 +1,235 @@
+# uranium_project\uranium_app\stock_store.py
+
+import numpy as np
+
+
+# Per-stock numbers, held as float64 columns with NaN wherever the source had 'N/A' or nothing
+NUMERIC_FIELDS = ('current_price', 'last_price', 'change_1m', 'change_1y', 'volume', 'market_cap', 'pe_ratio')
+# Per-stock text, held as fixed-width unicode columns with '' for missing
+TEXT_FIELDS = ('name', 'country_name')
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def to_float_array(values):
+    """Parse values into float64, with NaN for 'N/A', None and anything else float() would reject."""
+    values = list(values)
+    try:
+        # Lists of plain numbers, by far the common case, convert in one step
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        return np.array([value if type(value) is float else to_float(value) for value in values], dtype=np.float64)
+
+
+def descending(values):
+    """
+    Indices of the non-NaN entries of values, largest first.
+
+    Equal values keep their original order, as sorted(..., reverse=True) would.
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    return valid[np.argsort(-values[valid], kind='stable')]
+
+
+def _none_if_nan(value):
+    return None if np.isnan(value) else float(value)
+
+
+class StockStore:
+    """
+    The uranium stocks as columns instead of a dict of dicts.
+
+    Row i of every column belongs to symbols[i]. Numeric fields are float64
+    arrays with NaN for missing values, so filters and aggregates run as
+    whole-array operations without float() or isinstance checks. Daily
+    closes form one float64 matrix, a row per stock and a column per date
+    in the shared dates index, NaN where a stock has no close that day.
+
+    Each numeric field also has a sorted index, its rows ordered by value,
+    for range queries.
+
+    Built from the stocks dict with from_stocks when a snapshot is
+    published, stored in the snapshot as raw arrays (to_arrays) and read
+    back without copying (from_arrays).
+    """
+
+    def __init__(self, symbols, columns, dates, closes, orders=None):
+        self.symbols = symbols
+        self.columns = columns
+        self.dates = dates
+        self.closes = closes
+        self._orders = dict(orders or {})
+        self._sorted = {}
+        self._rows = {symbol: i for i, symbol in enumerate(symbols.tolist())}
+        self._date_strings = None
+        self._exchanges = None
+        self._categories = {}
+
+    @classmethod
+    def from_stocks(cls, stocks, history=True, fields=None):
+        """
+        Build the store from a {symbol: stock record} dict.
+
+        Records that aren't dicts are skipped; empty ones, left by failed
+        fetches, become rows of NaN. Callers that only need some per-stock
+        fields can pass history=False to leave out the closes and fields to
+        build just those columns.
+        """
+        stocks = {symbol: stock for symbol, stock in (stocks or {}).items() if isinstance(stock, dict)}
+        symbols = np.array(list(stocks), dtype=str)
+        records = list(stocks.values())
+        fields = set(NUMERIC_FIELDS + TEXT_FIELDS if fields is None else fields)
+
+        columns = {}
+        for field in NUMERIC_FIELDS:
+            if field in fields:
+                columns[field] = to_float_array([stock.get(field) for stock in records])
+        for field in TEXT_FIELDS:
+            if field in fields:
+                columns[field] = np.array([stock.get(field) or '' for stock in records], dtype=str)
+
+        histories = []
+        for stock in (records if history else ()):
+            dates = np.array(stock.get('dates') or [], dtype='datetime64[D]')
+            closes = to_float_array(stock.get('data') or [])
+            length = min(len(dates), len(closes))
+            histories.append((dates[:length], closes[:length]))
+        all_dates = np.unique(np.concatenate([dates for dates, _ in histories] or [np.array([], dtype='datetime64[D]')]))
+
+        matrix = np.full((len(stocks), len(all_dates)), np.nan, dtype=np.float64)
+        for i, (dates, closes) in enumerate(histories):
+            matrix[i, np.searchsorted(all_dates, dates)] = closes
+        return cls(symbols, columns, all_dates, matrix)
+
+    def to_arrays(self):
+        """Every array of the store by name, sorted indexes included, for snapshot.publish."""
+        arrays = {'symbols': self.symbols, 'dates': self.dates, 'closes': self.closes}
+        arrays.update({f'column.{field}': values for field, values in self.columns.items()})
+        arrays.update({f'order.{field}': self.sorted_index(field) for field in NUMERIC_FIELDS if field in self.columns})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        columns = {name[len('column.'):]: values for name, values in arrays.items() if name.startswith('column.')}
+        orders = {name[len('order.'):]: values for name, values in arrays.items() if name.startswith('order.')}
+        return cls(arrays['symbols'], columns, arrays['dates'], arrays['closes'], orders)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def row(self, symbol):
+        return self._rows[symbol]
+
+    def column(self, field):
+        return self.columns[field]
+
+    def sorted_index(self, field):
+        """
+        Rows of the stocks with a value for a numeric field, smallest value first.
+
+        Computed once per store and stored with it in the snapshot, so range
+        queries binary search it instead of comparing every row.
+        """
+        order = self._orders.get(field)
+        if order is None:
+            values = self.columns[field]
+            valid = np.flatnonzero(~np.isnan(values))
+            order = self._orders[field] = valid[np.argsort(values[valid], kind='stable')].astype(np.int32)
+        return order
+
+    def sorted_values(self, field):
+        """The values of field in sorted_index order."""
+        values = self._sorted.get(field)
+        if values is None:
+            values = self._sorted[field] = self.columns[field][self.sorted_index(field)]
+        return values
+
+    def range_rows(self, field, low=None, high=None, include_low=True, include_high=True):
+        """
+        Rows whose field lies between low and high, None leaving that side open.
+
+        Returns:
+        numpy.ndarray: Row indices, in sorted_index order.
+        """
+        values = self.sorted_values(field)
+        start = 0 if low is None else np.searchsorted(values, low, side='left' if include_low else 'right')
+        end = len(values) if high is None else np.searchsorted(values, high, side='right' if include_high else 'left')
+        return self.sorted_index(field)[start:max(start, end)]
+
+    def rows_matching(self, field, values):
+        """
+        Boolean mask of the stocks whose text field is one of values, ignoring case.
+
+        field can also be 'exchange'. The column is reduced to its distinct
+        values once per store, so each lookup compares those and not every row.
+        """
+        categories = self._categories.get(field)
+        if categories is None:
+            column = self.exchanges if field == 'exchange' else self.columns[field]
+            distinct, codes = np.unique(column, return_inverse=True)
+            categories = self._categories[field] = (np.char.lower(distinct), codes)
+        distinct, codes = categories
+        wanted = np.flatnonzero(np.isin(distinct, [value.lower() for value in values]))
+        return np.isin(codes, wanted)
+
+    @property
+    def exchanges(self):
+        """Each symbol's exchange suffix, 'TO' for 'CCO.TO', or '' for US listings without one."""
+        if self._exchanges is None:
+            self._exchanges = np.array([symbol.rpartition('.')[2] if '.' in symbol else '' for symbol in self.symbols.tolist()], dtype=str)
+        return self._exchanges
+
+    def last_closes(self, count=2):
+        """
+        The last count closes of every stock, skipping days it has no close.
+
+        Returns:
+        numpy.ndarray: float64 of shape (stocks, count), oldest first, NaN
+        where a stock has fewer closes.
+        """
+        if not self.closes.shape[1]:
+            return np.full((len(self), count), np.nan)
+        present = ~np.isnan(self.closes)
+        positions = np.where(present, np.arange(self.closes.shape[1]), -1)
+        # Taking the largest count positions per row picks the latest days that have a close
+        latest = np.sort(positions, axis=1)[:, -count:]
+        if latest.shape[1] < count:
+            latest = np.hstack([np.full((len(self), count - latest.shape[1]), -1), latest])
+        values = np.take_along_axis(self.closes, np.maximum(latest, 0), axis=1)
+        values[latest < 0] = np.nan
+        return values
+
+    def change_1d(self):
+        """Percent change between each stock's last two closes, NaN without two closes."""
+        previous, current = self.last_closes(2).T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (current - previous) / previous * 100
+
+    def history(self, i):
+        """(dates, closes) lists of one stock, the way its record held them."""
+        if self._date_strings is None:
+            self._date_strings = np.datetime_as_string(self.dates, unit='D')
+        present = ~np.isnan(self.closes[i])
+        return (
+            self._date_strings[present].tolist(),
+            self.closes[i][present].tolist(),
+        )
+
+    def record(self, i, history=False):
+        """
+        One stock as a dict like the records the stocks source produces.
+
+        Missing numbers come back as None, and the 'data' and 'dates' lists
+        only when history is true.
+        """
+        record = {'name': self.columns['name'][i] or None}
+        record.update({field: _none_if_nan(self.columns[field][i]) for field in NUMERIC_FIELDS})
+        if history:
+            record['dates'], record['data'] = self.history(i)
+        record['country_name'] = self.columns['country_name'][i] or None
+        return record
@@ -1,30 +1,64 @@
+import asyncio
 import logging
 from datetime import datetime
 import hashlib
-from functools import lru_cache
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from functools import lru_cache, partial
 from bs4 import BeautifulSoup
+import pandas as pd
 import yfinance as yf
+from celery import shared_task
 from django.core.cache import cache
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 import json
+import threading
 import time
-import chromedriver_autoinstaller
 import requests
+from django.conf import settings
+
+from .browser import browser_backend, element_has_text, element_present, get_driver_pool, load_page, script_true, wait_until_ready
+from .circuit_breaker import CircuitBreaker
+from .fetch_tiers import fetch_cheap_tiers_sync, has_cheap_tiers, is_complete, record_tier
+from .http_fetch import fetch_page, fetch_pages, parse_in_pool, requests_session, run_coroutine
+from .isolation import run_isolated
+from .orchestrator import run_sources
+from .parsers import (
+    NUCLEAR_DATA_TABLES,
+    parse_calendar,
+    parse_embedded_news,
+    parse_iaea_news,
+    parse_inform_kz_news,
+    parse_mining_com_news,
+    parse_mining_technology_article,
+    parse_mining_technology_results,
+    parse_northern_miner_news,
+    parse_nuclear_data,
+    parse_nucnet_news,
+    parse_uranium_price,
+    parse_world_nuclear_news,
+)
+from .payloads import (
+    Payload,
+    choose_encoding,
+    filtered_body,
+    included_payload,
+    payload_encoders,
+    payload_max_age,
+    render_payload,
+    render_payloads,
+)
+from .playwright_backend import goto_page, run_pages, wait_for_page
+from .single_flight import single_flight
+from .snapshot import SnapshotView, current_snapshot, publish
+from .stock_store import StockStore
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('uranium_app')
 
 
-server_config = True
-
-
 URANIUM_STOCKS = [
     'URA', 'CCJ', 'DNN', 'UUUU', 'UEC', 'NXE', 'UROY',
     
@@ -45,15 +79,101 @@ URANIUM_STOCKS = [
 def get_uranium_stocks():
     return URANIUM_STOCKS
 
-# Global variable to store the fetched data
-global_uranium_data = None
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+# (snapshot version, StockStore) of the last current_stock_store call
+_stock_store = (None, None)
 
 def fetch_data_daily():
-    global global_uranium_data
-    logger.info("Starting daily data fetch...")
-    global_uranium_data = fetch_uranium_data()
+    # Every web worker that finds the snapshot stale starts one of these; only one should run
+    with single_flight('refresh_all') as acquired:
+        if not acquired:
+            return
+        logger.info("Starting daily data fetch...")
+        try:
+            results = fetch_uranium_sources()
+        except Exception as e:
+            logger.error(f"Daily data fetch failed: {str(e)}", exc_info=True)
+            return
+    publish_sources(results)
     logger.info("Daily data fetch completed.")
 
+
+def publish_sources(results):
+    """
+    Publish fetched sources together as one new snapshot version.
+
+    Results that fail their source's 'complete' check, empty and failed
+    ones included, are dropped so the last good data stays in place.
+
+    Returns:
+    list: Names of the sources that were published.
+    """
+    sections = {}
+    for name, result in results.items():
+        if not is_complete(URANIUM_SOURCES.get(name, {}), result):
+            logger.warning(f"No complete data fetched for {name}, keeping the previous snapshot")
+            continue
+        sections[name] = source_sections(name, result)
+    if sections:
+        publish(
+            sections,
+            derive=derive_snapshot,
+            encoders=payload_encoders(),
+        )
+    return list(sections)
+
+
+def derive_snapshot(data):
+    """The payloads and stock arrays stored alongside each published version."""
+    data = {**default_uranium_data(), **data}
+    store = StockStore.from_stocks(data.get('stocks'))
+    arrays = {f'stocks/{name}': values for name, values in store.to_arrays().items()}
+    return render_payloads(data, store), arrays
+
+
+def publish_source(name, result):
+    """Publish a single source; returns whether it had data to publish."""
+    return bool(publish_sources({name: result}))
+
+
+def start_background_refresh():
+    """
+    Run fetch_data_daily in a daemon thread unless one is already running.
+
+    Returns:
+    bool: True if a new refresh was started.
+    """
+    global _refresh_thread
+
+    if not settings.URANIUM_BACKGROUND_REFRESH:
+        return False
+
+    with _refresh_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return False
+        _refresh_thread = threading.Thread(target=fetch_data_daily, name='uranium-refresh', daemon=True)
+        _refresh_thread.start()
+        return True
+
+
+def warm_start():
+    """
+    Map the last published snapshot and refresh it in the background if it is stale.
+
+    Called when a web worker boots. Mapping the snapshot reads only its
+    header, so it never blocks the worker on a crawl; a refresh is started
+    when a source is missing from the snapshot or older than
+    URANIUM_SNAPSHOT_MAX_AGE.
+    """
+    snapshot = current_snapshot()
+    saved_at = snapshot.saved_at if snapshot is not None else {}
+    if snapshot is not None:
+        logger.info(f"Serving uranium data snapshot version {snapshot.version} ({len(saved_at)}/{len(URANIUM_SOURCES)} sources)")
+
+    if len(saved_at) < len(URANIUM_SOURCES) or time.time() - min(saved_at.values()) > settings.URANIUM_SNAPSHOT_MAX_AGE:
+        start_background_refresh()
+
 # Schedule the daily data fetch
 # schedule.every().day.at("00:00").do(fetch_data_daily)
 
@@ -67,54 +187,206 @@ def fetch_data_daily():
 # scheduler_thread = threading.Thread(target=run_scheduler)
 # scheduler_thread.start()
 
-def fetch_uranium_stocks():
-    cache_key = 'uranium_stocks_data'
-    cached_data = cache.get(cache_key)
+def fetch_uranium_stocks(batched=None):
+    if batched is None:
+        batched = settings.URANIUM_STOCKS_BATCHED
 
-    if cached_data:
-        return cached_data
+    if not batched:
+        cached_data = cache.get(STOCK_DATA_CACHE_KEY)
 
-    with requests.Session() as session:
-        stock_data_results = [fetch_single_stock(symbol, session) for symbol in get_uranium_stocks()]
-    
-    stock_data = dict(stock_data_results)
-    cache.set(cache_key, stock_data, timeout=3600)
-    return stock_data
+        if cached_data:
+            return cached_data
+
+        with requests_session() as session:
+            stock_data = dict(fetch_single_stock(symbol, session) for symbol in get_uranium_stocks())
+
+        # A download that failed for every symbol isn't cached, so the next refresh retries it
+        if any(stock_data.values()):
+            cache.set(STOCK_DATA_CACHE_KEY, stock_data, timeout=3600)
+        return stock_data
+
+    # Quotes change by the minute, metadata by the quarter: each tier is
+    # cached with its own TTL and the two are merged on every read.
+    symbols = get_uranium_stocks()
+    with requests_session() as session:
+        quotes = cache.get(STOCK_QUOTES_CACHE_KEY)
+        if quotes is None:
+            quotes = fetch_stock_histories(symbols, session)
+            if any(not history.empty for history in quotes.values()):
+                cache.set(STOCK_QUOTES_CACHE_KEY, quotes, timeout=settings.URANIUM_STOCK_QUOTE_TTL)
+        return fetch_stocks_batched(symbols, session, quotes)
 
 
 def fetch_single_stock(symbol, session):
     try:
-        stock = yf.Ticker(symbol)
+        stock = yf.Ticker(symbol, session=session)
         info = stock.info
         history = stock.history(period="1y")
-        country_name = info.get("country", None)
-
-        if history.empty:
-            logger.warning(f"No data found for {symbol}, skipping...")
-            return symbol, {}
-        
-        current_price = history['Close'].iloc[-1]
-        last_price = history['Close'].iloc[-2]
-        change_1m = ((current_price - history['Close'].iloc[-22]) / history['Close'].iloc[-22]) * 100
-        change_1y = ((current_price - history['Close'].iloc[0]) / history['Close'].iloc[0]) * 100
-        
-        return symbol, {
-            'name': info.get('longName', 'N/A'),
-            'current_price': current_price,
-            'last_price': last_price,
-            'change_1m': change_1m,
-            'change_1y': change_1y,
-            'volume': info.get('volume', 'N/A'),
-            'market_cap': info.get('marketCap', 'N/A'),
-            'pe_ratio': info.get('trailingPE', 'N/A'),
-            'data': history['Close'].tolist(),
-            'dates': history.index.strftime('%Y-%m-%d').tolist(),
-            'country_name': country_name
-        }
+        return symbol, build_stock_record(symbol, history['Close'], info)
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {str(e)}")
         return symbol, {}
-    
+
+
+def build_stock_record(symbol, closes, info):
+    """Compute the stock fields served by the API from a year of daily closes and yfinance info."""
+    if closes is None or closes.empty:
+        logger.warning(f"No data found for {symbol}, skipping...")
+        return {}
+
+    try:
+        current_price = closes.iloc[-1]
+        last_price = closes.iloc[-2]
+        change_1m = ((current_price - closes.iloc[-22]) / closes.iloc[-22]) * 100
+        change_1y = ((current_price - closes.iloc[0]) / closes.iloc[0]) * 100
+    except IndexError:
+        logger.warning(f"Not enough history for {symbol}, skipping...")
+        return {}
+
+    return {
+        'name': info.get('longName', 'N/A'),
+        'current_price': current_price,
+        'last_price': last_price,
+        'change_1m': change_1m,
+        'change_1y': change_1y,
+        'volume': info.get('volume', 'N/A'),
+        'market_cap': info.get('marketCap', 'N/A'),
+        'pe_ratio': info.get('trailingPE', 'N/A'),
+        'data': closes.tolist(),
+        'dates': closes.index.strftime('%Y-%m-%d').tolist(),
+        'country_name': info.get("country", None)
+    }
+
+
+STOCK_QUOTES_CACHE_KEY = 'uranium_stock_quotes'
+# Whole stock records, cached by the one-request-per-symbol path
+STOCK_DATA_CACHE_KEY = 'uranium_stocks_data'
+
+# yfinance info fields kept in the metadata tier
+STOCK_METADATA_FIELDS = ['longName', 'country', 'marketCap', 'trailingPE']
+
+
+def get_stock_metadata(symbols, session=None):
+    """
+    Return slow-changing yfinance info (name, country, market cap, P/E) per symbol.
+
+    Each symbol is cached for URANIUM_STOCK_METADATA_TTL, so the slow and
+    rate-limited .info call only runs for symbols whose entry has expired.
+    The price at lookup time is kept as 'reference_price' so market cap and
+    P/E can be moved along with later quotes.
+    """
+    keys = {symbol: f'stock_meta_{symbol}' for symbol in symbols}
+    cached = cache.get_many(keys.values())
+    metadata = {symbol: cached[key] for symbol, key in keys.items() if key in cached}
+
+    missing = [symbol for symbol in symbols if symbol not in metadata]
+    if not missing:
+        return metadata
+
+    logger.info(f"Fetching stock metadata for {len(missing)} symbols")
+    with ThreadPoolExecutor(max_workers=settings.URANIUM_STOCKS_INFO_WORKERS) as pool:
+        infos = pool.map(lambda symbol: fetch_stock_info(symbol, session), missing)
+
+    fetched = {}
+    for symbol, info in zip(missing, infos):
+        if not info:
+            continue
+        entry = {field: info[field] for field in STOCK_METADATA_FIELDS if field in info}
+        entry['reference_price'] = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
+        metadata[symbol] = fetched[keys[symbol]] = entry
+
+    cache.set_many(fetched, timeout=settings.URANIUM_STOCK_METADATA_TTL)
+    return metadata
+
+
+def merge_stock_tiers(symbol, quote, metadata):
+    """Build a stock record from the quote tier (closes and volume) and the metadata tier."""
+    if quote is None:
+        return build_stock_record(symbol, None, metadata)
+
+    info = dict(metadata)
+    volume = quote['Volume'].iloc[-1] if 'Volume' in quote and not quote.empty else None
+    info['volume'] = int(volume) if volume is not None and not pd.isna(volume) else 'N/A'
+
+    # Market cap and trailing P/E both scale with price; move them with the latest close
+    reference_price = metadata.get('reference_price')
+    if reference_price and not quote.empty:
+        ratio = quote['Close'].iloc[-1] / reference_price
+        for field in ('marketCap', 'trailingPE'):
+            if isinstance(info.get(field), (int, float)):
+                info[field] = info[field] * ratio
+
+    return build_stock_record(symbol, quote['Close'], info)
+
+
+def fetch_stock_histories(symbols, session=None):
+    """
+    Download a year of daily prices for many symbols in a few bulk requests.
+
+    Symbols are requested URANIUM_STOCKS_BATCH_SIZE at a time. The combined
+    frame is aligned on the union of every exchange's trading days, so each
+    symbol's rows are stripped of the days it didn't trade.
+
+    Returns:
+    dict: symbol to a DataFrame of 'Close' and 'Volume' indexed by date.
+    """
+    batch_size = settings.URANIUM_STOCKS_BATCH_SIZE
+    histories = {}
+
+    for i in range(0, len(symbols), batch_size):
+        batch = list(symbols[i:i + batch_size])
+        try:
+            frame = yf.download(
+                batch, period="1y", group_by='ticker', auto_adjust=True,
+                threads=True, progress=False, session=session
+            )
+        except Exception as e:
+            logger.error(f"Error downloading history for {batch}: {str(e)}")
+            continue
+
+        for symbol in batch:
+            try:
+                if isinstance(frame.columns, pd.MultiIndex):
+                    history = frame[symbol][['Close', 'Volume']]
+                else:
+                    history = frame[['Close', 'Volume']]
+            except KeyError:
+                logger.warning(f"No history returned for {symbol}")
+                continue
+            histories[symbol] = history.dropna(subset=['Close'])
+
+    return histories
+
+
+def fetch_stock_info(symbol, session=None):
+    try:
+        return yf.Ticker(symbol, session=session).info
+    except Exception as e:
+        logger.error(f"Error fetching info for {symbol}: {str(e)}")
+        return {}
+
+
+def fetch_stocks_batched(symbols, session=None, quotes=None):
+    """
+    Fetch every symbol's stock record using bulk history downloads.
+
+    Prices and volume come from a few yf.download calls (or the given
+    quotes) instead of one request per symbol, and are merged with the
+    cached metadata tier, so .info is only fetched for expired symbols.
+    """
+    if quotes is None:
+        quotes = fetch_stock_histories(symbols, session)
+    metadata = get_stock_metadata(symbols, session)
+
+    return {
+        symbol: merge_stock_tiers(symbol, quotes.get(symbol), metadata.get(symbol, {}))
+        for symbol in symbols
+    }
+
+
+URANIUM_PRICE_URL = 'https://numerco.com/NSet/aCNSet.html'
+SPOT_PRICE_READY = "() => { const e = document.getElementById('spottU3o8'); return e && e.textContent.trim() !== ''; }"
+
 
 def fetch_uranium_price(driver):
     cache_key = 'uranium_price_data'
@@ -123,76 +395,46 @@ def fetch_uranium_price(driver):
     if cached_data:
         return cached_data
 
-    url = 'https://numerco.com/NSet/aCNSet.html'
-    
-    # chromedriver_autoinstaller.install()
+    try:
+        load_page(driver, 'uranium_price', URANIUM_PRICE_URL)
 
-    # options = Options()
-    # options.add_argument('--headless')
-    # options.add_argument('--no-sandbox')
-    # options.add_argument('--disable-dev-shm-usage')
+        # Wait for the spot price to be present and not empty, then for the table
+        wait_until_ready(driver, 'uranium_price', element_has_text(By.ID, "spottU3o8"))
+        wait_until_ready(driver, 'uranium_price_table', element_present(By.ID, "CVDtradesTable"))
+
+        result = parse_uranium_price(driver.page_source)
+        logger.info(f"Spot price: {result['spot_price']}, data rows: {len(result['data'])}")
+        cache.set(cache_key, result, timeout=3600)
+        return result
+    except Exception as e:
+        logger.error(f"An error occurred: {str(e)}", exc_info=True)
+        return {'error': f"An error occurred: {str(e)}"}
 
-    # if server_config:
-    #     options.binary_location = "/usr/bin/chromium"
 
-    #     service = Service(executable_path="/usr/bin/chromedriver")
+async def fetch_uranium_price_playwright(page):
+    cache_key = 'uranium_price_data'
+    cached_data = cache.get(cache_key)
 
-    #     driver = webdriver.Chrome(service=service, options=options)
-    
-    # else:
-    #     driver = webdriver.Chrome(options=options)
+    if cached_data:
+        return cached_data
 
     try:
-        driver.get(url)
-        
-        # Wait for the spot price to be present and not empty
-        try:
-            spot_price_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "spottU3o8"))
-            )
-            WebDriverWait(driver, 30).until(
-                lambda d: spot_price_element.text != ""
-            )
-            spot_price = spot_price_element.text
-        except TimeoutException:
-            logger.error("Timeout waiting for spot price to load")
-            spot_price = "N/A"
+        await goto_page(page, 'uranium_price', URANIUM_PRICE_URL)
+        await wait_for_page(page, 'uranium_price', function=SPOT_PRICE_READY)
+        await wait_for_page(page, 'uranium_price_table', selector='#CVDtradesTable')
 
-        logger.info(f"Spot price: {spot_price}")
-
-        # Wait for the table to be present
-        try:
-            table_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "CVDtradesTable"))
-            )
-            table_html = table_element.get_attribute('outerHTML')
-            soup = BeautifulSoup(table_html, 'html.parser')
-            headers = [th.text.strip() for th in soup.find_all('th')]
-            tbody = soup.find('tbody')
-            if tbody:
-                data = [[cell.text.strip() for cell in row.find_all('td')] for row in tbody.find_all('tr')]
-            else:
-                data = []
-        except TimeoutException:
-            logger.error("Timeout waiting for table to load")
-            headers = []
-            data = []
-
-        logger.info(f"Headers: {headers}")
-        logger.info(f"Data rows: {len(data)}")
-
-        result = {
-            'spot_price': spot_price,
-            'headers': headers,
-            'data': data
-        }
+        result = await parse_in_pool(parse_uranium_price, await page.content())
+        logger.info(f"Spot price: {result['spot_price']}, data rows: {len(result['data'])}")
         cache.set(cache_key, result, timeout=3600)
         return result
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}", exc_info=True)
         return {'error': f"An error occurred: {str(e)}"}
-    # finally:
-        # driver.quit()
+
+
+def calendar_url():
+    return f'https://www.uxc.com/p/fuelcycle/Calendar.aspx?year={datetime.now().year}'
+
 
 def fetch_calendar_data(driver):
     cache_key = 'calendar_data'
@@ -200,239 +442,107 @@ def fetch_calendar_data(driver):
     
     if cached_data:
         return cached_data
-    
-    current_year = datetime.now().year
-    url = f'https://www.uxc.com/p/fuelcycle/Calendar.aspx?year={current_year}'
-    
-    # chromedriver_autoinstaller.install()
-
-    # options = webdriver.ChromeOptions()
-    # options.add_argument('--headless')
-    # options.add_argument('--no-sandbox')
-    # options.add_argument('--disable-dev-shm-usage')
-    
-    
-    # if server_config:
-    #     options.binary_location = "/usr/bin/chromium"  
-
-    #     service = Service(executable_path="/usr/bin/chromedriver")
 
-    #     driver = webdriver.Chrome(service=service, options=options)
-    
-    # else:
-    #     driver = webdriver.Chrome(options=options)
-    
-    driver.get(url)
-    
-
-    WebDriverWait(driver, 5).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "td.rcMain.rcCalendars"))
-    )
-    
     try:
-        # Extract the calendar HTML
-        calendar_html = driver.find_element(By.CSS_SELECTOR, 'td.rcMain.rcCalendars').get_attribute('innerHTML')
+        load_page(driver, 'calendar', calendar_url())
+        if not wait_until_ready(driver, 'calendar', element_present(By.CSS_SELECTOR, "td.rcMain.rcCalendars")):
+            return None
 
-        event_rows = driver.find_elements(By.CSS_SELECTOR, 'table.table-striped tbody tr:not(:first-child)')
-        event_data = []
+        # Both the event data and the calendar HTML
+        return parse_calendar(driver.page_source)
+    except Exception as e:
+        logger.error(f"Error in fetching/opening calendar data: {str(e)}")
+        return None
 
-        for row in event_rows:
-            try:
-                date_element = row.find_element(By.CSS_SELECTOR, 'td.text-center')
-                date = date_element.text.strip() if date_element else 'N/A'
-                
-                title_element = row.find_element(By.CSS_SELECTOR, 'div.lead a')
-                title = title_element.text.strip() if title_element else 'N/A'
-                link = title_element.get_attribute('href').strip() if title_element else 'N/A'
-                
-                details = row.find_elements(By.CSS_SELECTOR, 'dl.dl-horizontal dt')
-                details_texts = row.find_elements(By.CSS_SELECTOR, 'dl.dl-horizontal dd')
-                details_dict = {}
-
-                for dt, dd in zip(details, details_texts):
-                    key = dt.text.strip().lower()
-                    text = dd.text.strip()
-                    href = dd.find_element(By.TAG_NAME, 'a') if dd.find_elements(By.TAG_NAME, 'a') else None
-                    href_link = href.get_attribute('href').strip() if href else 'N/A'
-                    details_dict[key] = {
-                        'text': text,
-                        'link': href_link
-                    }
 
-                location = details_dict.get('location', {'text': 'N/A', 'link': 'N/A'})
-                sponsor = details_dict.get('sponsor', {'text': 'N/A', 'link': 'N/A'})
-                contact = details_dict.get('contact', {'text': 'N/A', 'link': 'N/A'})
-                description = details_dict.get('description', {'text': 'N/A', 'link': 'N/A'})
-
-                event_item = {
-                    'date': date,
-                    'title': title,
-                    'link': link,
-                    'location': location['text'],
-                    'location_link': location['link'],
-                    'sponsor': sponsor['text'],
-                    'sponsor_link': sponsor['link'],
-                    'contact': contact['text'],
-                    'contact_link': contact['link'],
-                    'description': description['text'],
-                }
-                event_data.append(event_item)
+async def fetch_calendar_data_playwright(page):
+    cached_data = cache.get('calendar_data')
 
-            except Exception as e:
-                logger.error(f"Error processing event row: {str(e)}")
-        
-        # Return both event data and the calendar HTML
-        return {
-            'calendar_html': calendar_html,
-            'event_data': event_data
-        }
+    if cached_data:
+        return cached_data
 
+    try:
+        await goto_page(page, 'calendar', calendar_url())
+        if not await wait_for_page(page, 'calendar', selector='td.rcMain.rcCalendars'):
+            return None
+        return await parse_in_pool(parse_calendar, await page.content())
     except Exception as e:
         logger.error(f"Error in fetching/opening calendar data: {str(e)}")
-        driver.quit()
         return None
-    
 
-def fetch_iaea_news(driver):
-    logger.info("Starting fetch_iaea_news function")
-    
-    # options = Options()
-    # options.add_argument('--headless')
-    # options.add_argument('--no-sandbox')
-    # options.add_argument('--disable-dev-shm-usage')
 
-    try:
-        logger.info("Setting up Selenium WebDriver")
+IAEA_NEWS_URL = 'https://www.iaea.org/news?year%5Bvalue%5D%5Byear%5D=&type=All&topics=All&keywords=nuclear'
 
-        # if server_config:
-        #     options.binary_location = "/usr/bin/chromium"  
 
-        #     service = Service(executable_path="/usr/bin/chromedriver")
+def fetch_iaea_news(driver):
+    logger.info("Starting fetch_iaea_news function")
 
-        #     driver = webdriver.Chrome(service=service, options=options)
-        
-        # else:
-        #     driver = webdriver.Chrome(options=options)
-        
-        
-        url = 'https://www.iaea.org/news?year%5Bvalue%5D%5Byear%5D=&type=All&topics=All&keywords=nuclear'
-        logger.info(f"Navigating to URL: {url}")
-        driver.get(url)
+    try:
+        logger.info(f"Navigating to URL: {IAEA_NEWS_URL}")
+        load_page(driver, 'iaea_news', IAEA_NEWS_URL)
         
         logger.info("Waiting for news container to load")
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "views-bootstrap-grid-1"))
-        )
-        
-        logger.info("Parsing page content with BeautifulSoup")
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        news_container = soup.find('div', id='views-bootstrap-grid-1')
-        if not news_container:
-            logger.error("Could not find IAEA news container")
+        if not wait_until_ready(driver, 'iaea_news', element_present(By.ID, "views-bootstrap-grid-1")):
             return []
 
-        news_items = news_container.find_all('div', class_='grid')
-        logger.info(f"Found {len(news_items)} news items")
-        
-        news_data = []
-        for item in news_items:
-            try:
-                link_element = item.find('h4').find('a')
-                if link_element:
-                    link = f"https://www.iaea.org{link_element['href']}"
-                    title = link_element.text.strip()
-                else:
-                    logger.warning("Skipping item without link")
-                    continue
-
-                image_element = item.find('img')
-                image_url = f"https://www.iaea.org{image_element['src']}" if image_element else None
-
-                date_element = item.find('span', class_='dateline-published')
-                published_date = date_element.text.strip() if date_element else 'N/A'
-                try:
-                    published_date = datetime.strptime(published_date, "%d %B %Y").strftime('%Y-%m-%d')
-                except ValueError:
-                    logger.warning(f"Failed to parse date IAEA: {published_date}")
-                    published_date = 'N/A'
-
-                content_type_element = item.find('div', class_='content-type-label-wrapper')
-                content_type = content_type_element.text.strip() if content_type_element else 'N/A'
-
-                news_item = {
-                    'id': hashlib.md5(link.encode()).hexdigest(),
-                    'title': title,
-                    'link': link,
-                    'publisher': 'IAEA',
-                    'published_date': published_date,
-                    'image_url': image_url,
-                    'content': content_type,
-                }
-                news_data.append(news_item)
-                logger.info(f"Processed news item: {title}")
-            except Exception as e:
-                logger.error(f"Error processing news item: {str(e)}", exc_info=True)
+        news_data = parse_iaea_news(driver.page_source)
+        logger.info(f"Finished processing {len(news_data)} news items")
+        return news_data
+    except Exception as e:
+        logger.error(f"Error in fetch_iaea_news: {str(e)}", exc_info=True)
+        return []
+
+
+async def fetch_iaea_news_playwright(page):
+    try:
+        await goto_page(page, 'iaea_news', IAEA_NEWS_URL)
+        if not await wait_for_page(page, 'iaea_news', selector='#views-bootstrap-grid-1'):
+            return []
 
+        news_data = await parse_in_pool(parse_iaea_news, await page.content())
         logger.info(f"Finished processing {len(news_data)} news items")
         return news_data
     except Exception as e:
         logger.error(f"Error in fetch_iaea_news: {str(e)}", exc_info=True)
         return []
-    # finally:
-    #     if 'driver' in locals():
-    #         logger.info("Closing Selenium WebDriver")
-    #         driver.quit()
+
+
+NUCLEAR_DATA_URL = 'https://world-nuclear.org/nuclear-reactor-database/summary'
+NUCLEAR_DATA_CHARTS = {
+    'top_10_countries': '#TotalOperableReactorBarChart',
+    'reactors_under_construction': '#ReactorsUnderConstructionBarChart',
+    'global_nuclear_generation': '#GlobalNuclearGenerationByYearChart',
+    'planned_reactors': '#PlannedReactorsBarChart',
+    'proposed_reactors': '#ProposedReactorsBarChart',
+    'nuclear_electricity_production': '#NuclearElectricityProductionBarChart',
+}
+NUCLEAR_DATA_TABLES_SELECTOR = ', '.join(NUCLEAR_DATA_TABLES.values())
+# All three counters are read, so wait until the last one has a value
+NUCLEAR_COUNTERS_READY = (
+    "() => Array.from(document.getElementsByClassName('do_counter1'))"
+    ".filter(e => e.textContent.trim() !== '').length >= 3"
+)
+NUCLEAR_TABLES_READY = f"() => document.querySelectorAll('{NUCLEAR_DATA_TABLES_SELECTOR}').length >= {len(NUCLEAR_DATA_TABLES)}"
 
 
 def scrape_nuclear_data(driver):
     logger.info('Starting nuclear data scraping...')
     cache_key = 'nuclear_data'
-    
-    # options = webdriver.ChromeOptions()
-    # options.add_argument('--headless')
-    # options.add_argument('--no-sandbox')
-    # options.add_argument('--disable-dev-shm-usage')
-    
-    # if server_config:
-    #     options.binary_location = "/usr/bin/chromium"  
-    #     service = Service(executable_path="/usr/bin/chromedriver")
-    #     driver = webdriver.Chrome(service=service, options=options)
-    # else:
-    #     driver = webdriver.Chrome(options=options)
-    
-    driver.get("https://world-nuclear.org/nuclear-reactor-database/summary")
-    
+
+    load_page(driver, 'nuclear_data', NUCLEAR_DATA_URL)
+
     logger.info('Waiting for page to load...')
-    # time.sleep(10)  # Increase wait time to ensure all elements are loaded
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.CLASS_NAME, "do_counter1"))
-    )
-    
-    data = {}
+    if not wait_until_ready(driver, 'nuclear_data', script_true(f'return ({NUCLEAR_COUNTERS_READY})()')):
+        return {}
+    wait_until_ready(driver, 'nuclear_data_tables', script_true(f'return ({NUCLEAR_TABLES_READY})()'))
 
     try:
-        logger.info('Scraping basic nuclear data...')
-        counters = driver.find_elements(By.CLASS_NAME, 'do_counter1')
-        data['operable_reactors'] = counters[0].text
-        data['global_share'] = counters[1].text
-        data['under_construction'] = counters[2].text
-        logger.info(f'Basic nuclear data: {data}')
+        logger.info('Scraping counters and tables...')
+        data = parse_nuclear_data(driver.page_source)
 
         logger.info('Scraping chart data...')
-        data['top_10_countries'] = scrape_chart_data(driver, '#TotalOperableReactorBarChart')
-        data['reactors_under_construction'] = scrape_chart_data(driver, '#ReactorsUnderConstructionBarChart')
-        data['global_nuclear_generation'] = scrape_chart_data(driver, '#GlobalNuclearGenerationByYearChart')
-        data['planned_reactors'] = scrape_chart_data(driver, '#PlannedReactorsBarChart')
-        data['proposed_reactors'] = scrape_chart_data(driver, '#ProposedReactorsBarChart')
-        data['nuclear_electricity_production'] = scrape_chart_data(driver, '#NuclearElectricityProductionBarChart')
-        
-        logger.info('Scraping table data...')
-        data['recent_connections'] = scrape_table_data(driver, 'table.table1')
-        data['top_load_factor'] = scrape_table_data(driver, 'table.table2')
-        data['top_generation'] = scrape_table_data(driver, 'table.table3')
-        data['top_lifetime_generation'] = scrape_table_data(driver, 'table.table4')
-        data['recent_construction_starts'] = scrape_table_data(driver, 'table.table5')
+        for key, chart_selector in NUCLEAR_DATA_CHARTS.items():
+            data[key] = scrape_chart_data(driver, chart_selector)
 
         logger.info('Finished scraping nuclear data.')
         logger.debug(f'Scraped data: {json.dumps(data, indent=2)}')
@@ -444,63 +554,42 @@ def scrape_nuclear_data(driver):
         logger.error(f'Error during nuclear data scraping: {e}', exc_info=True)
         data = {}
 
-    # finally:
-    #     driver.quit()
-
     return data
 
 
-def fetch_news_from_mining_com(driver):
+async def scrape_nuclear_data_playwright(page):
+    await goto_page(page, 'nuclear_data', NUCLEAR_DATA_URL)
+    if not await wait_for_page(page, 'nuclear_data', function=NUCLEAR_COUNTERS_READY):
+        return {}
+    await wait_for_page(page, 'nuclear_data_tables', function=NUCLEAR_TABLES_READY)
+
     try:
-        url = 'https://www.mining.com/?s=uranium'
-        driver.get(url)
-        time.sleep(2)
+        data = await parse_in_pool(parse_nuclear_data, await page.content())
+        for key, chart_selector in NUCLEAR_DATA_CHARTS.items():
+            try:
+                data[key] = await page.evaluate(highcharts_series_script(chart_selector))
+            except Exception as e:
+                logger.error(f"Error scraping chart {chart_selector}: {e}")
+                data[key] = []
 
-        page_content = driver.page_source
-        soup = BeautifulSoup(page_content, 'html.parser')
+        cache.set('nuclear_data', data, timeout=60 * 60)  # Cache for 1 hour
+        logger.info('Nuclear data cached.')
+    except Exception as e:
+        logger.error(f'Error during nuclear data scraping: {e}', exc_info=True)
+        data = {}
 
-        articles = soup.select('article.post.row.my-4.has-thumbnail')
-        news_data = []
+    return data
 
-        for article in articles:
-            title_element = article.find('h2')
-            if title_element:
-                title = title_element.get_text(strip=True)
-                link = title_element.find('a')['href']
-
-            image_element = article.find('img')
-            image_url = image_element['src'] if image_element else 'No image available'
-
-            summary_element = article.find('p', class_='post-info')
-            summary = summary_element.get_text(strip=True) if summary_element else 'No summary available'
-
-            post_meta = article.find('div', class_='post-meta.mb-3')
-            if post_meta:
-                post_meta_text = post_meta.get_text(strip=True)
-                date_str = post_meta_text.split("|")[1].strip() if "|" in post_meta_text else 'N/A'
-                try:
-                    published_date = datetime.strptime(date_str, "%B %d, %Y") if date_str != 'N/A' else 'N/A'
-                except ValueError:
-                    logger.warning(f"Failed to parse date mining_com: {date_str}")
-                    published_date = 'N/A'
-                author = post_meta.find('a').get_text(strip=True) if post_meta.find('a') else 'N/A'
-            else:
-                published_date = 'N/A'
-                author = 'N/A'
 
-            news_item = {
-                'id': hashlib.md5(link.encode()).hexdigest(),
-                'title': title,
-                'link': link,
-                'publisher': 'Mining.com',
-                'published_date': published_date,
-                'author': author,
-                'image_url': image_url,
-                'content': summary,
-            }
+MINING_COM_URL = 'https://www.mining.com/?s=uranium'
 
-            news_data.append(news_item)
 
+def fetch_news_from_mining_com(driver):
+    try:
+        load_page(driver, 'mining_com_news', MINING_COM_URL)
+        wait_until_ready(driver, 'mining_com_news', element_present(By.CSS_SELECTOR, 'article.post'))
+
+        news_data = parse_mining_com_news(driver.page_source)
         logger.info(f"Cached {len(news_data)} news items from mining.com")
         return news_data
 
@@ -509,56 +598,50 @@ def fetch_news_from_mining_com(driver):
         return []
 
 
-def fetch_news_from_nucnet(driver):
+async def fetch_news_from_mining_com_playwright(page):
     try:
-        url = 'https://www.nucnet.org/search?query=NUCLEAR'
-        driver.get(url)
-        time.sleep(5)
+        await goto_page(page, 'mining_com_news', MINING_COM_URL)
+        await wait_for_page(page, 'mining_com_news', selector='article.post')
 
-        news_items = driver.find_elements(By.XPATH, "//div[contains(@class, 'search-news-box clickable-box mb-6 md:mb-8')]")
-        news_data = []
+        news_data = await parse_in_pool(parse_mining_com_news, await page.content())
+        logger.info(f"Cached {len(news_data)} news items from mining.com")
+        return news_data
+    except Exception as e:
+        logger.error(f"An error occurred: {str(e)}", exc_info=True)
+        return []
 
-        for idx, news in enumerate(news_items):
-            title_element = news.find_element(By.XPATH, ".//h4[contains(@class, 'news-box-title pr-4')]")
-            title = title_element.text if title_element else 'No title available'
 
-            link_element = news.find_element(By.XPATH, ".//a[contains(@class, 'clickable-box-link')]")
-            link = link_element.get_attribute("href") if link_element else 'No link available'
+NUCNET_URL = 'https://www.nucnet.org/search?query=NUCLEAR'
 
-            date_element = news.find_element(By.XPATH, ".//time[contains(@class, 'news-box-date')]")
-            date_str = date_element.text if date_element else 'N/A'
 
-            # Convert date from "20 September 2024" to "2024-09-20"
-            try:
-                published_date = datetime.strptime(date_str, "%d %B %Y").strftime("%Y-%m-%d")
-            except ValueError:
-                published_date = 'N/A'
+def fetch_news_from_nucnet(driver):
+    try:
+        load_page(driver, 'nucnet_news', NUCNET_URL)
+        wait_until_ready(driver, 'nucnet_news', element_present(By.CSS_SELECTOR, 'div.search-news-box'))
+
+        news_data = parse_nucnet_news(driver.page_source)
+        logger.info(f"Cached {len(news_data)} news items from nucnet.org")
+        return news_data
 
-            image_element = news.find_element(By.XPATH, ".//div[contains(@class, 'news-box-img')]//img")
-            image_url = image_element.get_attribute('src') if image_element else 'No image available'
+    except Exception as e:
+        logger.error(f"An error occurred: {str(e)}", exc_info=True)
+        return []
 
-            news_item = {
-                'id': hashlib.md5(link.encode()).hexdigest(),
-                'title': title,
-                'link': link,
-                'publisher': 'NUCNET',
-                'published_date': published_date,  # Updated date format
-                'author': 'N/A',
-                'image_url': image_url,
-                'content': 'N/A',  # Assuming no content is available on this page
-            }
 
-            news_data.append(news_item)
+async def fetch_news_from_nucnet_playwright(page):
+    try:
+        await goto_page(page, 'nucnet_news', NUCNET_URL)
+        await wait_for_page(page, 'nucnet_news', selector='div.search-news-box')
 
+        news_data = await parse_in_pool(parse_nucnet_news, await page.content())
         logger.info(f"Cached {len(news_data)} news items from nucnet.org")
         return news_data
-
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}", exc_info=True)
         return []
 
 
-def fetch_world_nuclear_news_com():
+async def fetch_world_nuclear_news_com_async(session):
     cache_key = 'world_nuclear_news'
     cached_news = cache.get(cache_key)
 
@@ -566,59 +649,18 @@ def fetch_world_nuclear_news_com():
         return cached_news
 
     url = 'https://world-nuclear-news.org/search?search=uranium'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0'
-    }
-
-    response = requests.get(url, headers=headers)
-
-    if response.status_code == 200:
-        page_content = response.text
-        soup = BeautifulSoup(page_content, 'html.parser')
-        
-        news_container = soup.find('div', id='internal_news_list_wrapper')
-        if not news_container:
-            logger.error("Could not find news container")
-            return []
-
-        news_items = news_container.find_all('a', class_='news_box_link')
-        news_data = []
+    page_content = await fetch_page(session, url)
+    if page_content is None:
+        return []
 
-        for item in news_items:
-            link = f"https://world-nuclear-news.org{item['href']}"
-            title = item.find('div', class_='news_list_title').text.strip()
-            content = item.find('div', class_='news_list_intro').text.strip()
-            category = item.find('span', class_='news_list_category').text.strip()
-            published_date = item.find('span', class_='news_list_predate').text.strip()
-            try:
-                # Parse the date using the specific format
-                date_obj = datetime.strptime(published_date, "%A, %d %B %Y")
-                # Convert to the desired format 'YYYY-MM-DD'
-                published_date = date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                logger.warning(f"Failed to parse date world_nuclear_news: {published_date}")
-                published_date = 'N/A'
-            
-            image_element = item.find('img')
-            image_url = f"https://world-nuclear-news.org{image_element['src']}" if image_element else None
+    news_data = await parse_in_pool(parse_world_nuclear_news, page_content)
+    if news_data:
+        cache.set(cache_key, news_data, timeout=3600)  # Cache for 1 hour
+    return news_data
 
-            news_item = {
-                'id': hashlib.md5(link.encode()).hexdigest(),
-                'title': title,
-                'link': link,
-                'publisher': 'World Nuclear News',
-                'published_date': published_date,
-                'category': category,
-                'content': content,
-                'image_url': image_url
-            }
-            news_data.append(news_item)
 
-        cache.set(cache_key, news_data, timeout=3600)  # Cache for 1 hour
-        return news_data
-    else:
-        logger.error(f"Failed to retrieve world-nuclear-news.org. Status code: {response.status_code}")
-        return []
+def fetch_world_nuclear_news_com():
+    return run_coroutine(fetch_world_nuclear_news_com_async)
 
 
 def get_world_nuclear_article_content(url):
@@ -667,16 +709,20 @@ def get_world_nuclear_article_content(url):
         return f"Failed due to an error: {e}", None, None, None
 
 
+def stock_news_cache_key(symbol):
+    return f'stock_news_{symbol}'
+
+
 def fetch_stock_news(symbol):
-    cache_key = f'stock_news_{symbol}'
+    cache_key = stock_news_cache_key(symbol)
     cached_news = cache.get(cache_key)
 
     if cached_news:
         return cached_news
 
     try:
-        ticker = yf.Ticker(symbol)
-        news = ticker.news
+        with requests_session() as session:
+            news = yf.Ticker(symbol, session=session).news
         news_data = []
         seen_titles = set()  # To keep track of unique titles
         
@@ -698,7 +744,8 @@ def fetch_stock_news(symbol):
                     news_data.append(news_item)
                     seen_titles.add(item['title'])
 
-        cache.set(cache_key, news_data, timeout=3600)  # Cache for 1 hour
+        # Never outlives the stock news refresh interval, so a scheduled refresh sees new headlines
+        cache.set(cache_key, news_data, timeout=min(3600, settings.URANIUM_REFRESH_INTERVALS.get('stock_news', 3600)))
         return news_data
     except Exception as e:
         logger.error(f"Error fetching news for {symbol}: {str(e)}")
@@ -753,7 +800,7 @@ def get_article_content(url):
         return "An error occurred while fetching the article content."
     
 
-def fetch_mining_technology_com_news():
+async def fetch_mining_technology_com_news_async(session):
     cache_key = 'mining_technology_com_news'
     cached_news = cache.get(cache_key)
 
@@ -765,328 +812,431 @@ def fetch_mining_technology_com_news():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
 
-    response = requests.get(url, headers=headers)
+    page_content = await fetch_page(session, url, headers=headers)
+    if page_content is None:
+        return []
 
-    if response.status_code == 200:
-        page_content = response.text
-        soup = BeautifulSoup(page_content, 'html.parser')
+    results = await parse_in_pool(parse_mining_technology_results, page_content)
 
-        articles = soup.select('article.cell.feature.grid-x.border-bottom')
-        news_data = []
+    # An article's date, author and body never change, so detail pages are
+    # cached per link and only new articles are fetched, several at a time
+    detail_keys = {result['link']: f"mining_tech_article_{hashlib.md5(result['link'].encode()).hexdigest()}" for result in results}
+    cached_details = cache.get_many(detail_keys.values())
+    new_links = [link for link, key in detail_keys.items() if key not in cached_details]
 
-        for article in articles:
-            category_element = article.find('div', class_='category')
-            category = category_element.get_text(strip=True) if category_element else 'N/A'
-
-            title_element = article.find('h3')
-            if title_element:
-                title = title_element.get_text(strip=True)
-                link = title_element.find('a')['href']
-
-            description_element = article.find('p')
-            description = description_element.get_text(strip=True) if description_element else 'N/A'
-
-            image_element = article.select_one('div.cell.large-4.article-image img')
-            image_url = image_element['src'] if image_element else 'N/A'
-
-            # Navigate to the article's URL to fetch additional details
-            article_response = requests.get(link, headers=headers)
-            if article_response.status_code == 200:
-                article_content = article_response.text
-                article_soup = BeautifulSoup(article_content, 'html.parser')
-
-                date_element = article_soup.select_one('div.article-meta span.date-published')
-                date_str = date_element.get_text(strip=True) if date_element else 'N/A'
-                try:
-                    published_date = datetime.strptime(date_str, "%B %d, %Y").strftime('%Y-%m-%d') if date_str != 'N/A' else 'N/A'
-                except ValueError:
-                    logger.warning(f"Failed to parse date mining_tech: {date_str}")
-                    published_date = 'N/A'
-
-                author_element = article_soup.select_one('div.article-meta span.author')
-                author = author_element.get_text(strip=True) if author_element else 'N/A'
-
-                content_element = article_soup.select_one('div.main-content')
-                content = "\n\n".join([p.get_text(strip=True) for p in content_element.find_all('p')]) if content_element else 'N/A'
-
-                news_item = {
-                    'id': hashlib.md5(link.encode()).hexdigest(),
-                    'publisher': category,
-                    'title': title,
-                    'published_date': published_date,
-                    'author': author,
-                    'image_url': image_url,
-                    'content': content,
-                    'link': link
-                }
-                news_data.append(news_item)
+    pages = await fetch_pages(
+        session, new_links, headers=headers,
+        concurrency=settings.URANIUM_MINING_TECH_DETAIL_CONCURRENCY
+    )
+    fetched = [(link, page) for link, page in zip(new_links, pages) if page is not None]
+    parsed = await asyncio.gather(*(parse_in_pool(parse_mining_technology_article, page) for _, page in fetched))
+    new_details = {detail_keys[link]: detail for (link, _), detail in zip(fetched, parsed)}
+    cache.set_many(new_details, timeout=settings.URANIUM_ARTICLE_DETAIL_TTL)
+    logger.info(f"mining-technology.com: fetched {len(new_links)} new of {len(results)} articles")
 
+    details = {**cached_details, **new_details}
+    news_data = []
+    for result in results:
+        link = result['link']
+        detail = details.get(detail_keys[link])
+        if detail is None:
+            continue
+        published_date, author, content = detail
+
+        news_item = {
+            'id': hashlib.md5(link.encode()).hexdigest(),
+            'publisher': result['category'],
+            'title': result['title'],
+            'published_date': published_date,
+            'author': author,
+            'image_url': result['image_url'],
+            'content': content,
+            'link': link
+        }
+        news_data.append(news_item)
+
+    if news_data:
         cache.set(cache_key, news_data, timeout=3600)  # Cache for 1 hour
-        return news_data
-    else:
-        logger.error(f"Failed to retrieve mining-technology.com news. Status code: {response.status_code}")
-        return []
+    return news_data
 
 
-logger = logging.getLogger(__name__)
+def fetch_mining_technology_com_news():
+    return run_coroutine(fetch_mining_technology_com_news_async)
 
-def fetch_inform_kz_news(driver):
-    try:
-        url = 'https://en.inform.kz/search_results/?q=nuclear'
-        driver.get(url)
-        time.sleep(5)
 
-        news_items = driver.find_elements(By.CSS_SELECTOR, "div.searchCard")
-        news_data = []
+logger = logging.getLogger(__name__)
 
-        for idx, news in enumerate(news_items):
-            title_element = news.find_element(By.CSS_SELECTOR, "div.searchCard_title")
-            title = title_element.text if title_element else 'No title available'
+INFORM_KZ_URL = 'https://en.inform.kz/search_results/?q=nuclear'
 
-            link_element = news.find_element(By.CSS_SELECTOR, "a")
-            link = link_element.get_attribute("href") if link_element else 'No link available'
 
-            date_element = news.find_element(By.CSS_SELECTOR, "div.searchCard_time")
-            date_str = date_element.text if date_element else 'N/A'
+def fetch_inform_kz_news(driver):
+    try:
+        load_page(driver, 'inform_kz_news', INFORM_KZ_URL)
+        wait_until_ready(driver, 'inform_kz_news', element_present(By.CSS_SELECTOR, "div.searchCard"))
 
-            # Convert date from "16:20, 28 August 2024" to "2024-08-28"
-            try:
-                date_parsed = datetime.strptime(date_str.split(",")[1].strip(), "%d %B %Y")
-                published_date = date_parsed.strftime("%Y-%m-%d")
-            except ValueError:
-                published_date = 'N/A'
+        news_data = parse_inform_kz_news(driver.page_source)
+        logger.info(f"Cached {len(news_data)} news items from inform.kz")
+        return news_data
 
-            image_element = news.find_element(By.CSS_SELECTOR, "picture img")
-            image_url = image_element.get_attribute("src") if image_element else 'No image available'
+    except Exception as e:
+        logger.error(f"An error occurred: {str(e)}", exc_info=True)
+        return []
 
-            news_item = {
-                'id': hashlib.md5(link.encode()).hexdigest(),
-                'title': title,
-                'link': link,
-                'publisher': 'INFORM.KZ',
-                'published_date': published_date,  # Converted date format
-                'author': 'N/A',
-                'image_url': image_url,
-                'content': 'N/A',  # Assuming no content is available on this page
-            }
 
-            news_data.append(news_item)
+async def fetch_inform_kz_news_playwright(page):
+    try:
+        await goto_page(page, 'inform_kz_news', INFORM_KZ_URL)
+        await wait_for_page(page, 'inform_kz_news', selector='div.searchCard')
 
+        news_data = await parse_in_pool(parse_inform_kz_news, await page.content())
         logger.info(f"Cached {len(news_data)} news items from inform.kz")
         return news_data
-
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}", exc_info=True)
         return []
 
 
-def fetch_news_from_northern_miner_com():
+async def fetch_news_from_northern_miner_com_async(session):
     url = 'https://www.northernminer.com/?s=uranium'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0'
-    }
-    try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            page_content = response.text
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Select all article elements with the class 'content-list clearfix'
-            articles = soup.select('article.content-list.clearfix')
-            news_data = []
-            
-            for article in articles:
-                # Extract the title and link
-                title_element = article.find('h3', class_='content-list-title')
-                title = title_element.get_text(strip=True) if title_element else 'N/A'
-                link = title_element.find('a')['href'] if title_element and title_element.find('a') else 'N/A'
-                
-                # Extract the image URL
-                image_element = article.find('img')
-                image_url = image_element['src'] if image_element else 'N/A'
-                
-                # Extract the summary/content
-                summary_element = article.find('div', class_='content-list-excerpt')
-                summary = summary_element.get_text(strip=True) if summary_element else 'N/A'
-                
-                # Extract the published date and category
-                entry_meta = article.find('p', class_='entry-meta')
-                if entry_meta:
-                    date_str = entry_meta.find('span', class_='entry-meta-date').get_text(strip=True)
-                    try:
-                        published_date = datetime.strptime(date_str, "%B %d, %Y").strftime('%d-%m-%Y')
-                    except ValueError:
-                        logging.warning(f"Failed to parse date: {date_str}")
-                        published_date = 'N/A'
-                    category = entry_meta.find('span', class_='entry-meta-cats').get_text(strip=True)
-                else:
-                    published_date = 'N/A'
-                    category = 'N/A'
-                
-                # Prepare the news item
-                news_item = {
-                    'id': hashlib.md5(link.encode()).hexdigest(),
-                    'title': title,
-                    'link': link,
-                    'publisher': 'Northern Miner',
-                    'published_date': published_date,
-                    'category': category,
-                    'image_url': image_url,
-                    'content': summary,
-                }
-                news_data.append(news_item)
-            return news_data
-        else:
-            logging.error(f"Failed to retrieve northernminer.com news. Status code: {response.stat}")
-            return []
-    except Exception as e:
-        logging.error(f"Error fetching news from northernminer.com: {str(e)}")
+    page_content = await fetch_page(session, url)
+    if page_content is None:
         return []
+    return await parse_in_pool(parse_northern_miner_news, page_content)
+
+
+def fetch_news_from_northern_miner_com():
+    return run_coroutine(fetch_news_from_northern_miner_com_async)
+
+
+def highcharts_series_script(chart_selector):
+    """JavaScript function returning the series of the Highcharts chart rendered into chart_selector, or null."""
+    return f"""() => {{
+        const chart = Highcharts.charts.find(c => c && c.renderTo.id === '{chart_selector.lstrip('#')}');
+        if (!chart) return null;
+        return chart.series.map(series => ({{
+            name: series.name,
+            data: series.data.map(point => ({{
+                name: point.name || point.category,
+                y: point.y
+            }}))
+        }}));
+    }}"""
 
 
 def scrape_chart_data(driver, chart_selector):
     try:
-        chart_data = driver.execute_script(f"""
-            const chart = Highcharts.charts.find(c => c.renderTo.id === '{chart_selector.lstrip('#')}');
-            if (!chart) return null;
-            return chart.series.map(series => ({{
-                name: series.name,
-                data: series.data.map(point => ({{
-                    name: point.name || point.category,
-                    y: point.y
-                }}))
-            }}));
-        """)
-        return chart_data
+        return driver.execute_script(f"return ({highcharts_series_script(chart_selector)})()")
     except Exception as e:
         logger.error(f"Error scraping chart {chart_selector}: {e}")
         return []
 
-def scrape_table_data(driver, table_selector):
-    try:
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, table_selector))
-        )
-        table = driver.find_element(By.CSS_SELECTOR, table_selector)
-        headers = [th.text for th in table.find_elements(By.CSS_SELECTOR, 'thead th')]
-        rows = table.find_elements(By.CSS_SELECTOR, 'tbody tr')
-        data = []
-        for row in rows:
-            row_data = {}
-            cells = row.find_elements(By.TAG_NAME, 'td')
-            for i, cell in enumerate(cells):
-                row_data[headers[i]] = cell.text
-            data.append(row_data)
-        return data
-    except Exception as e:
-        logger.error(f"Error scraping table {table_selector}: {e}")
-        return []
 
+def news_title_key(title):
+    """Hash of a title with case, punctuation and spacing normalized, so reworded copies of a headline dedupe."""
+    normalized = ' '.join(re.sub(r'[^\w\s]', ' ', title.lower()).split())
+    return hashlib.md5(normalized.encode()).hexdigest()
 
-def init_driver():
-    chromedriver_autoinstaller.install()
 
-    options = Options()
-    options.add_argument('--headless=new')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-blink-features=AutomationControlled") 
+def fetch_all_stock_news(limit=None):
+    """
+    Collect the newest uranium stock news across all tickers.
 
-    if server_config:
-        options.binary_location = "/usr/bin/chromium"
-        service = Service(executable_path="/usr/bin/chromedriver")
-        driver = webdriver.Chrome(service=service, options=options)
-    else:
-        driver = webdriver.Chrome(options=options)
+    Symbols are fetched concurrently, and collection stops after
+    URANIUM_STOCK_NEWS_BUDGET seconds; whatever arrived by then is used,
+    even if that is fewer than limit items.
+
+    Args:
+    limit (int): Number of items to return, URANIUM_STOCK_NEWS_LIMIT by default.
 
-    return driver
+    Returns:
+    list: up to limit news items, newest first, deduplicated by title.
+    """
+    limit = limit or settings.URANIUM_STOCK_NEWS_LIMIT
+    symbols = get_uranium_stocks()
+    unique_news = {}
+
+    pool = ThreadPoolExecutor(max_workers=settings.URANIUM_STOCK_NEWS_WORKERS, thread_name_prefix='uranium-stock-news')
+    futures = [pool.submit(fetch_stock_news, symbol) for symbol in symbols]
+    done = 0
+    try:
+        for future in as_completed(futures, timeout=settings.URANIUM_STOCK_NEWS_BUDGET):
+            done += 1
+            for news in future.result():
+                unique_news.setdefault(news_title_key(news['title']), news)
+    except FuturesTimeoutError:
+        logger.warning(f"Stock news budget ran out after {done}/{len(symbols)} symbols")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return heapq.nlargest(limit, unique_news.values(), key=lambda news: news['published_date'])
+
+
+# Every source that makes up the uranium data, in crawl order. A result is
+# stored under its source name, except 'merge' sources whose dict is spread
+# into the top level. 'driver' fetchers take a Selenium driver, and their
+# 'playwright' coroutine versions take a Playwright page instead (see
+# URANIUM_BROWSER_BACKENDS); 'async' sources also have a coroutine version
+# that a full refresh runs on one shared HTTP client. 'cache_key', one key or
+# a tuple of them, is cleared before a scheduled refresh so it really refetches, and 'default' stands in
+# until the source has been fetched once. Browser sources listing cheaper
+# 'tiers' are first fetched over plain HTTP from 'url' and read with 'parse'
+# or 'json_parse'; the browser only runs when that result fails their
+# 'complete' check.
+URANIUM_SOURCES = {
+    'uranium_price': {'fetch': fetch_uranium_price, 'playwright': fetch_uranium_price_playwright, 'driver': True, 'cache_key': 'uranium_price_data', 'merge': True, 'default': {}},
+    'calendar': {
+        'fetch': fetch_calendar_data, 'playwright': fetch_calendar_data_playwright, 'driver': True, 'cache_key': 'calendar_data', 'default': None,
+        'tiers': ('http', 'browser'), 'url': calendar_url, 'parse': parse_calendar,
+        'complete': lambda result: bool(result and result['calendar_html']),
+    },
+    'iaea_news': {
+        'fetch': fetch_iaea_news, 'playwright': fetch_iaea_news_playwright, 'driver': True, 'default': [],
+        'tiers': ('http', 'browser'), 'url': IAEA_NEWS_URL, 'parse': parse_iaea_news,
+    },
+    'nuclear_data': {'fetch': scrape_nuclear_data, 'playwright': scrape_nuclear_data_playwright, 'driver': True, 'default': {}},
+    'mining_com_news': {
+        'fetch': fetch_news_from_mining_com, 'playwright': fetch_news_from_mining_com_playwright, 'driver': True, 'default': [],
+        'tiers': ('http', 'browser'), 'url': MINING_COM_URL, 'parse': parse_mining_com_news,
+    },
+    'nucnet_news': {
+        'fetch': fetch_news_from_nucnet, 'playwright': fetch_news_from_nucnet_playwright, 'driver': True, 'default': [],
+        'tiers': ('http', 'json', 'browser'), 'url': NUCNET_URL, 'parse': parse_nucnet_news,
+        'json_parse': partial(parse_embedded_news, publisher='NUCNET', base_url='https://www.nucnet.org'),
+    },
+    'inform_kz_news': {
+        'fetch': fetch_inform_kz_news, 'playwright': fetch_inform_kz_news_playwright, 'driver': True, 'default': [],
+        'tiers': ('http', 'json', 'browser'), 'url': INFORM_KZ_URL, 'parse': parse_inform_kz_news,
+        'json_parse': partial(parse_embedded_news, publisher='INFORM.KZ', base_url='https://en.inform.kz'),
+    },
+    'stocks': {
+        'fetch': fetch_uranium_stocks, 'driver': False, 'cache_key': (STOCK_QUOTES_CACHE_KEY, STOCK_DATA_CACHE_KEY), 'default': {},
+        # A failed download still lists every symbol, each with an empty record
+        'complete': lambda stocks: any(stocks.values()),
+    },
+    'world_nuclear_news_com': {'fetch': fetch_world_nuclear_news_com, 'async': fetch_world_nuclear_news_com_async, 'driver': False, 'cache_key': 'world_nuclear_news', 'default': []},
+    'mining_technology_com_news': {'fetch': fetch_mining_technology_com_news, 'async': fetch_mining_technology_com_news_async, 'driver': False, 'cache_key': 'mining_technology_com_news', 'default': []},
+    'northern_miner_com_news': {'fetch': fetch_news_from_northern_miner_com, 'async': fetch_news_from_northern_miner_com_async, 'driver': False, 'default': []},
+    'stock_news': {
+        'fetch': fetch_all_stock_news, 'driver': False,
+        'cache_key': tuple(stock_news_cache_key(symbol) for symbol in URANIUM_STOCKS), 'default': [],
+    },
+}
+
+
+def run_source(name, driver=None):
+    source = URANIUM_SOURCES[name]
+    if source['driver']:
+        return source['fetch'](driver)
+    return source['fetch']()
+
+
+def source_sections(name, result):
+    """The top-level keys of the uranium data that one source's result provides."""
+    if URANIUM_SOURCES[name].get('merge'):
+        return dict(result or {})
+    return {name: result}
+
+
+def build_uranium_data(results):
+    """Assemble the uranium data dict from per-source results."""
+    data = {}
+    for name, source in URANIUM_SOURCES.items():
+        result = results.get(name, source['default'])
+        if source.get('merge'):
+            data.update(result or {})
+        else:
+            data[name] = result
+    return data
+
+
+def fetch_uranium_sources():
+    """
+    Crawl every source, running independent sources concurrently.
+
+    This is the slow path; it runs from the background refresh, never from
+    a request. Per-source and per-stage timings are logged and kept in the
+    cache under 'uranium_refresh_timings'.
+
+    Returns:
+    dict: source name to fetched result.
+    """
+    results, timings = run_sources(
+        URANIUM_SOURCES,
+        run_source,
+        get_driver_pool(),
+        browser_workers=settings.URANIUM_BROWSER_WORKERS,
+        http_workers=settings.URANIUM_HTTP_WORKERS,
+        deadline=settings.URANIUM_REFRESH_DEADLINE,
+        isolated=settings.URANIUM_ISOLATED_SOURCES,
+    )
+    cache.set('uranium_refresh_timings', timings, timeout=None)
+    return results
 
 
 def fetch_uranium_data():
-    global global_uranium_data
+    return build_uranium_data(fetch_uranium_sources())
+
+
+def source_cache_keys(source):
+    """The cache keys a URANIUM_SOURCES entry declares, as a tuple."""
+    keys = source.get('cache_key') or ()
+    return (keys,) if isinstance(keys, str) else tuple(keys)
 
-    if global_uranium_data is None:
 
-        driver = init_driver()
+@shared_task
+def refresh_source(name):
+    """
+    Refetch a single source and publish it to the shared snapshot.
+
+    Celery beat runs one of these per source on its own interval
+    (see URANIUM_REFRESH_INTERVALS); web workers switch to the new snapshot
+    version on their next request.
+    """
+    source = URANIUM_SOURCES[name]
+    # A full refresh or a slow earlier run may already be fetching it; its result will be published
+    with single_flight(f'source_{name}') as acquired:
+        if not acquired:
+            return False
+        breaker = CircuitBreaker(name)
+        if not breaker.allow():
+            return False
+
+        cache.delete_many(source_cache_keys(source))
 
         try:
-            uranium_price = fetch_uranium_price(driver)
-            print("progress >>>>>>>>>>>>>>>>> 10%")
-            calendar_data = fetch_calendar_data(driver)
-            print("progress >>>>>>>>>>>>>>>>> 30%")
-            iaea_news = fetch_iaea_news(driver)
-            print("progress >>>>>>>>>>>>>>>>> 40%")
-            nuclear_data = scrape_nuclear_data(driver)
-            print("progress >>>>>>>>>>>>>>>>> 50%")
-            mining_com_news = fetch_news_from_mining_com(driver)
-            print("progress >>>>>>>>>>>>>>>>> 60%")
-            nucnet_news = fetch_news_from_nucnet(driver)
-            print("progress >>>>>>>>>>>>>>>>> 60%")
-            inform_kz_news = fetch_inform_kz_news(driver)
-            print("progress >>>>>>>>>>>>>>>>> 70%")
-        finally:
-            driver.quit()
-
-        uranium_stocks = fetch_uranium_stocks()
-        print("progress >>>>>>>>>>>>>>>>> 80%")
-        world_nuclear_news_com = fetch_world_nuclear_news_com()
-        print("progress >>>>>>>>>>>>>>>>> 90%")
-        mining_technology_com_news = fetch_mining_technology_com_news()
-        print("progress >>>>>>>>>>>>>>>>> 95%")
-        northern_miner_com_news = fetch_news_from_northern_miner_com()
-        print("progress >>>>>>>>>>>>>>>>> 100%")
-        
-        # Fetch stock news synchronously
-        all_stock_news = []
-        for symbol in URANIUM_STOCKS:
-            stock_news = fetch_stock_news(symbol)
-            all_stock_news.extend(stock_news)
-
-        # Sort and remove duplicates
-        seen_titles = set()
-        unique_stock_news = []
-        for news in sorted(all_stock_news, key=lambda x: x['published_date'], reverse=True):
-            if news['title'] not in seen_titles:
-                seen_titles.add(news['title'])
-                unique_stock_news.append(news)
-
-        # If we don't have enough unique stock news, fetch more
-        while len(unique_stock_news) < 9:
-            for symbol in URANIUM_STOCKS:
-                additional_news = fetch_stock_news(symbol)
-                for news in additional_news:
-                    if news['title'] not in seen_titles:
-                        seen_titles.add(news['title'])
-                        unique_stock_news.append(news)
-                        if len(unique_stock_news) >= 9:
-                            break
-                if len(unique_stock_news) >= 9:
-                    break
-
-        global_uranium_data = {
-            **uranium_price,
-            'stocks': uranium_stocks,
-            'mining_com_news': mining_com_news,
-            'world_nuclear_news_com': world_nuclear_news_com,
-            'calendar': calendar_data,
-            'mining_technology_com_news': mining_technology_com_news,
-            'inform_kz_news': inform_kz_news,
-            'northern_miner_com_news': northern_miner_com_news,
-            'nuclear_data': nuclear_data,
-            'iaea_news': iaea_news,
-            'stock_news': unique_stock_news[:9],
-            'nucnet_news': nucnet_news
-        }
+            if name in settings.URANIUM_ISOLATED_SOURCES:
+                result = run_isolated(name)
+            else:
+                result = fetch_source_tiered(name, source)
+        except Exception:
+            breaker.record(False)
+            raise
+        complete = is_complete(source, result)
+        breaker.record(complete)
+    if not complete:
+        logger.warning(f"No complete data fetched for {name}, keeping the previous snapshot")
+        return False
+    return publish_source(name, result)
+
+
+def fetch_source_tiered(name, source):
+    """Fetch one source on its own, cheap tiers first, the way a full refresh would."""
+    if source['driver'] and has_cheap_tiers(name, source):
+        result = fetch_cheap_tiers_sync(name, source)
+        if result is not None:
+            return result
+
+    if source.get('playwright') and browser_backend(name) == 'playwright':
+        result = run_pages({name: source['playwright']})[name]
+        if isinstance(result, Exception):
+            raise result
+    elif source['driver']:
+        with get_driver_pool().driver() as driver:
+            result = run_source(name, driver)
+    else:
+        result = run_source(name)
 
-    return global_uranium_data
+    if source['driver']:
+        record_tier(name, 'browser', is_complete(source, result))
+    return result
 
 
 # Update the fetch_uranium_data_sync function
 def fetch_uranium_data_sync():
-    return fetch_uranium_data()
+    """
+    Return the current uranium data without crawling.
+
+    The result reads from the memory-mapped snapshot shared by every worker,
+    decoding only the keys that are used; the caller may modify it freely.
+    Returns None while nothing has been published yet.
+    """
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return None
+    return SnapshotView(snapshot, default_uranium_data())
+
+
+@lru_cache(maxsize=1)
+def default_uranium_data():
+    return build_uranium_data({})
+
+
+def uranium_payload(name, accept_encoding='', fields=(), include=()):
+    """
+    The ready-to-send body of one payload in payloads.PAYLOAD_BUILDERS.
+
+    Payloads are rendered and compressed once per published snapshot; the
+    stored coding that accept_encoding prefers is returned, with its own
+    etag. One missing from the snapshot, as in versions published before it
+    existed, is built from the data on the spot and sent uncompressed.
+
+    Args:
+    name (str): Payload name.
+    accept_encoding (str): The request's Accept-Encoding header.
+    fields (tuple): Dotted paths to keep, see payloads.select_fields; the
+        filtered body is sent uncompressed.
+    include (iterable): Heavier parts to add, see payloads.PAYLOAD_INCLUDES.
+
+    Returns:
+    payloads.Payload, or None while nothing has been published yet.
+    """
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return None
+    name = included_payload(name, include)
+    max_age = payload_max_age(name, snapshot.saved_at)
+
+    if fields:
+        code, body, etag, last_modified = _stored_payload(snapshot, name)
+        if code == 200:
+            etag = f"{etag}-{hashlib.blake2b(','.join(fields).encode(), digest_size=8).hexdigest()}"
+            body = filtered_body(etag, body, fields)
+        return Payload(code, body, etag, last_modified, max_age)
+
+    encoding = choose_encoding(accept_encoding, snapshot.payload_encodings(name))
+    code, body, etag, last_modified = _stored_payload(snapshot, name, encoding)
+    if encoding != 'identity':
+        # Each coding is a different representation and needs its own strong etag
+        etag = f'{etag}-{encoding}'
+    return Payload(code, body, etag, last_modified, max_age, encoding)
+
+
+def _stored_payload(snapshot, name, encoding='identity'):
+    stored = snapshot.payload(name, encoding)
+    if stored is None:
+        code, body = render_payload(name, SnapshotView(snapshot, default_uranium_data()))
+        stored = code, body, hashlib.blake2b(body, digest_size=16).hexdigest(), snapshot.created
+    return stored
+
+
+def current_stock_store():
+    """
+    The stocks of the current snapshot as a StockStore, or None before the first publish.
+
+    Built once per version and process, so what it works out lazily, such
+    as sorted indexes missing from the snapshot, is kept until the next
+    publish. Versions written before the stock arrays were stored are
+    converted from their stocks section instead.
+    """
+    global _stock_store
+
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return None
+    version, store = _stock_store
+    if version == snapshot.version:
+        return store
+
+    arrays = snapshot.arrays('stocks/')
+    if arrays:
+        store = StockStore.from_arrays(arrays)
+    else:
+        store = StockStore.from_stocks(SnapshotView(snapshot, default_uranium_data()).get('stocks'))
+    _stock_store = (snapshot.version, store)
+    return store
 
 
-# Initial data fetch
-fetch_data_daily()
+def empty_payload(name):
+    """A payload built from no data at all, for endpoints that answer even before the first publish."""
+    code, body = render_payload(name, {})
+    return Payload(code, body, hashlib.blake2b(body, digest_size=16).hexdigest(), None, 0)
@@ -0,0 +1,109 @@
+# uranium_project\uranium_app\tests\test_circuit_breaker.py
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from uranium_app.circuit_breaker import CircuitBreaker, breaker_states
+
+
+def _fail(count):
+    breaker = CircuitBreaker('source', failure_threshold=1000, reset_timeout=60)
+    for _ in range(count):
+        breaker.record(False)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(CACHES={'default': {
+            'BACKEND': 'uranium_app.sqlite_cache.SQLiteCache',
+            'LOCATION': os.path.join(self.tmp.name, 'cache.sqlite3'),
+        }})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.now = 1000.0
+        clock = mock.patch('uranium_app.circuit_breaker.time.time', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def breaker(self):
+        return CircuitBreaker('source', failure_threshold=2, reset_timeout=60, max_reset_timeout=200)
+
+    def test_stays_closed_below_the_threshold(self):
+        breaker = self.breaker()
+        breaker.record(False)
+        self.assertEqual(breaker.state, 'closed')
+        self.assertTrue(breaker.allow())
+
+    def test_opens_after_repeated_failures(self):
+        breaker = self.breaker()
+        breaker.record(False)
+        breaker.record(False)
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker.allow())
+
+    def test_success_resets_the_failure_count(self):
+        breaker = self.breaker()
+        breaker.record(False)
+        breaker.record(True)
+        breaker.record(False)
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_half_open_lets_exactly_one_trial_through(self):
+        breaker = self.breaker()
+        breaker.record(False)
+        breaker.record(False)
+        self.now += 61
+        self.assertEqual(breaker.state, 'half_open')
+        self.assertTrue(breaker.allow())
+        self.assertFalse(self.breaker().allow())
+
+    def test_successful_trial_closes_the_breaker(self):
+        breaker = self.breaker()
+        breaker.record(False)
+        breaker.record(False)
+        self.now += 61
+        breaker.allow()
+        breaker.record(True)
+        self.assertEqual(breaker.state, 'closed')
+        self.assertEqual(cache.get(breaker.cache_key)['failures'], 0)
+
+    def test_failed_trials_double_the_timeout_up_to_the_maximum(self):
+        breaker = self.breaker()
+        breaker.record(False)
+        breaker.record(False)
+        timeouts = []
+        for _ in range(3):
+            self.now = cache.get(breaker.cache_key)['open_until'] + 1
+            self.assertTrue(breaker.allow())
+            breaker.record(False)
+            timeouts.append(cache.get(breaker.cache_key)['reset_timeout'])
+        self.assertEqual(timeouts, [120, 200, 200])
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'needs fork to share the overridden settings')
+    def test_failures_from_every_process_are_counted(self):
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=_fail, args=(20,)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(cache.get(self.breaker().cache_key)['failures'], 80)
+
+    def test_state_is_shared_between_instances(self):
+        self.breaker().record(False)
+        self.breaker().record(False)
+        self.assertEqual(self.breaker().state, 'open')
+
+    @override_settings(URANIUM_BREAKER_FAILURES=1)
+    def test_breaker_states_uses_the_configured_threshold(self):
+        CircuitBreaker('source').record(False)
+        self.assertEqual(breaker_states(['source', 'other']), {'source': 'open', 'other': 'closed'})
@@ -0,0 +1,127 @@
+# uranium_project\uranium_app\tests\test_isolation.py
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from uranium_app import isolation
+from uranium_app.isolation import ISOLATION_KILLS_CACHE_KEY, IsolatedSourceError, SourceKilled, run_isolated
+
+
+# Stand-ins for the fetch_source command; each gets the --output path as its only argument
+SUCCEEDS = "import pickle, sys; pickle.dump(('ok', {'spot_price': 80.5}), open(sys.argv[1], 'wb'))"
+FAILS = "import pickle, sys; pickle.dump(('error', 'no table'), open(sys.argv[1], 'wb'))"
+CRASHES = "import sys; sys.exit(3)"
+# Starts a grandchild, as a fetcher starting a browser would, writes its pid next to the output and hangs
+HANGS = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "open(sys.argv[1] + '.pid', 'w').write(str(child.pid))\n"
+    "time.sleep(60)\n"
+)
+
+
+def _record_kills(count):
+    for _ in range(count):
+        isolation._record_kill('source', 'test', 1.0, 10.0)
+
+
+def _is_running(pid):
+    # Killed processes nobody reaps stay behind as zombies
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+class RunIsolatedTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            URANIUM_LOCK_DIR=os.path.join(self.tmp.name, 'locks'),
+            CACHES={'default': {
+                'BACKEND': 'uranium_app.sqlite_cache.SQLiteCache',
+                'LOCATION': os.path.join(self.tmp.name, 'cache.sqlite3'),
+            }},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def run_child(self, script, **limits):
+        popen = subprocess.Popen
+
+        def start(args, **kwargs):
+            self.output = args[args.index('--output') + 1]
+            return popen([sys.executable, '-c', script, self.output], **kwargs)
+
+        with mock.patch.object(isolation.subprocess, 'Popen', side_effect=start):
+            return run_isolated('source', **limits)
+
+    def test_returns_the_child_result(self):
+        self.assertEqual(self.run_child(SUCCEEDS), {'spot_price': 80.5})
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_fetcher_errors(self):
+        with self.assertRaisesMessage(IsolatedSourceError, 'no table'):
+            self.run_child(FAILS)
+        with self.assertRaisesMessage(IsolatedSourceError, 'exited with code 3'):
+            self.run_child(CRASHES)
+
+    def test_timeout_kills_the_whole_process_group(self):
+        start = time.monotonic()
+        with self.assertLogs('uranium_app', level='ERROR'):
+            with self.assertRaisesMessage(SourceKilled, 'ran past its 1s limit'):
+                self.run_child(HANGS, timeout=1)
+        self.assertLess(time.monotonic() - start, 10)
+
+        with open(self.output + '.pid') as f:
+            grandchild = int(f.read())
+        os.unlink(self.output + '.pid')
+        self.assertFalse(_is_running(grandchild))
+
+        kills = cache.get(ISOLATION_KILLS_CACHE_KEY)
+        self.assertEqual([kill['source'] for kill in kills], ['source'])
+        self.assertGreater(kills[0]['seconds'], 1)
+
+    def test_memory_cap_kills_the_child(self):
+        with mock.patch.object(isolation, 'process_tree_rss', return_value=2048 * 1024 * 1024):
+            with self.assertLogs('uranium_app', level='ERROR'):
+                with self.assertRaisesMessage(SourceKilled, 'used 2048MB, over its 100MB limit'):
+                    self.run_child(HANGS, max_memory_mb=100)
+        self.assertEqual(cache.get(ISOLATION_KILLS_CACHE_KEY)[0]['peak_mb'], 2048)
+        if os.path.exists(self.output + '.pid'):
+            os.unlink(self.output + '.pid')
+
+    def test_limits_come_from_settings(self):
+        with override_settings(
+            URANIUM_ISOLATION_TIMEOUT=30, URANIUM_ISOLATION_MAX_MEMORY_MB=500,
+            URANIUM_ISOLATION_LIMITS={'calendar': {'timeout': 90}},
+        ):
+            self.assertEqual(isolation.isolation_limits('calendar'), (90, 500))
+            self.assertEqual(isolation.isolation_limits('stocks'), (30, 500))
+
+    def test_kill_log_keeps_the_latest(self):
+        with self.assertLogs('uranium_app', level='ERROR'):
+            _record_kills(isolation.ISOLATION_KILLS_KEPT + 5)
+        self.assertEqual(len(cache.get(ISOLATION_KILLS_CACHE_KEY)), isolation.ISOLATION_KILLS_KEPT)
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'needs fork to share the overridden settings')
+    def test_kills_from_every_process_are_kept(self):
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=_record_kills, args=(10,)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(len(cache.get(ISOLATION_KILLS_CACHE_KEY)), 40)
@@ -0,0 +1,195 @@
+# uranium_project\uranium_app\tests\test_payload_views.py
+
+import gzip
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import Client, SimpleTestCase, override_settings
+
+from uranium_app import snapshot, tasks
+from uranium_app.payloads import choose_encoding, included_payload, parse_fields, select_fields
+
+
+STOCKS = {
+    'CCJ': {
+        'name': 'Cameco', 'current_price': 50.1, 'last_price': 49.5, 'change_1m': 5.0, 'change_1y': 20.0,
+        'volume': 1000, 'market_cap': 2e10, 'pe_ratio': 30.0, 'country_name': 'Canada',
+        'dates': ['2024-01-01', '2024-01-02'], 'data': [49.5, 50.1],
+    },
+    'PDN.AX': {
+        'name': 'Paladin', 'current_price': 10.0, 'last_price': 9.0, 'change_1m': -2.0, 'change_1y': -10.0,
+        'volume': 500, 'market_cap': 3e9, 'pe_ratio': 15.0, 'country_name': 'Australia',
+        'dates': ['2024-01-01', '2024-01-02'], 'data': [9.0, 10.0],
+    },
+}
+
+
+class ChooseEncodingTests(SimpleTestCase):
+    def test_q_values(self):
+        cases = [
+            ('', ['br', 'gzip'], 'identity'),
+            ('gzip, deflate, br', ['br', 'gzip'], 'br'),
+            ('gzip, deflate, br', ['gzip'], 'gzip'),
+            ('gzip;q=1.0, br;q=0.5', ['br', 'gzip'], 'gzip'),
+            ('br;q=0, gzip', ['br', 'gzip'], 'gzip'),
+            ('br;q=0', ['br', 'gzip'], 'identity'),
+            ('*', ['br', 'gzip'], 'br'),
+            ('*;q=0.5, br;q=0', ['br', 'gzip'], 'gzip'),
+            ('GZIP', ['gzip'], 'gzip'),
+            ('gzip;q=high', ['gzip'], 'identity'),
+            ('deflate', ['br', 'gzip'], 'identity'),
+        ]
+        for header, available, expected in cases:
+            with self.subTest(header=header, available=available):
+                self.assertEqual(choose_encoding(header, available), expected)
+
+
+class SelectFieldsTests(SimpleTestCase):
+    def test_parse_fields(self):
+        self.assertEqual(parse_fields(' b, a.c ,,a.c'), ('a.c', 'b'))
+        self.assertEqual(parse_fields(''), ())
+
+    def test_dotted_paths_walk_dicts_and_lists(self):
+        value = {
+            'total': 2, 'average': 1.5,
+            'stocks': [{'ticker': 'A', 'price': 1, 'data': [1]}, {'ticker': 'B', 'price': 2, 'data': [2]}],
+        }
+        self.assertEqual(
+            select_fields(value, ('total', 'stocks.ticker', 'stocks.price')),
+            {'total': 2, 'stocks': [{'ticker': 'A', 'price': 1}, {'ticker': 'B', 'price': 2}]},
+        )
+
+    def test_star_matches_every_key(self):
+        value = {'stocks': {'A': {'price': 1, 'data': [1]}, 'B': {'price': 2, 'data': [2]}}, 'other': 1}
+        self.assertEqual(select_fields(value, ('stocks.*.price',)), {'stocks': {'A': {'price': 1}, 'B': {'price': 2}}})
+
+    def test_missing_paths_and_scalars(self):
+        self.assertEqual(select_fields({'a': 1}, ('missing', 'a.deeper')), {'a': 1})
+        self.assertEqual(select_fields({'a': 1}, ()), {'a': 1})
+
+    def test_included_payload(self):
+        self.assertEqual(included_payload('stocks', ('history',)), 'stocks_history')
+        self.assertEqual(included_payload('home', ('history', 'unknown')), 'home_history')
+        self.assertEqual(included_payload('news', ('history',)), 'news')
+
+
+@override_settings(URANIUM_PAYLOAD_COMPRESS_MIN_BYTES=1)
+class PayloadViewTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            URANIUM_SNAPSHOT_DIR=os.path.join(self.tmp.name, 'snapshots'),
+            URANIUM_LOCK_DIR=os.path.join(self.tmp.name, 'locks'),
+            CACHES={'default': {
+                'BACKEND': 'uranium_app.sqlite_cache.SQLiteCache',
+                'LOCATION': os.path.join(self.tmp.name, 'cache.sqlite3'),
+            }},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patch = mock.patch.object(snapshot, '_current', None)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.client = Client()
+
+    def publish(self, stocks=STOCKS, spot_price=80.5):
+        tasks.publish_sources({'stocks': stocks, 'uranium_price': {'spot_price': spot_price}})
+
+    def test_unavailable_before_the_first_publish(self):
+        for url in ('/home/', '/stocks/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 503)
+                self.assertIn('message', response.json())
+                self.assertNotIn('ETag', response)
+
+    def test_news_answers_before_the_first_publish(self):
+        response = self.client.get('/news/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['latest_news'], [])
+
+    def test_caching_headers(self):
+        self.publish()
+        response = self.client.get('/stocks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response.json()['total_stocks'], 2)
+
+    def test_if_none_match(self):
+        self.publish()
+        etag = self.client.get('/stocks/')['ETag']
+
+        response = self.client.get('/stocks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(self.client.get('/stocks/', HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+        # A publish that leaves the body as it was keeps the etag valid; a change doesn't
+        self.publish()
+        self.assertEqual(self.client.get('/stocks/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.publish(spot_price=81.0)
+        response = self.client.get('/stocks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_compressed_bodies(self):
+        self.publish()
+        plain = self.client.get('/stocks/')
+        compressed = self.client.get('/stocks/', HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+        self.assertEqual(
+            self.client.get('/stocks/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=compressed['ETag']).status_code,
+            304,
+        )
+        self.assertNotIn('Content-Encoding', self.client.get('/stocks/', HTTP_ACCEPT_ENCODING='gzip;q=0'))
+
+    def test_fields(self):
+        self.publish()
+        response = self.client.get('/stocks/?fields=total_stocks,stocks.ticker_name', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(
+            json.loads(response.content),
+            {'total_stocks': 2, 'stocks': [{'ticker_name': 'CCJ'}, {'ticker_name': 'PDN.AX'}]},
+        )
+        self.assertNotEqual(response['ETag'], self.client.get('/stocks/')['ETag'])
+        self.assertEqual(
+            self.client.get('/stocks/?fields=total_stocks,stocks.ticker_name', HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+            304,
+        )
+
+    def test_fields_with_star(self):
+        self.publish()
+        response = self.client.get('/home/?fields=uranium_data.stocks.*.current_price,uranium_spot_price')
+        self.assertEqual(response.json(), {
+            'uranium_data': {'stocks': {'CCJ': {'current_price': 50.1}, 'PDN.AX': {'current_price': 10.0}}},
+            'uranium_spot_price': 80.5,
+        })
+
+    def test_include_history(self):
+        self.publish()
+        slim = self.client.get('/stocks/').json()
+        full = self.client.get('/stocks/?include=history').json()
+        self.assertNotIn('data', slim['top_performing_stocks'][0][1])
+        self.assertEqual(full['top_performing_stocks'][0][1]['data'], [49.5, 50.1])
+        self.assertEqual(self.client.get('/stocks/?include=unknown').json(), slim)
+
+        home = self.client.get('/home/?include=history&fields=uranium_data.stocks.*.dates').json()
+        self.assertEqual(home['uranium_data']['stocks']['CCJ']['dates'], ['2024-01-01', '2024-01-02'])
+
+    def test_error_payloads_skip_the_caching_headers(self):
+        tasks.publish_sources({'uranium_price': {'spot_price': 80.5}})
+        response = self.client.get('/stocks/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Cache-Control', response)
@@ -0,0 +1,200 @@
+# uranium_project\uranium_app\tests\test_scoring.py
+
+import random
+
+import numpy as np
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from uranium_app.scoring import (
+    DEFAULT_NORMALIZATION, DEFAULT_TOP_K, DEFAULT_WEIGHTS, InvalidScoring, minmax, normalize, rank,
+    score_stocks, scoring_options, top_indices, zscore,
+)
+from uranium_app.stock_store import StockStore
+from uranium_app.views import GetTopPerformingStocksAPIView
+
+
+def synthetic_stocks(count, missing=0.1, seed=0):
+    """count stock records shaped like the stocks source's, with about missing of the values 'N/A'."""
+    rng = random.Random(seed)
+
+    def value(low, high):
+        return 'N/A' if rng.random() < missing else rng.uniform(low, high)
+
+    return {
+        f'SYM{i}': {
+            'name': f'Company {i}',
+            'current_price': value(0.1, 200),
+            'change_1m': value(-40, 40),
+            'change_1y': value(-90, 300),
+            'volume': value(0, 5e7),
+            'market_cap': value(1e6, 5e10),
+            'pe_ratio': value(-20, 80),
+            'country_name': rng.choice(['Canada', 'Australia', 'United States', 'Kazakhstan']),
+        }
+        for i in range(count)
+    }
+
+
+def reference_top_performing_stocks(stocks_data):
+    """
+    The per-stock min-max scoring the view did before the scoring engine.
+
+    Kept here, apart from the benchmark's copy, as the fixed reference the
+    default weights and normalization must keep matching.
+    """
+    def is_numeric(value):
+        try:
+            float(value)
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    scores = dict.fromkeys(stocks_data, 0.0)
+    for field, weight in DEFAULT_WEIGHTS.items():
+        values = [float(stock[field]) for stock in stocks_data.values() if is_numeric(stock.get(field))]
+        if not values or min(values) == max(values):
+            continue
+        low, high = min(values), max(values)
+        for symbol, stock in stocks_data.items():
+            if is_numeric(stock.get(field)):
+                scores[symbol] += (float(stock[field]) - low) / (high - low) * weight
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:DEFAULT_TOP_K]
+
+
+class NormalizationTests(SimpleTestCase):
+    def test_minmax(self):
+        np.testing.assert_allclose(minmax(np.array([2.0, 4.0, 6.0])), [0, 0.5, 1])
+        np.testing.assert_array_equal(minmax(np.array([3.0, 3.0])), [0, 0])
+
+    def test_zscore(self):
+        np.testing.assert_allclose(zscore(np.array([1.0, 2.0, 3.0])), np.array([-1, 0, 1]) / np.sqrt(2 / 3))
+        np.testing.assert_array_equal(zscore(np.array([3.0, 3.0])), [0, 0])
+
+    def test_rank_averages_ties(self):
+        np.testing.assert_allclose(rank(np.array([10.0, 30.0, 20.0, 30.0])), [0, 5 / 6, 1 / 3, 5 / 6])
+        np.testing.assert_array_equal(rank(np.array([5.0])), [0])
+
+    def test_normalize_scores_missing_values_as_zero(self):
+        np.testing.assert_allclose(normalize(np.array([2.0, np.nan, 6.0])), [0, 0, 1])
+        np.testing.assert_allclose(normalize(np.array([2.0, np.nan, 6.0]), 'rank'), [0, 0, 1])
+
+    def test_normalize_without_values(self):
+        self.assertIsNone(normalize(np.array([np.nan, np.nan])))
+        self.assertIsNone(normalize(np.array([])))
+
+
+class TopIndicesTests(SimpleTestCase):
+    def test_highest_first(self):
+        self.assertEqual(top_indices(np.array([0.1, 0.9, 0.5, 0.7]), 2).tolist(), [1, 3])
+
+    def test_ties_keep_their_order(self):
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1])
+        self.assertEqual(top_indices(scores, 3).tolist(), [1, 0, 2])
+        self.assertEqual(top_indices(scores, 2).tolist(), [1, 0])
+
+    def test_k_past_the_end(self):
+        self.assertEqual(top_indices(np.array([0.2, 0.8]), 5).tolist(), [1, 0])
+        self.assertEqual(top_indices(np.array([]), 3).tolist(), [])
+
+
+class ScoringOptionsTests(SimpleTestCase):
+    def assertInvalid(self, data):
+        with self.assertRaises(InvalidScoring):
+            scoring_options(data)
+
+    def test_defaults(self):
+        weights, methods, top_k = scoring_options({})
+        self.assertEqual(weights, DEFAULT_WEIGHTS)
+        self.assertEqual(methods, dict.fromkeys(DEFAULT_WEIGHTS, DEFAULT_NORMALIZATION))
+        self.assertEqual(top_k, DEFAULT_TOP_K)
+
+    def test_custom_options(self):
+        weights, methods, top_k = scoring_options({
+            'weights': {'pe_ratio': -1, 'change_1m': '0.5'},
+            'normalization': {'pe_ratio': 'rank'},
+            'top_k': '10',
+        })
+        self.assertEqual(weights, {'pe_ratio': -1.0, 'change_1m': 0.5})
+        self.assertEqual(methods, {'pe_ratio': 'rank', 'change_1m': DEFAULT_NORMALIZATION})
+        self.assertEqual(top_k, 10)
+        self.assertEqual(scoring_options({'normalization': 'zscore'})[1], dict.fromkeys(DEFAULT_WEIGHTS, 'zscore'))
+
+    def test_invalid_weights(self):
+        self.assertInvalid({'weights': [1, 2]})
+        self.assertInvalid({'weights': {'name': 1}})
+        self.assertInvalid({'weights': {'pe_ratio': 'high'}})
+        self.assertInvalid({'weights': {'pe_ratio': None}})
+        self.assertInvalid({'weights': {'pe_ratio': 'nan'}})
+        self.assertInvalid({'weights': {'pe_ratio': 'inf'}})
+
+    def test_invalid_normalization(self):
+        self.assertInvalid({'normalization': 'log'})
+        self.assertInvalid({'normalization': {'pe_ratio': 'log'}})
+        self.assertInvalid({'normalization': ['minmax']})
+
+    def test_invalid_top_k(self):
+        for top_k in (0, -1, 1.5, '2.0', 'three', True, None):
+            with self.subTest(top_k=top_k):
+                self.assertInvalid({'top_k': top_k})
+
+
+class ScoreStocksTests(SimpleTestCase):
+    def test_weighted_sum(self):
+        store = StockStore.from_stocks({
+            'A': {'change_1m': 10, 'pe_ratio': 30},
+            'B': {'change_1m': 0, 'pe_ratio': 10},
+            'C': {'change_1m': 5, 'pe_ratio': 'N/A'},
+        }, history=False)
+        indices, scores, normalized = score_stocks(store, {'change_1m': 1, 'pe_ratio': -1}, top_k=3)
+        np.testing.assert_allclose(scores, [0, 0, 0.5])
+        self.assertEqual(indices.tolist(), [2, 0, 1])
+        self.assertEqual(set(normalized), {'change_1m', 'pe_ratio'})
+
+    def test_fields_without_values_are_left_out(self):
+        store = StockStore.from_stocks({'A': {'change_1m': 10}, 'B': {'change_1m': 0}}, history=False)
+        _, scores, normalized = score_stocks(store, top_k=1)
+        self.assertEqual(set(normalized), {'change_1m'})
+        np.testing.assert_allclose(scores, [DEFAULT_WEIGHTS['change_1m'], 0])
+
+    def test_matches_the_loop_it_replaced(self):
+        stocks = synthetic_stocks(200)
+        expected = reference_top_performing_stocks(stocks)
+        top = GetTopPerformingStocksAPIView().get_top_performing_stocks(stocks)
+        self.assertEqual([symbol for symbol, _ in top], [symbol for symbol, _ in expected])
+        for (_, stock), (_, score) in zip(top, expected):
+            self.assertAlmostEqual(stock['performance_score'], score)
+
+
+class TopPerformingStocksViewTests(SimpleTestCase):
+    def post(self, data):
+        request = APIRequestFactory().post('/stocks/top-performing/', data, format='json')
+        return GetTopPerformingStocksAPIView.as_view()(request)
+
+    def test_defaults_to_the_top_three(self):
+        response = self.post({'stocks_data': synthetic_stocks(10)})
+        self.assertEqual(response.status_code, 200)
+        top = response.data['top_stocks']
+        self.assertEqual(len(top), DEFAULT_TOP_K)
+        scores = [stock['performance_score'] for _, stock in top]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertIn('change_1m_normalized', top[0][1])
+
+    def test_custom_options(self):
+        stocks = {'A': {'pe_ratio': 30}, 'B': {'pe_ratio': 10}, 'C': {'pe_ratio': 20}}
+        response = self.post({'stocks_data': stocks, 'weights': {'pe_ratio': -1}, 'normalization': 'rank', 'top_k': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([symbol for symbol, _ in response.data['top_stocks']], ['B', 'C'])
+
+    def test_bad_requests(self):
+        for data in (
+            {},
+            {'stocks_data': ['A']},
+            {'stocks_data': {'A': {}}, 'weights': {'unknown': 1}},
+            {'stocks_data': {'A': {}}, 'normalization': 'log'},
+            {'stocks_data': {'A': {}}, 'top_k': 0},
+        ):
+            with self.subTest(data=data):
+                response = self.post(data)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('message', response.data)
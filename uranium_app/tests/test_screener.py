@@ -0,0 +1,176 @@
+# uranium_project\uranium_app\tests\test_screener.py
+
+import tempfile
+from unittest import mock
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from uranium_app import snapshot, tasks
+from uranium_app.screener import InvalidScreen, parse_filter, parse_sort, screen, screen_options
+from uranium_app.stock_store import StockStore
+from uranium_app.views import StockScreenerAPIView
+
+
+STOCKS = {
+    'CCJ': {'name': 'Cameco', 'pe_ratio': 30.0, 'change_1m': 5.0, 'country_name': 'Canada'},
+    'NXE.TO': {'name': 'NexGen', 'pe_ratio': 'N/A', 'change_1m': -3.0, 'country_name': 'Canada'},
+    'PDN.AX': {'name': 'Paladin', 'pe_ratio': 15.0, 'change_1m': 5.0, 'country_name': 'Australia'},
+    'KAP.IL': {'name': 'Kazatomprom', 'pe_ratio': 10.0, 'change_1m': 'N/A', 'country_name': 'Kazakhstan'},
+    'UEC': {'name': 'Uranium Energy', 'pe_ratio': 20.0, 'change_1m': 1.0, 'country_name': 'United States'},
+}
+
+
+def tickers(result):
+    return [stock['ticker'] for stock in result['results']]
+
+
+class ParseTests(SimpleTestCase):
+    def test_parse_filter(self):
+        self.assertEqual(parse_filter('pe_ratio<20'), ('pe_ratio', '<', 20.0))
+        self.assertEqual(parse_filter(' change_1m >= -5.5 '), ('change_1m', '>=', -5.5))
+        self.assertEqual(parse_filter('volume==100'), ('volume', '=', 100.0))
+        self.assertEqual(parse_filter('volume!=0'), ('volume', '!=', 0.0))
+
+    def test_parse_filter_errors(self):
+        for expression in ('pe_ratio', 'pe_ratio<', 'pe_ratio<>5', 'name=Cameco', 'pe_ratio<low', 'pe_ratio<nan'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(InvalidScreen):
+                    parse_filter(expression)
+
+    def test_parse_sort(self):
+        self.assertEqual(parse_sort(['-change_1m', 'ticker', '+name']), [('change_1m', True), ('ticker', False), ('name', False)])
+        with self.assertRaises(InvalidScreen):
+            parse_sort(['dates'])
+
+    @override_settings(URANIUM_SCREENER_PAGE_SIZE=25, URANIUM_SCREENER_MAX_PAGE_SIZE=200)
+    def test_screen_options(self):
+        options = screen_options(QueryDict('filter=pe_ratio<20,change_1m>0&filter=volume>=1&country=Canada&exchange=TO,v&sort=-pe_ratio&page=2'))
+        self.assertEqual(options, {
+            'filters': [('pe_ratio', '<', 20.0), ('change_1m', '>', 0.0), ('volume', '>=', 1.0)],
+            'countries': ['Canada'],
+            'exchanges': ['TO', 'v'],
+            'sort': [('pe_ratio', True)],
+            'page': 2,
+            'page_size': 25,
+        })
+        self.assertEqual(screen_options(QueryDict('page_size=200'))['page_size'], 200)
+
+    @override_settings(URANIUM_SCREENER_MAX_PAGE_SIZE=200)
+    def test_screen_options_errors(self):
+        for query in ('page_size=201', 'page_size=0', 'page=-1', 'page=two', 'filter=pe_ratio', 'sort=dates'):
+            with self.subTest(query=query):
+                with self.assertRaises(InvalidScreen):
+                    screen_options(QueryDict(query))
+
+
+@override_settings(URANIUM_SCREENER_PAGE_SIZE=25)
+class ScreenTests(SimpleTestCase):
+    def setUp(self):
+        self.store = StockStore.from_stocks(STOCKS, history=False)
+
+    def test_no_filters_returns_everything_in_store_order(self):
+        result = screen(self.store)
+        self.assertEqual(tickers(result), list(STOCKS))
+        self.assertEqual((result['total'], result['pages'], result['page_size']), (5, 1, 25))
+
+    def test_comparisons(self):
+        cases = {
+            'pe_ratio<20': ['PDN.AX', 'KAP.IL'],
+            'pe_ratio<=20': ['PDN.AX', 'KAP.IL', 'UEC'],
+            'pe_ratio>20': ['CCJ'],
+            'pe_ratio>=20': ['CCJ', 'UEC'],
+            'pe_ratio=15': ['PDN.AX'],
+            'change_1m=5': ['CCJ', 'PDN.AX'],
+            # A stock without a value passes neither = nor !=
+            'pe_ratio!=15': ['CCJ', 'KAP.IL', 'UEC'],
+        }
+        for expression, expected in cases.items():
+            with self.subTest(expression=expression):
+                result = screen(self.store, filters=[parse_filter(expression)])
+                self.assertEqual(sorted(tickers(result)), sorted(expected))
+
+    def test_filters_combine(self):
+        result = screen(self.store, filters=[parse_filter('pe_ratio<25'), parse_filter('change_1m>0')])
+        self.assertEqual(tickers(result), ['PDN.AX', 'UEC'])
+
+    def test_countries_and_exchanges(self):
+        self.assertEqual(tickers(screen(self.store, countries=['canada', 'AUSTRALIA'])), ['CCJ', 'NXE.TO', 'PDN.AX'])
+        self.assertEqual(tickers(screen(self.store, exchanges=['us'])), ['CCJ', 'UEC'])
+        self.assertEqual(tickers(screen(self.store, exchanges=['.to', 'IL'])), ['NXE.TO', 'KAP.IL'])
+
+    def test_results_carry_ticker_exchange_and_record(self):
+        result = screen(self.store, countries=['Australia'])['results'][0]
+        self.assertEqual(result['ticker'], 'PDN.AX')
+        self.assertEqual(result['exchange'], 'AX')
+        self.assertEqual(result['name'], 'Paladin')
+        self.assertEqual(result['pe_ratio'], 15.0)
+        self.assertIsNone(result['volume'])
+        self.assertEqual(screen(self.store, countries=['United States'])['results'][0]['exchange'], 'US')
+
+    def test_missing_values_sort_last_either_way(self):
+        self.assertEqual(tickers(screen(self.store, sort=[('pe_ratio', False)])), ['KAP.IL', 'PDN.AX', 'UEC', 'CCJ', 'NXE.TO'])
+        self.assertEqual(tickers(screen(self.store, sort=[('pe_ratio', True)])), ['CCJ', 'UEC', 'PDN.AX', 'KAP.IL', 'NXE.TO'])
+
+    def test_ties_fall_to_the_next_key_then_store_order(self):
+        self.assertEqual(tickers(screen(self.store, sort=[('change_1m', True)])), ['CCJ', 'PDN.AX', 'UEC', 'NXE.TO', 'KAP.IL'])
+        self.assertEqual(
+            tickers(screen(self.store, sort=[('change_1m', True), ('pe_ratio', False)])),
+            ['PDN.AX', 'CCJ', 'UEC', 'NXE.TO', 'KAP.IL'],
+        )
+
+    def test_text_sorts(self):
+        self.assertEqual(tickers(screen(self.store, sort=[('ticker', True)])), ['UEC', 'PDN.AX', 'NXE.TO', 'KAP.IL', 'CCJ'])
+        self.assertEqual(
+            tickers(screen(self.store, sort=[('country_name', False), ('name', True)])),
+            ['PDN.AX', 'NXE.TO', 'CCJ', 'KAP.IL', 'UEC'],
+        )
+
+    def test_paging(self):
+        pages = [screen(self.store, sort=[('ticker', False)], page=page, page_size=2) for page in (1, 2, 3)]
+        self.assertEqual([tickers(page) for page in pages], [['CCJ', 'KAP.IL'], ['NXE.TO', 'PDN.AX'], ['UEC']])
+        self.assertTrue(all(page['total'] == 5 and page['pages'] == 3 for page in pages))
+
+    def test_paging_past_the_end(self):
+        result = screen(self.store, page=4, page_size=2)
+        self.assertEqual(result['results'], [])
+        self.assertEqual((result['total'], result['page'], result['pages']), (5, 4, 3))
+
+    def test_nothing_matches(self):
+        result = screen(self.store, filters=[parse_filter('pe_ratio>100')])
+        self.assertEqual((result['total'], result['pages'], result['results']), (0, 0, []))
+
+
+class StockScreenerViewTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(URANIUM_SNAPSHOT_DIR=self.tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for patch in (mock.patch.object(snapshot, '_current', None), mock.patch.object(tasks, '_stock_store', (None, None))):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def get(self, query=''):
+        request = APIRequestFactory().get(f'/stocks/screener/?{query}')
+        return StockScreenerAPIView.as_view()(request)
+
+    def test_unavailable_before_the_first_publish(self):
+        self.assertEqual(self.get().status_code, 503)
+
+    def test_screens_the_published_stocks(self):
+        snapshot.publish({'stocks': {'stocks': STOCKS}}, derive=tasks.derive_snapshot)
+        response = self.get('filter=pe_ratio<25&sort=pe_ratio&page_size=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(tickers(response.data), ['KAP.IL', 'PDN.AX'])
+        self.assertEqual((response.data['total'], response.data['pages']), (3, 2))
+
+    def test_bad_screens(self):
+        snapshot.publish({'stocks': {'stocks': STOCKS}}, derive=tasks.derive_snapshot)
+        for query in ('filter=pe_ratio<low', 'filter=name=Cameco', 'sort=dates', 'page=0'):
+            with self.subTest(query=query):
+                response = self.get(query)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('message', response.data)
@@ -0,0 +1,95 @@
+# uranium_project\uranium_app\tests\test_single_flight.py
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from uranium_app.single_flight import SingleFlight, single_flight, single_flight_stats, update_cached
+
+
+def _add_ones(key, count):
+    for _ in range(count):
+        update_cached(key, lambda value: value + 1, 0)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            URANIUM_LOCK_DIR=os.path.join(self.tmp.name, 'locks'),
+            CACHES={'default': {
+                'BACKEND': 'uranium_app.sqlite_cache.SQLiteCache',
+                'LOCATION': os.path.join(self.tmp.name, 'cache.sqlite3'),
+            }},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_only_one_holder_at_a_time(self):
+        first, second = SingleFlight('source'), SingleFlight('source')
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        second.release()
+
+    def test_names_lock_independently(self):
+        first, other = SingleFlight('source'), SingleFlight('other')
+        self.assertTrue(first.acquire())
+        self.assertTrue(other.acquire())
+        other.release()
+        first.release()
+
+    def test_context_manager_yields_whether_it_acquired(self):
+        with single_flight('source') as acquired:
+            self.assertTrue(acquired)
+            with single_flight('source') as again:
+                self.assertFalse(again)
+        # Released on the way out
+        with single_flight('source') as acquired:
+            self.assertTrue(acquired)
+
+    def test_context_manager_releases_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with single_flight('source'):
+                raise RuntimeError
+        with single_flight('source') as acquired:
+            self.assertTrue(acquired)
+
+    def test_stats_count_acquisitions_and_contention(self):
+        with single_flight('source'):
+            with single_flight('source'):
+                pass
+        with single_flight('source'):
+            pass
+        stats = single_flight_stats()['source']
+        self.assertEqual(stats['acquired'], 2)
+        self.assertEqual(stats['contended'], 1)
+        self.assertIsNotNone(stats['last_contended'])
+        self.assertGreaterEqual(stats['max_hold_seconds'], 0)
+
+    def test_update_cached_starts_from_the_default(self):
+        self.assertEqual(update_cached('counter', lambda value: value + [1], []), [1])
+        self.assertEqual(update_cached('counter', lambda value: value + [2], []), [1, 2])
+        self.assertEqual(cache.get('counter'), [1, 2])
+
+    def test_update_cached_returns_none_when_the_update_fails(self):
+        with self.assertLogs('uranium_app', level='WARNING'):
+            self.assertIsNone(update_cached('counter', lambda value: value['missing'], {}))
+        self.assertIsNone(cache.get('counter'))
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'needs fork to share the overridden settings')
+    def test_update_cached_keeps_every_process_update(self):
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=_add_ones, args=('counter', 20)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(cache.get('counter'), 80)
@@ -0,0 +1,155 @@
+# uranium_project\uranium_app\tests\test_snapshot.py
+
+import gzip
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from uranium_app import snapshot
+from uranium_app.snapshot import KEEP_VERSIONS, SnapshotView, current_snapshot, current_version, publish
+
+
+class SnapshotTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(URANIUM_SNAPSHOT_DIR=self.tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Each test publishes into its own directory, so the process-wide mapping starts empty
+        patch = mock.patch.object(snapshot, '_current', None)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.now = 1000.0
+        clock = mock.patch('uranium_app.snapshot.time.time', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def snapshot_files(self):
+        return sorted(name for name in os.listdir(self.tmp.name) if name.endswith('.snap'))
+
+    def test_nothing_published(self):
+        self.assertIsNone(current_version())
+        self.assertIsNone(current_snapshot())
+
+    def test_publish_then_read(self):
+        version = publish({'prices': {'spot_price': {'price': 80.5}, 'news': ['a']}})
+        data = current_snapshot()
+        self.assertEqual(version, 1)
+        self.assertEqual(data.version, 1)
+        self.assertEqual(data['spot_price'], {'price': 80.5})
+        self.assertEqual(data['news'], ['a'])
+        self.assertEqual(data.source_of('news'), 'prices')
+        self.assertEqual(data.saved_at, {'prices': 1000.0})
+        self.assertNotIn('missing', data)
+
+    def test_publishing_a_source_keeps_the_others(self):
+        publish({'prices': {'spot_price': 80.5}, 'news': {'news': ['a']}})
+        self.now += 60
+        publish({'prices': {'spot_price': 81.0}})
+        data = current_snapshot()
+        self.assertEqual(data.version, 2)
+        self.assertEqual(data['spot_price'], 81.0)
+        self.assertEqual(data['news'], ['a'])
+        self.assertEqual(data.saved_at, {'prices': 1060.0, 'news': 1000.0})
+
+    def test_republishing_a_source_drops_keys_it_no_longer_provides(self):
+        publish({'prices': {'spot_price': 80.5, 'futures': [1]}})
+        publish({'prices': {'spot_price': 81.0}})
+        self.assertNotIn('futures', current_snapshot())
+
+    def test_old_versions_are_pruned(self):
+        for price in range(KEEP_VERSIONS + 3):
+            publish({'prices': {'spot_price': price}})
+        self.assertEqual(current_version(), KEEP_VERSIONS + 3)
+        self.assertEqual(
+            self.snapshot_files(),
+            [f'uranium-{version:012d}.snap' for version in range(4, KEEP_VERSIONS + 4)],
+        )
+
+    def test_readers_of_a_pruned_version_keep_their_mapping(self):
+        publish({'prices': {'spot_price': 1}})
+        first = current_snapshot()
+        for price in range(2, KEEP_VERSIONS + 3):
+            publish({'prices': {'spot_price': price}})
+        self.assertNotIn(os.path.basename(first.path), self.snapshot_files())
+        self.assertEqual(first['spot_price'], 1)
+        self.assertEqual(current_snapshot()['spot_price'], KEEP_VERSIONS + 2)
+
+    def test_derived_payloads_keep_their_etag_while_unchanged(self):
+        def derive(data):
+            return {'prices': (200, f'{{"spot": {data["spot_price"]}}}'.encode())}, {}
+
+        publish({'prices': {'spot_price': 80.5, 'updated': 1}}, derive=derive)
+        first = current_snapshot().payload('prices')
+        self.now += 60
+        publish({'prices': {'spot_price': 80.5, 'updated': 2}}, derive=derive)
+        unchanged = current_snapshot().payload('prices')
+        self.now += 60
+        publish({'prices': {'spot_price': 81.0, 'updated': 3}}, derive=derive)
+        changed = current_snapshot().payload('prices')
+
+        self.assertEqual(first[:2], (200, b'{"spot": 80.5}'))
+        self.assertEqual(unchanged[2:], first[2:])
+        self.assertEqual(unchanged[3], 1000.0)
+        self.assertNotEqual(changed[2], first[2])
+        self.assertEqual(changed[3], 1120.0)
+
+    def test_payloads_are_stored_only_in_encodings_that_shrink_them(self):
+        body = b'{"prices": [' + b'80.5, ' * 200 + b'80.5]}'
+
+        def derive(data):
+            return {'big': (200, body), 'small': (200, b'{}')}, {}
+
+        publish({'prices': {'spot_price': 80.5}}, derive=derive, encoders={'gzip': gzip.compress})
+        data = current_snapshot()
+        self.assertEqual(data.payload_encodings('big'), ['gzip'])
+        self.assertEqual(gzip.decompress(data.payload('big', 'gzip')[1]), body)
+        self.assertEqual(data.payload_encodings('small'), [])
+        self.assertIsNone(data.payload('small', 'gzip'))
+        self.assertIsNone(data.payload('missing'))
+
+    def test_unchanged_payloads_reuse_their_compressed_bodies(self):
+        encode = mock.Mock(side_effect=gzip.compress)
+
+        def derive(data):
+            return {'big': (200, b'80.5, ' * 200)}, {}
+
+        publish({'prices': {'spot_price': 80.5}}, derive=derive, encoders={'gzip': encode})
+        publish({'prices': {'spot_price': 80.5}}, derive=derive, encoders={'gzip': encode})
+        self.assertEqual(encode.call_count, 1)
+        self.assertEqual(current_snapshot().payload_encodings('big'), ['gzip'])
+
+    def test_arrays_round_trip_read_only_and_aligned(self):
+        closes = np.array([[50.1, np.nan], [1.5, 2.5]])
+        symbols = np.array(['AAA', 'BB.TO'])
+
+        def derive(data):
+            return {}, {'stocks/closes': closes, 'stocks/symbols': symbols, 'other': np.arange(3, dtype=np.int8)}
+
+        publish({'stocks': {'stocks': {}}}, derive=derive)
+        arrays = current_snapshot().arrays('stocks/')
+        self.assertEqual(set(arrays), {'closes', 'symbols'})
+        np.testing.assert_array_equal(arrays['closes'], closes)
+        np.testing.assert_array_equal(arrays['symbols'], symbols)
+        self.assertFalse(arrays['closes'].flags.writeable)
+        self.assertEqual(arrays['closes'].ctypes.data % snapshot.ARRAY_ALIGNMENT, 0)
+
+    def test_view_defaults_and_local_changes(self):
+        publish({'prices': {'spot_price': {'price': 80.5}}})
+        data = current_snapshot()
+        view = SnapshotView(data, defaults={'news': [], 'spot_price': None})
+        self.assertEqual(view['news'], [])
+        self.assertEqual(view['spot_price'], {'price': 80.5})
+
+        view['spot_price']['price'] = 0
+        view['extra'] = 1
+        del view['news']
+        self.assertEqual(view['spot_price'], {'price': 0})
+        self.assertEqual(data['spot_price'], {'price': 80.5})
+        self.assertEqual(set(view), {'spot_price', 'extra'})
+        self.assertNotIn('news', view)
+        self.assertEqual(SnapshotView(data, defaults={'news': []})['news'], [])
@@ -0,0 +1,151 @@
+# uranium_project\uranium_app\tests\test_sqlite_cache.py
+
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from uranium_app.sqlite_cache import COMPRESSED, RAW, SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 1000.0
+        clock = mock.patch('uranium_app.sqlite_cache.time.time', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        # BaseCache works out expiry times from the same clock
+        base_clock = mock.patch('django.core.cache.backends.base.time.time', side_effect=lambda: self.now)
+        base_clock.start()
+        self.addCleanup(base_clock.stop)
+
+    def make_cache(self, **options):
+        return SQLiteCache(os.path.join(self.tmp.name, 'cache.sqlite3'), {'OPTIONS': options})
+
+    def test_round_trip(self):
+        cache = self.make_cache()
+        cache.set('key', {'a': [1, 2]})
+        self.assertEqual(cache.get('key'), {'a': [1, 2]})
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+
+    def test_entries_are_shared_between_instances(self):
+        self.make_cache().set('key', 'value')
+        self.assertEqual(self.make_cache().get('key'), 'value')
+
+    def test_expired_entries_read_as_missing(self):
+        cache = self.make_cache()
+        cache.set('key', 'value', timeout=10)
+        self.now += 9
+        self.assertTrue(cache.has_key('key'))
+        self.now += 2
+        self.assertIsNone(cache.get('key'))
+        self.assertFalse(cache.has_key('key'))
+        self.assertEqual(cache.get_many(['key']), {})
+
+    def test_add_only_replaces_expired_entries(self):
+        cache = self.make_cache()
+        self.assertTrue(cache.add('key', 'first', timeout=10))
+        self.assertFalse(cache.add('key', 'second', timeout=10))
+        self.assertEqual(cache.get('key'), 'first')
+        self.now += 11
+        self.assertTrue(cache.add('key', 'third', timeout=10))
+        self.assertEqual(cache.get('key'), 'third')
+
+    def test_touch_extends_live_entries_only(self):
+        cache = self.make_cache()
+        cache.set('key', 'value', timeout=10)
+        self.assertTrue(cache.touch('key', timeout=100))
+        self.now += 50
+        self.assertEqual(cache.get('key'), 'value')
+        self.now += 100
+        self.assertFalse(cache.touch('key', timeout=100))
+
+    def test_no_timeout_never_expires(self):
+        cache = self.make_cache()
+        cache.set('key', 'value', timeout=None)
+        self.now += 10 ** 9
+        self.assertEqual(cache.get('key'), 'value')
+
+    def test_large_values_are_compressed(self):
+        cache = self.make_cache(COMPRESS_MIN_BYTES=100)
+        self.assertEqual(cache._encode('x' * 1000)[:1], COMPRESSED)
+        self.assertEqual(cache._encode('x')[:1], RAW)
+        cache.set('key', 'x' * 1000)
+        self.assertEqual(cache.get('key'), 'x' * 1000)
+
+    def test_many_operations(self):
+        cache = self.make_cache()
+        cache.set_many({'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(cache.get_many(['a', 'b', 'missing']), {'a': 1, 'b': 2})
+        cache.delete_many(['a', 'b'])
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'c': 3})
+        self.assertTrue(cache.delete('c'))
+        self.assertFalse(cache.delete('c'))
+
+    def test_undecodable_values_read_as_missing(self):
+        cache = self.make_cache()
+        key = cache.make_and_validate_key('key')
+        cache._db.execute(
+            'INSERT INTO cache (key, value, expires, size, stored) VALUES (?, ?, NULL, 1, 0)', (key, RAW + b'not a pickle')
+        )
+        self.assertEqual(cache.get('key', 'default'), 'default')
+
+    def filled_cache(self, entries, live):
+        # Sized so that after expired entries go, live entries of the same size are
+        # half an entry over the limit and culling back to 90% of it frees one entry
+        probe = self.make_cache()
+        probe.set('probe', self.value)
+        entry_size = probe.stats()['bytes']
+        probe.delete('probe')
+        cache = self.make_cache(MAX_SIZE_BYTES=int(entry_size * (live - 0.5)), CULL_EVERY=1000)
+        for key, timeout in entries:
+            cache.set(key, self.value, timeout=timeout)
+            self.now += 1
+        return cache
+
+    def test_cull_drops_expired_entries_then_the_soonest_to_expire(self):
+        self.value = os.urandom(900)
+        keys = ['expired', 'forever', 'expires_soon', 'expires_late']
+        cache = self.filled_cache(zip(keys, [2, None, 100, 1000]), live=3)
+        self.now += 10
+
+        cache._cull()
+
+        self.assertEqual(set(cache.get_many(keys)), {'forever', 'expires_late'})
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_size * 0.9)
+
+    def test_cull_drops_the_oldest_entry_without_expiry(self):
+        self.value = os.urandom(900)
+        keys = ['oldest', 'middle', 'newest']
+        cache = self.filled_cache(((key, None) for key in keys), live=3)
+
+        cache._cull()
+
+        self.assertEqual(set(cache.get_many(keys)), {'middle', 'newest'})
+
+    def test_cull_leaves_a_cache_under_the_limit_alone(self):
+        cache = self.make_cache(MAX_SIZE_BYTES=10 ** 6)
+        cache.set('a', 1)
+        cache._cull()
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_cull_runs_every_cull_every_writes(self):
+        cache = self.make_cache(CULL_EVERY=3)
+        with mock.patch.object(cache, '_cull') as cull:
+            cache.set('a', 1)
+            cache.set('b', 2)
+            cull.assert_not_called()
+            cache.set('c', 3)
+            cull.assert_called_once()
+
+    def test_stats(self):
+        cache = self.make_cache(MAX_SIZE_BYTES=1234)
+        cache.set('a', 1)
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertGreater(stats['bytes'], 0)
+        self.assertEqual(stats['max_bytes'], 1234)
@@ -0,0 +1,155 @@
+# uranium_project\uranium_app\tests\test_stock_store.py
+
+import json
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from uranium_app.stock_store import NUMERIC_FIELDS, StockStore, descending, to_float_array
+from uranium_app.tasks import derive_snapshot
+
+
+STOCKS = {
+    'CCJ': {
+        'name': 'Cameco', 'current_price': 50.1, 'last_price': 49.5, 'change_1m': 5.0, 'change_1y': 20.0,
+        'volume': 1000, 'market_cap': 2e10, 'pe_ratio': 30.0, 'country_name': 'Canada',
+        'dates': ['2024-01-01', '2024-01-02', '2024-01-03'], 'data': [48.0, 49.5, 50.1],
+    },
+    'NXE.TO': {
+        'name': 'NexGen', 'current_price': '7.25', 'last_price': 'N/A', 'change_1m': -3.0, 'change_1y': 'N/A',
+        'volume': 500, 'market_cap': 'N/A', 'pe_ratio': None, 'country_name': 'Canada',
+        # A day the others have no close for, and one close short of its dates
+        'dates': ['2024-01-02', '2024-01-04', '2024-01-05'], 'data': [7.0, 7.5],
+    },
+    'PDN.AX': {
+        'name': 'Paladin', 'current_price': 10.0, 'last_price': 9.0, 'change_1m': 5.0, 'change_1y': -10.0,
+        'volume': 'N/A', 'market_cap': 3e9, 'pe_ratio': 15.0, 'country_name': 'Australia',
+        'dates': ['2024-01-03'], 'data': [10.0],
+    },
+    'EMPTY': {},
+    'BROKEN': 'not a record',
+}
+
+
+class StockStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.store = StockStore.from_stocks(STOCKS)
+
+    def test_to_float_array_reads_missing_values_as_nan(self):
+        np.testing.assert_array_equal(to_float_array([1, '2.5', 'N/A', None, {}]), [1.0, 2.5, np.nan, np.nan, np.nan])
+
+    def test_descending_skips_nan_and_keeps_ties_in_order(self):
+        self.assertEqual(descending(np.array([1.0, np.nan, 3.0, 1.0, 3.0])).tolist(), [2, 4, 0, 3])
+
+    def test_from_stocks_skips_records_that_are_not_dicts(self):
+        self.assertEqual(self.store.symbols.tolist(), ['CCJ', 'NXE.TO', 'PDN.AX', 'EMPTY'])
+        self.assertEqual(self.store.row('PDN.AX'), 2)
+        self.assertTrue(np.isnan(self.store.column('current_price')[3]))
+
+    def test_columns_hold_nan_for_missing_numbers(self):
+        np.testing.assert_array_equal(self.store.column('current_price'), [50.1, 7.25, 10.0, np.nan])
+        np.testing.assert_array_equal(self.store.column('market_cap'), [2e10, np.nan, 3e9, np.nan])
+        self.assertEqual(self.store.column('country_name').tolist(), ['Canada', 'Canada', 'Australia', ''])
+
+    def test_closes_share_one_date_index(self):
+        self.assertEqual(
+            np.datetime_as_string(self.store.dates).tolist(),
+            ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04'],
+        )
+        np.testing.assert_array_equal(self.store.closes, [
+            [48.0, 49.5, 50.1, np.nan],
+            [np.nan, 7.0, np.nan, 7.5],
+            [np.nan, np.nan, 10.0, np.nan],
+            [np.nan, np.nan, np.nan, np.nan],
+        ])
+
+    def test_history_comes_back_exactly(self):
+        self.assertEqual(self.store.history(0), (['2024-01-01', '2024-01-02', '2024-01-03'], [48.0, 49.5, 50.1]))
+        self.assertEqual(self.store.history(3), ([], []))
+
+    def test_record(self):
+        record = self.store.record(1, history=True)
+        self.assertEqual(record['name'], 'NexGen')
+        self.assertEqual(record['current_price'], 7.25)
+        self.assertIsNone(record['last_price'])
+        self.assertEqual(record['dates'], ['2024-01-02', '2024-01-04'])
+        self.assertEqual(record['data'], [7.0, 7.5])
+        self.assertEqual(self.store.record(3), {'name': None, **dict.fromkeys(NUMERIC_FIELDS), 'country_name': None})
+
+    def test_from_stocks_can_leave_out_history_and_fields(self):
+        store = StockStore.from_stocks(STOCKS, history=False, fields=['change_1m'])
+        self.assertEqual(set(store.columns), {'change_1m'})
+        self.assertEqual(store.closes.shape, (4, 0))
+
+    def test_arrays_round_trip(self):
+        arrays = self.store.to_arrays()
+        self.assertIn('order.pe_ratio', arrays)
+        store = StockStore.from_arrays(arrays)
+        self.assertEqual(store.symbols.tolist(), self.store.symbols.tolist())
+        np.testing.assert_array_equal(store.closes, self.store.closes)
+        for field in self.store.columns:
+            np.testing.assert_array_equal(store.column(field), self.store.column(field))
+        self.assertIs(store.sorted_index('pe_ratio'), arrays['order.pe_ratio'])
+        self.assertEqual(store.record(0, history=True), self.store.record(0, history=True))
+
+    def test_last_closes_with_ragged_histories(self):
+        np.testing.assert_array_equal(self.store.last_closes(2), [
+            [49.5, 50.1],
+            [7.0, 7.5],
+            [np.nan, 10.0],
+            [np.nan, np.nan],
+        ])
+        np.testing.assert_array_equal(self.store.last_closes(5)[0], [np.nan, np.nan, 48.0, 49.5, 50.1])
+
+    def test_change_1d(self):
+        change = self.store.change_1d()
+        self.assertAlmostEqual(change[0], (50.1 - 49.5) / 49.5 * 100)
+        self.assertAlmostEqual(change[1], (7.5 - 7.0) / 7.0 * 100)
+        self.assertTrue(np.isnan(change[2:]).all())
+
+    def test_no_history_gives_nan_closes(self):
+        # A stocks source with no data/dates used to raise IndexError here
+        store = StockStore.from_stocks({symbol: {'current_price': 1.0} for symbol in ('A', 'B')})
+        self.assertEqual(store.last_closes(2).shape, (2, 2))
+        self.assertTrue(np.isnan(store.last_closes(2)).all())
+        self.assertTrue(np.isnan(store.change_1d()).all())
+
+    def test_home_payload_builds_without_any_history(self):
+        payloads, arrays = derive_snapshot({'stocks': {'A': {'current_price': 1.0, 'volume': 10}, 'B': {}}})
+        status, body = payloads['home']
+        self.assertEqual(status, 200)
+        self.assertIsNone(json.loads(body)['uranium_data']['stocks']['A']['change_1d'])
+        self.assertEqual(arrays['stocks/closes'].shape, (2, 0))
+
+    def test_empty_store(self):
+        store = StockStore.from_stocks({})
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.last_closes(2).shape, (0, 2))
+        self.assertEqual(store.range_rows('pe_ratio', 0).tolist(), [])
+        self.assertEqual(store.exchanges.tolist(), [])
+
+    def test_sorted_index_leaves_out_missing_values(self):
+        self.assertEqual(self.store.sorted_index('change_1m').tolist(), [1, 0, 2])
+        self.assertEqual(self.store.sorted_index('pe_ratio').tolist(), [2, 0])
+
+    def test_range_rows(self):
+        def values(low=None, high=None, **kwargs):
+            rows = self.store.range_rows('change_1m', low, high, **kwargs)
+            return sorted(self.store.symbols[rows].tolist())
+
+        self.assertEqual(values(5.0, 5.0), ['CCJ', 'PDN.AX'])
+        self.assertEqual(values(-3.0, 5.0, include_high=False), ['NXE.TO'])
+        self.assertEqual(values(-3.0, 5.0, include_low=False), ['CCJ', 'PDN.AX'])
+        self.assertEqual(values(5.0, 5.0, include_low=False), [])
+        self.assertEqual(values(high=0), ['NXE.TO'])
+        self.assertEqual(values(low=0), ['CCJ', 'PDN.AX'])
+        self.assertEqual(values(), ['CCJ', 'NXE.TO', 'PDN.AX'])
+        self.assertEqual(values(10, -10), [])
+
+    def test_exchanges(self):
+        self.assertEqual(self.store.exchanges.tolist(), ['', 'TO', 'AX', ''])
+
+    def test_rows_matching_ignores_case(self):
+        self.assertEqual(self.store.rows_matching('country_name', ['canada']).tolist(), [True, True, False, False])
+        self.assertEqual(self.store.rows_matching('exchange', ['ax', 'to']).tolist(), [False, True, True, False])
+        self.assertEqual(self.store.rows_matching('country_name', ['Kazakhstan']).tolist(), [False] * 4)
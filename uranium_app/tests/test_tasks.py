@@ -0,0 +1,119 @@
+# uranium_project\uranium_app\tests\test_tasks.py
+
+import os
+import tempfile
+from unittest import mock
+
+import pandas as pd
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from uranium_app import snapshot, tasks
+from uranium_app.circuit_breaker import CircuitBreaker
+from uranium_app.snapshot import current_snapshot
+
+
+GOOD_STOCKS = {
+    'CCJ': {'name': 'Cameco', 'current_price': 50.1, 'dates': ['2024-01-01'], 'data': [50.1]},
+    'UEC': {'name': 'Uranium Energy', 'current_price': 7.5, 'dates': ['2024-01-01'], 'data': [7.5]},
+}
+# What fetch_uranium_stocks returns when the download fails for every symbol
+FAILED_STOCKS = {'CCJ': {}, 'UEC': {}}
+
+
+class TaskTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            URANIUM_SNAPSHOT_DIR=os.path.join(self.tmp.name, 'snapshots'),
+            URANIUM_LOCK_DIR=os.path.join(self.tmp.name, 'locks'),
+            URANIUM_ISOLATED_SOURCES=[],
+            CACHES={'default': {
+                'BACKEND': 'uranium_app.sqlite_cache.SQLiteCache',
+                'LOCATION': os.path.join(self.tmp.name, 'cache.sqlite3'),
+            }},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patch = mock.patch.object(snapshot, '_current', None)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+
+class PublishSourcesTests(TaskTestCase):
+    def refresh_stocks(self, stocks):
+        with mock.patch.dict(tasks.URANIUM_SOURCES['stocks'], fetch=lambda: stocks):
+            return tasks.refresh_source('stocks')
+
+    def test_publishes_a_complete_result(self):
+        self.assertEqual(tasks.publish_sources({'stocks': GOOD_STOCKS}), ['stocks'])
+        self.assertEqual(current_snapshot()['stocks'], GOOD_STOCKS)
+
+    def test_keeps_the_last_good_stocks_when_every_symbol_fails(self):
+        tasks.publish_sources({'stocks': GOOD_STOCKS})
+        version = current_snapshot().version
+
+        with self.assertLogs('uranium_app', level='WARNING'):
+            self.assertEqual(tasks.publish_sources({'stocks': FAILED_STOCKS}), [])
+        self.assertEqual(current_snapshot().version, version)
+        self.assertEqual(current_snapshot()['stocks'], GOOD_STOCKS)
+
+    def test_incomplete_sources_are_dropped_from_a_full_refresh(self):
+        published = tasks.publish_sources({
+            'stocks': FAILED_STOCKS,
+            'stock_news': [{'title': 'News'}],
+            'iaea_news': [],
+            'calendar': {'error': 'timed out'},
+        })
+        self.assertEqual(published, ['stock_news'])
+        self.assertNotIn('stocks', current_snapshot())
+
+    def test_refresh_counts_a_failed_stocks_download_against_the_breaker(self):
+        self.assertTrue(self.refresh_stocks(GOOD_STOCKS))
+        version = current_snapshot().version
+
+        with override_settings(URANIUM_BREAKER_FAILURES=1):
+            self.assertFalse(self.refresh_stocks(FAILED_STOCKS))
+            self.assertEqual(CircuitBreaker('stocks').state, 'open')
+        self.assertEqual(current_snapshot().version, version)
+        self.assertEqual(current_snapshot()['stocks'], GOOD_STOCKS)
+
+
+class FetchUraniumStocksTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        patch = mock.patch.object(tasks, 'get_uranium_stocks', return_value=['CCJ', 'UEC'])
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def fetch_batched(self, quotes):
+        with mock.patch.object(tasks, 'fetch_stock_histories', return_value=quotes) as histories, \
+                mock.patch.object(tasks, 'fetch_stocks_batched', return_value={}):
+            tasks.fetch_uranium_stocks(batched=True)
+        return histories
+
+    def test_batched_quotes_are_cached(self):
+        quotes = {'CCJ': pd.DataFrame({'Close': [50.1], 'Volume': [1000]}), 'UEC': pd.DataFrame(columns=['Close', 'Volume'])}
+        self.fetch_batched(quotes)
+        self.assertEqual(set(cache.get(tasks.STOCK_QUOTES_CACHE_KEY)), {'CCJ', 'UEC'})
+        self.assertFalse(self.fetch_batched(quotes).called)
+
+    def test_failed_batched_download_is_not_cached(self):
+        for quotes in ({}, {'CCJ': pd.DataFrame(columns=['Close', 'Volume'])}):
+            with self.subTest(quotes=quotes):
+                self.fetch_batched(quotes)
+                self.assertIsNone(cache.get(tasks.STOCK_QUOTES_CACHE_KEY))
+        self.assertTrue(self.fetch_batched({}).called)
+
+    def test_per_symbol_records_are_cached(self):
+        with mock.patch.object(tasks, 'fetch_single_stock', side_effect=lambda symbol, session: (symbol, GOOD_STOCKS[symbol])):
+            tasks.fetch_uranium_stocks(batched=False)
+        self.assertEqual(cache.get(tasks.STOCK_DATA_CACHE_KEY), GOOD_STOCKS)
+
+    def test_failed_per_symbol_download_is_not_cached(self):
+        with mock.patch.object(tasks, 'fetch_single_stock', side_effect=lambda symbol, session: (symbol, {})) as fetch:
+            self.assertEqual(tasks.fetch_uranium_stocks(batched=False), FAILED_STOCKS)
+            self.assertIsNone(cache.get(tasks.STOCK_DATA_CACHE_KEY))
+            tasks.fetch_uranium_stocks(batched=False)
+        self.assertEqual(fetch.call_count, 4)
@@ -9,6 +9,7 @@ from .views import (
     WorldNuclearDataAPIView,
     StocksAPIView,
     GetTopPerformingStocksAPIView,
+    StockScreenerAPIView,
     AboutAPIView,
     GlossaryAPIView,
     EssentialsView,
@@ -46,6 +47,7 @@ urlpatterns = [
     path('nuclear-data/', WorldNuclearDataAPIView.as_view(), name='nuclear_data'),
     path('stocks/', StocksAPIView.as_view(), name='stocks'),
     path('stocks/top-performing/', GetTopPerformingStocksAPIView.as_view(), name='top_performing_stocks'),
+    path('stocks/screener/', StockScreenerAPIView.as_view(), name='stock_screener'),
     path('about/', AboutAPIView.as_view(), name='about'),
     path('glossary/', GlossaryAPIView.as_view(), name='glossary'),
     path('essentials/', EssentialsView.as_view(), name='essentials'),
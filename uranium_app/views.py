@@ -21,11 +21,13 @@ from django.core.files.storage import default_storage
 from django.core.mail import send_mail
 from django.core.cache import cache
 from django.db.models import Q
-from django.http import Http404
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from django.utils.html import strip_tags
+from django.utils.http import http_date
 from django.views import generic
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods, require_POST
@@ -44,143 +46,77 @@ from goose3 import Goose
 from .forms import ForumPostForm, ForumCommentForm, EmailSubscriptionForm
 from .glossary_terms import GLOSSARY_TERMS
 from .models import UraniumPrice, NewsArticle, Stock, ForumPost, ForumComment, EmailSubscription
+from .payloads import parse_fields
+from .screener import InvalidScreen, screen, screen_options
+from .scoring import DEFAULT_TOP_K, DEFAULT_WEIGHTS, InvalidScoring, score_stocks, scoring_options
 from .serializers import RegisterSerializer
-from .tasks import fetch_uranium_data_sync, get_article_content, fetch_stock_news, fetch_iaea_news
+from .stock_store import StockStore
+from .tasks import fetch_uranium_data_sync, get_article_content, fetch_stock_news, fetch_iaea_news, empty_payload, uranium_payload, current_stock_store
 from .utils import search_youtube_videos
 
 
 logger = logging.getLogger('uranium_app')
 
-class HomeAPIView(APIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            logger.info("Fetching uranium data...")
-            uranium_data = fetch_uranium_data_sync()
-            logger.info("Uranium data fetched successfully")
-
-            if uranium_data is None:
-                logger.warning("Uranium data is None")
-                return Response({'message': 'Unable to fetch uranium data at this time.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            spot_price = uranium_data.get('spot_price', 'N/A')
-            logger.info(f"Spot price: {spot_price}")
 
-            if 'chart_data' in uranium_data:
-                uranium_data['chart_data'] = self.prepare_chart_data(uranium_data['chart_data'])
+def request_payload(request, name):
+    """
+    The stored payload for a request.
 
-            stocks = uranium_data.get('stocks', {})
-            
-            if stocks is None:
-                stocks = {}
-            logger.info(f"Number of stocks fetched: {len(stocks)}")
-
-            for symbol, stock_data in stocks.items():
-                try:
-                    if 'data' in stock_data and len(stock_data['data']) >= 2:
-                        current_price = float(stock_data['data'][-1])
-                        previous_price = float(stock_data['data'][-2])
-                        change_1d = ((current_price - previous_price) / previous_price) * 100
-                        stock_data['change_1d'] = change_1d
-                    else:
-                        stock_data['change_1d'] = None
-
-                    for key in ['current_price', 'last_price', 'change_1m', 'change_1y', 'volume', 'market_cap']:
-                        if isinstance(stock_data.get(key), str):
-                            try:
-                                stock_data[key] = float(stock_data[key])
-                            except ValueError:
-                                stock_data[key] = None
-                except Exception as e:
-                    logger.error(f"Error processing stock data for {symbol}: {str(e)}")
-                    stock_data['change_1d'] = None
-
-            most_followed_stocks = sorted(
-                [(symbol, data) for symbol, data in stocks.items() if data.get('volume') is not None],
-                key=lambda x: x[1]['volume'],
-                reverse=True
-            )[:5]
-            logger.info(f"Number of most followed stocks: {len(most_followed_stocks)}")
-
-            sorted_stocks = sorted(
-                [(symbol, data) for symbol, data in stocks.items() if data.get('change_1d') is not None],
-                key=lambda x: x[1]['change_1d'],
-                reverse=True
-            )
-            logger.info(f"Number of sorted stocks: {len(sorted_stocks)}")
+    ?include=history adds heavier parts left out by default, ?fields=a,b.c
+    keeps only the named sub-trees and columns, and otherwise the content
+    coding Accept-Encoding prefers is sent.
+    """
+    return uranium_payload(
+        name,
+        request.META.get('HTTP_ACCEPT_ENCODING', ''),
+        fields=parse_fields(request.GET.get('fields', '')),
+        include=parse_fields(request.GET.get('include', '')),
+    )
 
-            top_gainers = sorted_stocks[:8]
-            top_losers = sorted_stocks[-8:][::-1]
-            logger.info(f"Number of top gainers: {len(top_gainers)}")
-            logger.info(f"Number of top losers: {len(top_losers)}")
 
-            stock_datas = []
-            for ticker, info in stocks.items():
-                stock_datas.append({
-                    "ticker": "  " + ticker,
-                    "current_price": info.get("current_price", None),
-                    "change_1m": info.get("change_1m", None),
-                })
+def payload_response(request, payload):
+    """
+    Send a pre-rendered payload as it is, or 304 Not Modified when the client's copy is current.
 
-            mining_tech_news = uranium_data.get('mining_technology_com_news', [])
-            featured_news = mining_tech_news[:2] if mining_tech_news else None
-            stock_news_data = uranium_data.get("stock_news")[:4]
+    The body goes out already compressed when the payload was picked in a
+    compressed coding. ETag and Last-Modified come from the snapshot the
+    payload was rendered into, and Cache-Control lets clients reuse it until
+    its sources are next due for a refresh.
+    """
+    response = HttpResponse(payload.body, status=payload.status, content_type='application/json')
+    if payload.encoding != 'identity':
+        response['Content-Encoding'] = payload.encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if payload.status != status.HTTP_200_OK:
+        return response
+
+    etag = f'"{payload.etag}"'
+    last_modified = int(payload.last_modified) if payload.last_modified else None
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=payload.max_age)
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
 
-            context = {
-                "uranium_data": uranium_data,
-                'uranium_spot_price': spot_price,
-                'most_followed_stocks': most_followed_stocks,
-                'top_gainers': top_gainers,
-                'top_losers': top_losers,
-                'stocks': stock_datas,
-                "stock_news": stock_news_data[:4],
-                "featured_news": featured_news
-            }
 
-            return Response(context, status=status.HTTP_200_OK)
+class HomeAPIView(APIView):
+    def get(self, request, *args, **kwargs):
+        try:
+            payload = request_payload(request, 'home')
+            if payload is None:
+                logger.warning("Uranium data is None")
+                return Response({'message': 'Unable to fetch uranium data at this time.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            return payload_response(request, payload)
 
         except Exception as e:
             logger.error(f"Error in home view: {str(e)}", exc_info=True)
             return Response({'message': 'An error occurred while fetching uranium data.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def prepare_chart_data(self, chart_data):
-        for chart_type in ['intraday', 'three_year']:
-            if chart_type in chart_data and 'svg' in chart_data[chart_type]:
-                chart_data[chart_type]['svg'] = chart_data[chart_type]['svg']
-        return json.dumps(chart_data)
-
 
 class NewsAPIView(APIView):
     def get(self, request, *args, **kwargs):
         try:
-            uranium_data = fetch_uranium_data_sync()
-
-            mining_tech_news = uranium_data.get('mining_technology_com_news', [])
-            inform_news = uranium_data.get('inform_kz_news', [])
-            mining_com_news = uranium_data.get('mining_com_news', [])
-            northern_miner_com_news = uranium_data.get('northern_miner_com_news', [])
-            world_nuclear_news_com = uranium_data.get('world_nuclear_news_com', [])
-            stock_news = uranium_data.get('stock_news', [])
-            iaea_news = uranium_data.get('iaea_news', [])
-
-            featured_news = mining_tech_news[0] if mining_tech_news else None
-
-            context = {
-                'featured_news': featured_news,
-                'latest_news': (
-                    mining_com_news[:3] +
-                    world_nuclear_news_com[:3] +
-                    mining_tech_news[:3] +
-                    iaea_news[:3]
-                ),
-                'global_uranium_news': (
-                    northern_miner_com_news[:2] +
-                    world_nuclear_news_com[3:6] +
-                    inform_news[:4]
-                ),
-                'stock_news': stock_news[:9]
-            }
-
-            return Response(context, status=status.HTTP_200_OK)
+            return payload_response(request, request_payload(request, 'news') or empty_payload('news'))
 
         except Exception as e:
             logger.error(f"Error in news view: {str(e)}")
@@ -190,7 +126,7 @@ class NewsAPIView(APIView):
 class NewsDetailAPIView(APIView):
     async def get(self, request, article_id, *args, **kwargs):
         try:
-            uranium_data = fetch_uranium_data_sync()
+            uranium_data = fetch_uranium_data_sync() or {}
             all_news = (
                 uranium_data.get('mining_technology_com_news', []) +
                 uranium_data.get('inform_kz_news', []) +
@@ -268,15 +204,7 @@ class NewsDetailAPIView(APIView):
 class CalDataAPIView(APIView):
     def get(self, request, *args, **kwargs):
         try:
-            uranium_data = fetch_uranium_data_sync()
-            calendar_html = uranium_data.get('calendar', {}).get('calendar_html', '')
-            event_data = uranium_data.get('calendar', {}).get('event_data', [])
-
-            context = {
-                'calendar_html': calendar_html,
-                'event_data': event_data
-            }
-            return Response(context, status=status.HTTP_200_OK)
+            return payload_response(request, request_payload(request, 'calendar') or empty_payload('calendar'))
 
         except Exception as e:
             logger.error(f"Error in cal_data view: {str(e)}", exc_info=True)
@@ -286,20 +214,7 @@ class CalDataAPIView(APIView):
 class WorldNuclearDataAPIView(APIView):
     def get(self, request, *args, **kwargs):
         try:
-            logger.info("Fetching uranium data for world_nuclear_data view")
-            uranium_data = fetch_uranium_data_sync()
-            logger.info("Uranium data fetched successfully")
-            
-            nuclear_data = uranium_data.get('nuclear_data', {})
-            
-            if not nuclear_data:
-                logger.warning("No nuclear data found in uranium_data")
-                return Response({'message': 'Failed to retrieve nuclear data.'}, status=status.HTTP_404_NOT_FOUND)
-            
-            logger.debug(f"Nuclear data: {json.dumps(nuclear_data, indent=2)}")
-            
-            context = {'data': nuclear_data}
-            return Response(context, status=status.HTTP_200_OK)
+            return payload_response(request, request_payload(request, 'nuclear_data') or empty_payload('nuclear_data'))
         
         except Exception as e:
             logger.error(f"Error in world_nuclear_data view: {e}", exc_info=True)
@@ -309,78 +224,11 @@ class WorldNuclearDataAPIView(APIView):
 class StocksAPIView(APIView):
     def get(self, request, *args, **kwargs):
         try:
-            logger.info("Fetching uranium data...")
-            uranium_data = fetch_uranium_data_sync()
-            logger.info(f"Uranium data fetched: {uranium_data is not None}")
-
-            if uranium_data is None:
+            payload = request_payload(request, 'stocks')
+            if payload is None:
                 logger.warning("Unable to fetch uranium data")
-                return Response({'message': 'Unable to fetch data at this time.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            stocks_list = []  
-
-            stocks = uranium_data.get('stocks', {})
-
-            for key, value in stocks.items():
-                
-                stock_data = {
-                    'ticker_name': key,
-                    'company_name': value.get("name"),
-                    'change_1m': value.get("change_1m"),
-                    'current_price': value.get("current_price"),
-                    'last_price': value.get("last_price"),
-                    'change_1y': value.get("change_1y"),
-                    'volume': value.get("volume"),
-                    'market_cap': value.get("market_cap"),
-                    'pe_ratio': value.get("pe_ratio")
-                }
-
-                stocks_list.append(stock_data)
-
-            logger.info(f"Stocks data: {type(stocks)}, {len(stocks) if isinstance(stocks, dict) else 'Not a dict'}")
-
-            if not isinstance(stocks, dict):
-                logger.error(f"Unexpected stocks data type: {type(stocks)}")
-                return Response({'message': 'Unexpected data format for stocks.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            if not stocks:
-                logger.warning("No stocks data found in uranium_data")
-                return Response({'message': 'No stock data available.'}, status=status.HTTP_404_NOT_FOUND)
-
-            total_stocks = len(stocks)
-            prices = [float(stock['current_price']) for stock in stocks.values() if isinstance(stock, dict) and stock.get('current_price') and stock['current_price'] != 'N/A']
-            average_price = sum(prices) / len(prices) if prices else 0
-            total_market_cap = sum(float(stock['market_cap']) for stock in stocks.values() if isinstance(stock, dict) and stock.get('market_cap') and stock['market_cap'] != 'N/A')
-            changes = [float(stock['change_1m']) for stock in stocks.values() if isinstance(stock, dict) and stock.get('change_1m') and stock['change_1m'] != 'N/A']
-            average_1m_change = sum(changes) / len(changes) if changes else 0
-
-            most_followed_stocks = sorted(
-                [(symbol, data) for symbol, data in stocks.items() if data.get('volume') is not None],
-                key=lambda x: x[1]['volume'],
-                reverse=True
-            )[:5]
-
-            sorted_stocks = sorted(
-                [(symbol, stock) for symbol, stock in stocks.items() if isinstance(stock, dict) and stock.get('change_1m') and stock['change_1m'] != 'N/A'],
-                key=lambda x: float(x[1]['change_1m']),
-                reverse=True
-            )
-            top_gainers = sorted_stocks[:5]
-            top_losers = sorted_stocks[-5:]
-
-            context = {
-                'stocks': stocks_list,
-                'uranium_spot_price': uranium_data.get('spot_price', 'N/A'),
-                'total_stocks': total_stocks,
-                'average_price': average_price,
-                'total_market_cap': total_market_cap,
-                'average_1m_change': average_1m_change,
-                'top_performing_stocks': top_gainers,
-                'top_losers': top_losers,
-                'most_followed_stocks': most_followed_stocks,
-            }
-            logger.info(f"Context prepared: {list(context.keys())}")
-            return Response(context, status=status.HTTP_200_OK)
+                return Response({'message': 'Unable to fetch data at this time.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            return payload_response(request, payload)
         
         except Exception as e:
             logger.error(f"Error in stocks view: {str(e)}", exc_info=True)
@@ -391,60 +239,49 @@ class GetTopPerformingStocksAPIView(APIView):
     def post(self, request, *args, **kwargs):
         try:
             stocks_data = request.data.get('stocks_data', {})
-            if not stocks_data:
+            if not stocks_data or not isinstance(stocks_data, dict):
                 return Response({'message': 'Stocks data is missing.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            top_stocks = self.get_top_performing_stocks(stocks_data)
+            weights, methods, top_k = scoring_options(request.data)
+            top_stocks = self.get_top_performing_stocks(stocks_data, weights, methods, top_k)
             return Response({'top_stocks': top_stocks}, status=status.HTTP_200_OK)
 
+        except InvalidScoring as e:
+            return Response({'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error in GetTopPerformingStocksAPIView: {str(e)}", exc_info=True)
             return Response({'message': 'An error occurred while processing stocks.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def get_top_performing_stocks(self, stocks_data):
-        fields_to_normalize = ['change_1m', 'change_1y', 'pe_ratio', 'volume', 'market_cap']
-        for field in fields_to_normalize:
-            self.normalize_values(stocks_data, field)
-
-        for stock in stocks_data.values():
-            stock['performance_score'] = self.calculate_performance_score(stock)
-
-        top_stocks = sorted(stocks_data.items(), key=lambda x: x[1].get('performance_score', 0), reverse=True)[:3]
+    def get_top_performing_stocks(self, stocks_data, weights=None, methods=None, top_k=DEFAULT_TOP_K):
+        store = StockStore.from_stocks(stocks_data, history=False, fields=weights or DEFAULT_WEIGHTS)
+        indices, scores, normalized = score_stocks(store, weights, methods, top_k)
+
+        top_stocks = []
+        for i in indices:
+            symbol = str(store.symbols[i])
+            stock = dict(stocks_data[symbol])
+            for field, values in normalized.items():
+                stock[f'{field}_normalized'] = float(values[i])
+            stock['performance_score'] = float(scores[i])
+            top_stocks.append((symbol, stock))
         return top_stocks
 
-    def normalize_values(self, stocks_data, field):
-        try:
-            values = [float(stock.get(field, 0)) for stock in stocks_data.values() if self.is_numeric(stock.get(field))]
-
-            if not values:
-                return
-
-            min_value, max_value = min(values), max(values)
-            if min_value == max_value:
-                for stock in stocks_data.values():
-                    stock[f'{field}_normalized'] = 0
-            else:
-                for stock in stocks_data.values():
-                    if self.is_numeric(stock.get(field)):
-                        stock[f'{field}_normalized'] = (float(stock.get(field, 0)) - min_value) / (max_value - min_value)
-                    else:
-                        stock[f'{field}_normalized'] = 0
-        except Exception as e:
-            logger.error(f"Error normalizing {field}: {str(e)}")
 
-    def is_numeric(self, value):
+class StockScreenerAPIView(APIView):
+    def get(self, request, *args, **kwargs):
         try:
-            float(value)
-            return True
-        except (ValueError, TypeError):
-            return False
-
-    def calculate_performance_score(self, stock):
-        return (stock.get('change_1m_normalized', 0) * 0.4 +
-                stock.get('change_1y_normalized', 0) * 0.3 +
-                stock.get('pe_ratio_normalized', 0) * 0.1 +
-                stock.get('volume_normalized', 0) * 0.1 +
-                stock.get('market_cap_normalized', 0) * 0.1)
+            options = screen_options(request.query_params)
+            store = current_stock_store()
+            if store is None:
+                logger.warning("No stock data to screen yet")
+                return Response({'message': 'Unable to fetch data at this time.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            return Response(screen(store, **options), status=status.HTTP_200_OK)
+
+        except InvalidScreen as e:
+            return Response({'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Error in StockScreenerAPIView: {str(e)}", exc_info=True)
+            return Response({'message': 'An error occurred while screening stocks.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class AboutAPIView(APIView):
@@ -675,124 +512,57 @@ class GetUraniumYoutubeVideos(APIView):
 
 
 class BaseNewsAPIView(APIView):
-    def get_news_data(self, key):
-        try:
-            uranium_data = fetch_uranium_data_sync()  # Make sure this function is synchronous
-            news_data = uranium_data.get(key, [])
-            return news_data
-        except Exception as e:
-            logger.error(f"Error fetching {key}: {str(e)}")
-            raise e
+    # Key of the news source in the uranium data, set by each subclass
+    news_key = None
 
-class MiningComNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):  # Make this a synchronous view
+    def get(self, request, *args, **kwargs):
         try:
-            news_data = self.get_news_data('mining_com_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
+            name = f'news_{self.news_key}'
+            return payload_response(request, request_payload(request, name) or empty_payload(name))
         except Exception as e:
+            logger.error(f"Error fetching {self.news_key}: {str(e)}")
             return Response({
                 "message": f"An error occurred while fetching the data: {str(e)}"
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+class MiningComNewsAPIView(BaseNewsAPIView):
+    news_key = 'mining_com_news'
+
+
 class NucNetNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):  # Make this a synchronous view
-        try:
-            news_data = self.get_news_data('nucnet_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    news_key = 'nucnet_news'
 
 
 class WorldNuclearNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            news_data = self.get_news_data('world_nuclear_news_com')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    news_key = 'world_nuclear_news_com'
 
 
 class MiningTechnologyNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            news_data = self.get_news_data('mining_technology_com_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    news_key = 'mining_technology_com_news'
 
 
 class InformKZNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            news_data = self.get_news_data('inform_kz_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    news_key = 'inform_kz_news'
 
 
 class StockNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            news_data = self.get_news_data('stock_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    news_key = 'stock_news'
 
 
 class IAEANewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            news_data = self.get_news_data('iaea_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
+    news_key = 'iaea_news'
 
 
 class NorthernMinerNewsAPIView(BaseNewsAPIView):
-    def get(self, request, *args, **kwargs):
-        try:
-            news_data = self.get_news_data('northern_miner_com_news')
-            return Response({
-                "data": news_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                "message": f"An error occurred while fetching the data: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    news_key = 'northern_miner_com_news'
 
 
 class ArticleContentAPIView(APIView):
     async def get(self, request, article_id, *args, **kwargs):
 
         try:
-            uranium_data = fetch_uranium_data_sync()
+            uranium_data = fetch_uranium_data_sync() or {}
 
             all_news = (
                 uranium_data.get('mining_technology_com_news', []) +
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'uranium_project.settings')
 
 application = get_asgi_application()
+
+# Serve the last snapshot right away; the refresh runs in the background
+from uranium_app.tasks import warm_start  # noqa: E402
+
+warm_start()